@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 
 import pygame
-import os
 import random
 import math
+from collections import OrderedDict
 from constants import (
-    GAME_AREA_WIDTH, SCREEN_HEIGHT, ICON_COLORS,
+    GAME_AREA_WIDTH, SCREEN_HEIGHT,
     AWS_PARTITION, AWS_REGION, AWS_ACCOUNT_ID,
 )
+from icon_assets import icon_surface
+from icon_registry import icons_near, icons_of_type, nearest_of_type
+from physics_world import PhysicsWorld
+from text_cache import text_cache
 
 class AWSIcon(pygame.sprite.Sprite):
     """AWSサービスアイコンを表すクラス"""
@@ -31,6 +35,14 @@ class AWSIcon(pygame.sprite.Sprite):
     DEPENDENCY_HEALTH_DECREASE = 0.05  # 依存関係不満足時の体力減少
     DEPENDENCY_HEALTH_RECOVERY = 0.05  # 依存関係満足時の体力回復
 
+    # 移動と停滞に関する定数（PhysicsWorldの一括更新で使用）
+    MAX_VELOCITY = 3.0  # 最大速度
+    MOVEMENT_THRESHOLD = 3.0  # 動きと判断する最小距離（ピクセル）
+    MAX_STATIONARY_FRAMES = 300  # 停滞許容フレーム数（約5秒）
+    STATIONARY_HEALTH_DECREASE = 0.2  # 停滞許容時間を超えた場合の体力減少（1フレームあたり）
+    MOVING_RECOVERY_RATE = 0.01  # 移動距離あたりの回復量（依存関係を持たないアイコン）
+    MOVING_RECOVERY_MAX = 0.05  # 移動による回復量の上限（1フレームあたり）
+
     # AutoScalingに関する定数
     # Auto Scalingは水平スケーリング（スケールアウト＝EC2追加、スケールイン＝EC2削減）を表現する
     AUTOSCALING_MONITORING_RADIUS = 150  # モニタリング範囲の半径（ピクセル）
@@ -49,47 +61,47 @@ class AWSIcon(pygame.sprite.Sprite):
     AUTOSCALING_SEPARATION_FORCE = 0.3   # AutoScaling同士の反発力の最大値（近いほど強い）
     AUTOSCALING_SCALE_IN_HIGHLIGHT_FRAMES = 6  # スケールインで削減されたEC2を紫枠でハイライトする残りフレーム数
 
+    # 描画に関する定数
+    OVERLAY_MARGIN = 8  # 重ね合わせ画像（枠・円弧など）がアイコンからはみ出す幅（ピクセル）
+    OVERLAY_CACHE_SIZE = 512  # 状態ごとの重ね合わせ画像を保持する上限
+    _overlay_cache = OrderedDict()  # {状態: 重ね合わせ画像}（全アイコンで共有、古い順）
+
     # EC2インスタンスのリタイア（retirement）に関する定数
     # 基盤ハードウェアの劣化により、古いEC2がランダムにリタイア予定になることを表現する
     EC2_RETIREMENT_MIN_AGE_FRAMES = 1800  # リタイア対象になるまでの最小経過フレーム（約30秒）
     EC2_RETIREMENT_PROBABILITY = 0.00005  # 対象EC2が毎フレームでリタイア発動する確率
 
-    def __init__(self, service_type, position, velocity=None):
+    def __init__(self, service_type, position, velocity=None, world=None):
+        """worldを省略した場合は、このアイコン専用の1行だけのPhysicsWorldを使う"""
         super().__init__()
         self.service_type = service_type
         
-        # アイコン画像の読み込み
-        try:
-            icon_path = f"assets/icons/{service_type.lower()}.png"
-            if os.path.exists(icon_path):
-                self.image = pygame.image.load(icon_path)
-                self.image = pygame.transform.scale(self.image, (50, 50))
-            else:
-                raise pygame.error("Icon file not found")
-        except pygame.error:
-            # 画像が見つからない場合は代替の四角形を使用
-            self.image = pygame.Surface((50, 50))
-            self.image.fill(ICON_COLORS.get(service_type, (200, 200, 200)))
-            # サービス名がアイコンの幅に収まるようフォントサイズを調整する
-            font_size = 20
-            while True:
-                font = pygame.font.SysFont(None, font_size)
-                text = font.render(service_type, True, (0, 0, 0))
-                if text.get_width() <= 46 or font_size <= 10:
-                    break
-                font_size -= 1
-            text_rect = text.get_rect(center=(25, 25))
-            self.image.blit(text, text_rect)
+        # アイコン画像（同じサービスのアイコンで共有するキャッシュから取得）
+        self.image = icon_surface(service_type)
         
-        self.rect = self.image.get_rect()
-        self.rect.center = position
+        self._rect = self.image.get_rect()
+        self._rect.center = position
         
         # 速度がない場合はランダムな速度を設定（最大速度を制限）
-        self.max_velocity = 3.0  # 最大速度の設定
         if velocity is None:
-            self.velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
-        else:
-            self.velocity = velocity
+            velocity = [random.uniform(-2, 2), random.uniform(-2, 2)]
+
+        # 依存関係の設定
+        self.dependencies = self._set_dependencies()
+
+        # 位置・速度・体力などの物理状態はPhysicsWorldの1行に格納する
+        # （体力はVPCがない場合のEC2など、依存関係の表現に使用）
+        if world is None:
+            world = PhysicsWorld(type(self), capacity=1)
+        self._world = world
+        self._rect_generation = world.generation
+        self._row = world.allocate(
+            self, position, velocity, self._rect.size, service_type,
+            # 依存関係を持たないアイコンは動いている間に回復する（AutoScalingは対象外）
+            recovers_while_moving=(not self.dependencies
+                                   and service_type != "AutoScaling"),
+        )
+        self.max_health = 100
         
         # サービス固有の特性
         self.properties = {}
@@ -97,25 +109,18 @@ class AWSIcon(pygame.sprite.Sprite):
         # 相互作用可能なサービスリスト
         self.interactions = []
         
-        # 体力（VPCがない場合のEC2など、依存関係の表現に使用）
-        self.health = 100
-        self.max_health = 100
-        
-        # 依存関係の設定
-        self.dependencies = self._set_dependencies()
-        
         # 選択状態
         self.selected = False
         
-        # 依存関係が満たされているかのフラグ
+        # 依存関係が満たされているかのフラグと、満たしている依存先のアイコン
         self.dependency_satisfied = False
+        self.dependency_partner = None
         
         # 最後に相互作用したアイコン
         self.last_interaction = None
         self.interaction_timer = 0
         
-        # 停止状態の管理
-        self.is_stopped = False
+        # 停止状態の管理（停止中かどうかはPhysicsWorldが保持する）
         self.stop_timer = 0
         self.max_stop_time = 120  # 最大停止時間（フレーム数）
         
@@ -123,12 +128,6 @@ class AWSIcon(pygame.sprite.Sprite):
         self.overlapping_icons = {}  # {icon_id: icon} 形式で重なっているアイコンを追跡
         self.overlap_duration = {}   # {icon_id: frames} 形式で重なり継続フレーム数を追跡
         self.stuck = False           # スタック状態のフラグ
-        
-        # 動きの追跡（停滞時のHealth減少用）
-        self.previous_position = list(position)  # 前フレームの位置
-        self.stationary_frames = 0  # 停滞しているフレーム数
-        self.movement_threshold = 3.0  # 動きと判断する最小距離（ピクセル）
-        self.max_stationary_frames = 300  # 停滞許容フレーム数（約5秒）
 
         # 進化の進行状況（EvolutionSystemが更新する）
         self.evolution_timer = 0       # 進化条件を満たしている継続フレーム数
@@ -139,8 +138,7 @@ class AWSIcon(pygame.sprite.Sprite):
         self.arn = self._generate_arn()
 
         # EC2インスタンスのリタイア（retirement）表現用
-        self.age_frames = 0                # 生成からの経過フレーム数
-        self.retiring = False              # リタイア中フラグ
+        # 経過フレーム数（age_frames）とリタイア中フラグ（retiring）はPhysicsWorldが保持する
         self.retirement_announced = False  # リタイア通知済みフラグ（main側が参照して通知）
 
         # AutoScalingのスケールインで削減対象になっているEC2のハイライト残りフレーム数
@@ -160,10 +158,101 @@ class AWSIcon(pygame.sprite.Sprite):
             self.desired_count = random.randint(
                 self.AUTOSCALING_MIN_DESIRED_COUNT, self.AUTOSCALING_MAX_DESIRED_COUNT)
             # DesiredCountの常時表示用ラベル
-            label_font = pygame.font.SysFont(None, 18)
-            self.desired_label = label_font.render(
-                f"Desired = {self.desired_count}", True, (50, 50, 50))
+            self.desired_label = text_cache.render(
+                f"Desired = {self.desired_count}", text_cache.font(None, 18), (50, 50, 50))
     
+    # PhysicsWorldの自分の行を参照するプロパティ
+    @property
+    def world(self):
+        """このアイコンの物理状態を保持しているPhysicsWorld"""
+        return self._world
+
+    @property
+    def rect(self):
+        """描画・判定用の矩形（PhysicsWorldの更新後、最初の参照時に位置を同期する）"""
+        world = self._world
+        if self._rect_generation != world.generation:
+            x, y = world.pos[self._row]
+            self._rect.center = (float(x), float(y))
+            self._rect_generation = world.generation
+        return self._rect
+
+    def show_at(self, position):
+        """描画用の矩形だけをpositionに置く（補間描画用。sync_rect()で元の位置に戻す）"""
+        self._rect.center = position
+        self._rect_generation = self._world.generation
+
+    def sync_rect(self):
+        """描画用の矩形を、次の参照時に物理状態の位置へ同期し直させる"""
+        self._rect_generation = -1
+
+    @property
+    def center(self):
+        """中心座標（小数を含む正確な位置）"""
+        x, y = self._world.pos[self._row]
+        return (float(x), float(y))
+
+    @center.setter
+    def center(self, position):
+        self._world.pos[self._row] = position
+        self._rect.center = position
+        self._rect_generation = self._world.generation
+
+    @property
+    def velocity(self):
+        """速度（PhysicsWorldの行へのビュー。要素への代入もそのまま反映される）"""
+        return self._world.vel[self._row]
+
+    @velocity.setter
+    def velocity(self, value):
+        self._world.vel[self._row] = value
+
+    @property
+    def health(self):
+        return float(self._world.health[self._row])
+
+    @health.setter
+    def health(self, value):
+        self._world.health[self._row] = value
+
+    @property
+    def age_frames(self):
+        """生成からの経過フレーム数"""
+        return int(self._world.age[self._row])
+
+    @age_frames.setter
+    def age_frames(self, value):
+        self._world.age[self._row] = value
+
+    @property
+    def retiring(self):
+        """リタイア中フラグ"""
+        return bool(self._world.retiring[self._row])
+
+    @retiring.setter
+    def retiring(self, value):
+        self._world.retiring[self._row] = value
+
+    @property
+    def is_stopped(self):
+        return bool(self._world.stopped[self._row])
+
+    @is_stopped.setter
+    def is_stopped(self, value):
+        self._world.stopped[self._row] = value
+
+    @property
+    def stationary_frames(self):
+        """停滞しているフレーム数"""
+        return int(self._world.stationary[self._row])
+
+    def clamp_to_game_area(self):
+        """中心座標をゲームエリア内に収める"""
+        x, y = self.center
+        half_w, half_h = self._rect.width / 2, self._rect.height / 2
+        self.center = (max(half_w, min(x, GAME_AREA_WIDTH - half_w)),
+                       max(half_h, min(y, SCREEN_HEIGHT - half_h)))
+
     def _generate_arn(self):
         """サービスの種類に応じて、AWSの規則に沿ったARNを採番する
 
@@ -298,9 +387,27 @@ class AWSIcon(pygame.sprite.Sprite):
             if not self.overlapping_icons:
                 self.stuck = False
     def update(self, all_icons=None):
-        """アイコンの状態を更新"""
+        """アイコンの状態を更新（このアイコン単体で1フレーム進める）
+
+        ゲーム本体では全アイコンの update_behavior() を呼んだ後に
+        PhysicsWorld.step() で移動や体力の減少をまとめて処理する。
+        """
+        self.update_behavior(all_icons)
+        self._world.step([self._row])
+
+    def update_behavior(self, all_icons=None, profiler=None):
+        """移動以外のアイコン個別の状態（動きのパターン・依存関係など）を更新
+
+        移動・速度制限・壁での反射・生存コスト・黄色体力時のランダムな力・
+        停滞判定はPhysicsWorld.step()が全アイコン分まとめて行う。
+        profilerを渡すと、動きパターンの処理時間をサービス種別ごとに計測する。
+        """
         # サービスタイプ固有の動きパターンを適用
-        self._apply_movement_pattern(all_icons)
+        if profiler is None:
+            self._apply_movement_pattern(all_icons)
+        else:
+            with profiler.behavior(self.service_type):
+                self._apply_movement_pattern(all_icons)
         
         # 停止状態の管理
         if self.is_stopped:
@@ -317,28 +424,6 @@ class AWSIcon(pygame.sprite.Sprite):
                     math.sin(angle) * speed
                 ]
         
-        # 停止していない場合のみ移動
-        if not self.is_stopped:
-            # 移動
-            self.rect.x += self.velocity[0]
-            self.rect.y += self.velocity[1]
-        
-        # 速度の上限を制限
-        self.velocity = [
-            max(min(self.velocity[0], self.max_velocity), -self.max_velocity),
-            max(min(self.velocity[1], self.max_velocity), -self.max_velocity)
-        ]
-        
-        # 画面端での反射（ゲームエリア内のみ）
-        if self.rect.left < 0 or self.rect.right > GAME_AREA_WIDTH:
-            self.velocity[0] *= -1
-        if self.rect.top < 0 or self.rect.bottom > SCREEN_HEIGHT:
-            self.velocity[1] *= -1
-        
-        # ゲームエリア内に収める
-        self.rect.left = max(0, min(self.rect.left, GAME_AREA_WIDTH - self.rect.width))
-        self.rect.top = max(0, min(self.rect.top, SCREEN_HEIGHT - self.rect.height))
-        
         # 重なっているアイコンとの分離処理
         if all_icons:
             for icon in all_icons:
@@ -347,11 +432,12 @@ class AWSIcon(pygame.sprite.Sprite):
         
         # 依存関係の確認と体力の更新
         if all_icons and self.dependencies:
-            self.dependency_satisfied = False
-            for icon in all_icons:
-                if icon.service_type in self.dependencies and self._is_near(icon, 150):
-                    self.dependency_satisfied = True
+            self.dependency_partner = None
+            for service_type in self.dependencies:
+                self.dependency_partner = nearest_of_type(all_icons, service_type, self, 150)
+                if self.dependency_partner is not None:
                     break
+            self.dependency_satisfied = self.dependency_partner is not None
             
             # 依存関係が満たされていない場合、体力を減少
             if not self.dependency_satisfied:
@@ -364,9 +450,6 @@ class AWSIcon(pygame.sprite.Sprite):
         # 相互作用タイマーの更新
         if self.interaction_timer > 0:
             self.interaction_timer -= 1
-        
-        # 全アイコン共通の微細なHealth減少（生存コスト）
-        self.health = max(0, self.health - self.SURVIVAL_COST)
 
         # EC2インスタンスのリタイア（retirement）処理
         if self.service_type == "EC2":
@@ -375,49 +458,6 @@ class AWSIcon(pygame.sprite.Sprite):
         # スケールインで削減対象になっているEC2のハイライト残り時間を減らす
         if self.scaling_in_timer > 0:
             self.scaling_in_timer -= 1
-        
-        # Healthが黄色の域（30-60%）の場合、ランダムな動きを加えて停滞を防ぐ
-        health_ratio = self.health / self.max_health
-        if self.YELLOW_HEALTH_LOWER_THRESHOLD < health_ratio <= self.YELLOW_HEALTH_UPPER_THRESHOLD:
-            # 低確率でランダムな力を加える
-            if random.random() < self.YELLOW_HEALTH_RANDOM_MOVE_PROBABILITY:
-                angle = random.uniform(0, 2 * math.pi)
-                force = random.uniform(self.YELLOW_HEALTH_MIN_FORCE, self.YELLOW_HEALTH_MAX_FORCE)
-                self.velocity[0] += math.cos(angle) * force
-                self.velocity[1] += math.sin(angle) * force
-        
-        # 動きの追跡と停滞時のHealth減少
-        self._check_movement_and_health()
-    
-    def _check_movement_and_health(self):
-        """動きを追跡し、停滞時にHealthを減少させる"""
-        # 現在の位置と前フレームの位置の距離を計算
-        current_pos = [self.rect.centerx, self.rect.centery]
-        distance_moved = math.hypot(
-            current_pos[0] - self.previous_position[0],
-            current_pos[1] - self.previous_position[1]
-        )
-        
-        # 動きが閾値以下の場合は停滞とみなす
-        if distance_moved < self.movement_threshold:
-            self.stationary_frames += 1
-        else:
-            self.stationary_frames = 0  # 動いた場合はカウンターをリセット
-            
-            # 依存関係を持たないアイコンは動いている間に回復
-            # （AutoScalingは回復対象外）
-            if (not self.dependencies and self.service_type != "AutoScaling"
-                    and self.health < self.max_health):
-                # 動きの速さに応じて回復量を調整（最大0.05/フレーム）
-                recovery_amount = min(0.05, distance_moved * 0.01)
-                self.recover(recovery_amount)
-        
-        # 停滞時間が長すぎる場合はHealthを減少
-        if self.stationary_frames > self.max_stationary_frames:
-            self.health = max(0, self.health - 0.2)  # 停滞時の減少幅をさらに緩和
-        
-        # 前フレームの位置を更新
-        self.previous_position = current_pos.copy()
     
     def _apply_movement_pattern(self, all_icons):
         """サービスタイプ固有の動きパターンを適用"""
@@ -447,22 +487,18 @@ class AWSIcon(pygame.sprite.Sprite):
 
         # 近くのAutoScalingに引き寄せられる（管理下のフリートとしてまとまる傾向）
         if all_icons:
-            autoscaling_icons = [icon for icon in all_icons if icon.service_type == "AutoScaling"]
-            if autoscaling_icons:
-                # 最も近いAutoScalingを見つける
-                closest_autoscaling = min(autoscaling_icons, key=lambda a:
-                    math.sqrt((self.rect.centerx - a.rect.centerx)**2 +
-                             (self.rect.centery - a.rect.centery)**2))
-
-                # AutoScalingに向かう力を加える
-                if self._is_near(closest_autoscaling, 250):
-                    dx = closest_autoscaling.rect.centerx - self.rect.centerx
-                    dy = closest_autoscaling.rect.centery - self.rect.centery
-                    distance = math.sqrt(dx**2 + dy**2)
-                    if distance > 60:  # 近すぎる場合は引力を働かせない（重なり防止）
-                        force = 0.12
-                        self.velocity[0] += (dx / distance) * force
-                        self.velocity[1] += (dy / distance) * force
+            # 250px以内で最も近いAutoScalingを見つける
+            closest_autoscaling = nearest_of_type(all_icons, "AutoScaling", self, 250)
+
+            # AutoScalingに向かう力を加える
+            if closest_autoscaling is not None:
+                dx = closest_autoscaling.rect.centerx - self.rect.centerx
+                dy = closest_autoscaling.rect.centery - self.rect.centery
+                distance = math.sqrt(dx**2 + dy**2)
+                if distance > 60:  # 近すぎる場合は引力を働かせない（重なり防止）
+                    force = 0.12
+                    self.velocity[0] += (dx / distance) * force
+                    self.velocity[1] += (dy / distance) * force
 
     def _s3_behavior(self):
         """S3の動作を実装"""
@@ -475,22 +511,18 @@ class AWSIcon(pygame.sprite.Sprite):
         """EBSの動作を実装"""
         # EBSは近くのEC2に引き寄せられる傾向がある
         if all_icons:
-            ec2_icons = [icon for icon in all_icons if icon.service_type == "EC2"]
-            if ec2_icons:
-                # 最も近いEC2を見つける
-                closest_ec2 = min(ec2_icons, key=lambda ec2: 
-                    math.sqrt((self.rect.centerx - ec2.rect.centerx)**2 + 
-                             (self.rect.centery - ec2.rect.centery)**2))
-                
-                # EC2に向かう力を加える
-                if self._is_near(closest_ec2, 200):
-                    dx = closest_ec2.rect.centerx - self.rect.centerx
-                    dy = closest_ec2.rect.centery - self.rect.centery
-                    distance = math.sqrt(dx**2 + dy**2)
-                    if distance > 0:
-                        force = 0.1
-                        self.velocity[0] += (dx / distance) * force
-                        self.velocity[1] += (dy / distance) * force
+            # 200px以内で最も近いEC2を見つける
+            closest_ec2 = nearest_of_type(all_icons, "EC2", self, 200)
+
+            # EC2に向かう力を加える
+            if closest_ec2 is not None:
+                dx = closest_ec2.rect.centerx - self.rect.centerx
+                dy = closest_ec2.rect.centery - self.rect.centery
+                distance = math.sqrt(dx**2 + dy**2)
+                if distance > 0:
+                    force = 0.1
+                    self.velocity[0] += (dx / distance) * force
+                    self.velocity[1] += (dy / distance) * force
 
     def _vpc_behavior(self, all_icons):
         """VPCの動作を実装"""
@@ -513,7 +545,7 @@ class AWSIcon(pygame.sprite.Sprite):
 
         # VPCの数が5個以下の場合、体力を回復する（希少性による重要性の増加）
         if all_icons:
-            vpc_count = sum(1 for icon in all_icons if icon.service_type == "VPC")
+            vpc_count = len(icons_of_type(all_icons, "VPC"))
             if vpc_count <= 5:
                 recovery_rate = 0.2  # 通常の回復速度より高い
                 self.recover(recovery_rate)
@@ -535,14 +567,12 @@ class AWSIcon(pygame.sprite.Sprite):
                 ]
 
             if all_icons:
-                ec2_icons = [icon for icon in all_icons if icon.service_type == "EC2"]
-
                 # AutoScalingはEC2の集団に引き寄せられず、独立してモニタリングしながら
                 # ランダムに動き回る（上部の方向転換ロジックに委ねる）
 
                 # 監視範囲内のEC2数をDesiredCountと比較してスケーリング判断
-                nearby_ec2s = [ec2 for ec2 in ec2_icons
-                               if self._is_near(ec2, self.AUTOSCALING_MONITORING_RADIUS)]
+                nearby_ec2s = icons_near(all_icons, "EC2", self,
+                                         self.AUTOSCALING_MONITORING_RADIUS)
                 if len(nearby_ec2s) < self.desired_count:
                     # 不足: 近くでEC2の発生率を上げる（クールダウン明けにスケールアウト）
                     if (self.scale_cooldown <= 0
@@ -579,14 +609,11 @@ class AWSIcon(pygame.sprite.Sprite):
         # AutoScaling同士の反発（状態にかかわらず適用し、密集・だんご化を防ぐ）
         # スケールアウト状態のvelocity上書き後に加算するため、状態処理の最後に行う
         if all_icons:
-            for other in all_icons:
-                if other is self or other.service_type != "AutoScaling":
-                    continue
+            for other in icons_near(all_icons, "AutoScaling", self,
+                                    self.AUTOSCALING_SEPARATION_RADIUS):
                 dx = self.rect.centerx - other.rect.centerx
                 dy = self.rect.centery - other.rect.centery
                 distance = math.sqrt(dx*dx + dy*dy)
-                if distance >= self.AUTOSCALING_SEPARATION_RADIUS:
-                    continue
                 if distance > 0:
                     direction_x = dx / distance
                     direction_y = dy / distance
@@ -646,9 +673,9 @@ class AWSIcon(pygame.sprite.Sprite):
         生成から十分に時間が経過したEC2は、基盤ハードウェアの劣化を模して
         ランダムにリタイアが発動する。リタイア中は一切回復しなくなり（recover参照）、
         体力は生存コスト等で自然に減っていく。
-        （リタイア発動の通知と赤枠表示はそれぞれmain側とdraw()で行う）
+        （経過フレーム数はPhysicsWorld.step()で進む。
+        リタイア発動の通知と赤枠表示はそれぞれmain側とdraw()で行う）
         """
-        self.age_frames += 1
         if (not self.retiring
                 and self.age_frames >= self.EC2_RETIREMENT_MIN_AGE_FRAMES
                 and random.random() < self.EC2_RETIREMENT_PROBABILITY):
@@ -712,65 +739,153 @@ class AWSIcon(pygame.sprite.Sprite):
     def draw(self, surface):
         """アイコンを描画"""
         # 通常の描画
-        surface.blit(self.image, self.rect)
+        rect = self.rect
+        surface.blit(self.image, rect)
         
         # AutoScalingのDesiredCountを常時表示
         if self.service_type == "AutoScaling":
             label_rect = self.desired_label.get_rect(
-                midbottom=(self.rect.centerx, self.rect.top - 2))
+                midbottom=(rect.centerx, rect.top - 2))
             surface.blit(self.desired_label, label_rect)
 
-        # 状態遷移を色枠で可視化（リタイア/バースト/スケールアウト等）
+        # 状態の枠・選択枠・依存関係の円・進化の円弧・体力バーは、
+        # 状態ごとに描いておいた重ね合わせ用の画像を貼り付ける
+        overlay = self._overlay_surface()
+        if overlay is not None:
+            surface.blit(overlay, (rect.x - self.OVERLAY_MARGIN, rect.y - self.OVERLAY_MARGIN))
+
+        # 最近の相互作用の表示
+        if self.last_interaction and self.interaction_timer > 0:
+            self._draw_interaction_line(surface)
+
+    def _overlay_state(self):
+        """重ね合わせ画像の内容を決める値のタプル（何も重ねない場合はNone）"""
         border_color = self.state_border_color()
+        dependency_unmet = bool(self.dependencies and not self.dependency_satisfied)
+        health_bar = self._health_bar(self.rect)
+        if not (border_color or self.selected or dependency_unmet
+                or self.evolution_progress > 0 or health_bar):
+            return None
+        return (self.rect.size, border_color, self.selected, dependency_unmet,
+                self.evolution_progress,
+                health_bar and (health_bar[1].width, health_bar[2]))
+
+    def _overlay_surface(self):
+        """状態に応じた重ね合わせ画像を返す（同じ状態のアイコンで共有する）
+
+        描画先でクリップされると太い線や円弧のピクセルが変わるため、
+        クリップのないSurfaceに描いておき、描画時はblitだけで済ませる。
+        """
+        state = self._overlay_state()
+        if state is None:
+            return None
+        cache = AWSIcon._overlay_cache
+        overlay = cache.get(state)
+        if overlay is not None:
+            cache.move_to_end(state)
+            return overlay
+
+        size, border_color, selected, dependency_unmet, evolution_progress, _ = state
+        margin = self.OVERLAY_MARGIN
+        rect = pygame.Rect((margin, margin), size)
+        overlay = pygame.Surface((size[0] + margin * 2, size[1] + margin + 10),
+                                 pygame.SRCALPHA)
+
+        # 状態遷移を色枠で可視化（リタイア/バースト/スケールアウト等）
         if border_color:
-            pygame.draw.rect(surface, border_color, self.rect.inflate(6, 6), 3)
+            pygame.draw.rect(overlay, border_color, rect.inflate(6, 6), 3)
 
         # 選択状態の表示
-        if self.selected:
-            pygame.draw.rect(surface, (255, 255, 0), self.rect, 2)
+        if selected:
+            pygame.draw.rect(overlay, (255, 255, 0), rect, 2)
         
         # 依存関係の表示
-        if self.dependencies and not self.dependency_satisfied:
-            pygame.draw.circle(surface, (255, 0, 0), self.rect.center, 30, 1)
+        if dependency_unmet:
+            pygame.draw.circle(overlay, (255, 0, 0), rect.center, 30, 1)
 
         # 進化の進行度の表示（隣接が続くほど円弧が伸びる）
-        if self.evolution_progress > 0:
-            arc_rect = self.rect.inflate(16, 16)
-            end_angle = 2 * math.pi * self.evolution_progress
-            pygame.draw.arc(surface, (0, 120, 255), arc_rect, 0, end_angle, 3)
+        if evolution_progress > 0:
+            arc_rect = rect.inflate(16, 16)
+            end_angle = 2 * math.pi * evolution_progress
+            pygame.draw.arc(overlay, (0, 120, 255), arc_rect, 0, end_angle, 3)
 
         # 体力バーの表示
-        if self.health < self.max_health:
-            bar_width = 40
-            bar_height = 5
-            bar_x = self.rect.centerx - bar_width / 2
-            bar_y = self.rect.bottom + 5
-            
+        health_bar = self._health_bar(rect)
+        if health_bar:
+            background, bar, color = health_bar
             # 背景（グレー）
-            pygame.draw.rect(surface, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
-            
+            pygame.draw.rect(overlay, (100, 100, 100), background)
             # 体力（緑〜黄色〜赤）
-            health_width = (self.health / self.max_health) * bar_width
-            health_ratio = self.health / self.max_health
-            
-            if health_ratio > 0.6:
-                color = (0, 255, 0)  # 緑
-            elif health_ratio > 0.3:
-                color = (255, 255, 0)  # 黄色
-            else:
-                color = (255, 0, 0)  # 赤
-            
-            pygame.draw.rect(surface, color, (bar_x, bar_y, health_width, bar_height))
-        
-        # 最近の相互作用の表示
+            pygame.draw.rect(overlay, color, bar)
+
+        cache[state] = overlay
+        if len(cache) > self.OVERLAY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return overlay
+
+    def _draw_interaction_line(self, surface):
+        """最近相互作用したアイコンへの線を描く
+
+        クリップ範囲で線が切られると端点の丸め方が変わり、画面全体を描いた場合と
+        ピクセルがずれるため、クリップにかかる場合は線全体を別のSurfaceに描いてから重ねる。
+        """
+        start = self.rect.center
+        end = self.last_interaction.rect.center
+        area = pygame.Rect(start, (0, 0)).union(pygame.Rect(end, (0, 0))).inflate(4, 4)
+        if surface.get_clip().contains(area):
+            pygame.draw.line(surface, (0, 0, 255), start, end, 2)
+            return
+        line = pygame.Surface(area.size)
+        line.fill((0, 0, 0))
+        line.set_colorkey((0, 0, 0))
+        pygame.draw.line(line, (0, 0, 255),
+                         (start[0] - area.x, start[1] - area.y),
+                         (end[0] - area.x, end[1] - area.y), 2)
+        surface.blit(line, area)
+
+    def _health_bar(self, rect):
+        """rectの位置に描く体力バーの (背景の矩形, 体力部分の矩形, 色) を返す（体力が満タンならNone）"""
+        if self.health >= self.max_health:
+            return None
+        bar_width = 40
+        bar_height = 5
+        bar_x = rect.centerx - bar_width / 2
+        bar_y = rect.bottom + 5
+        health_ratio = self.health / self.max_health
+        if health_ratio > 0.6:
+            color = (0, 255, 0)  # 緑
+        elif health_ratio > 0.3:
+            color = (255, 255, 0)  # 黄色
+        else:
+            color = (255, 0, 0)  # 赤
+        return (pygame.Rect(bar_x, bar_y, bar_width, bar_height),
+                pygame.Rect(bar_x, bar_y, health_ratio * bar_width, bar_height),
+                color)
+
+    def draw_bounds(self):
+        """draw()が描画しうる範囲の矩形（ダーティ矩形の計算に使う）"""
+        rect = self.rect
+        # 重ね合わせ画像（状態の枠・依存関係の円・進化の円弧・体力バー）の範囲
+        margin = self.OVERLAY_MARGIN
+        bounds = pygame.Rect(rect.x - margin, rect.y - margin,
+                             rect.width + margin * 2, rect.height + margin + 10)
+        if self.service_type == "AutoScaling":
+            bounds.union_ip(self.desired_label.get_rect(
+                midbottom=(rect.centerx, rect.top - 2)))
         if self.last_interaction and self.interaction_timer > 0:
-            pygame.draw.line(
-                surface,
-                (0, 0, 255),
-                self.rect.center,
-                self.last_interaction.rect.center,
-                2
-            )
+            # 相互作用の線（太さ2px）
+            line = pygame.Rect(rect.center, (0, 0))
+            line.union_ip(pygame.Rect(self.last_interaction.rect.center, (0, 0)))
+            bounds.union_ip(line.inflate(4, 4))
+        return bounds
+
+    def draw_signature(self):
+        """draw()の描画結果を決める値のタプル（前回と等しければ描き直す必要がない）"""
+        line_end = None
+        if self.last_interaction and self.interaction_timer > 0:
+            line_end = self.last_interaction.rect.center
+        return (self.rect.topleft, self._overlay_state(), line_end)
+
     # API GatewayとLambdaの相互作用を管理するメソッド
     def _api_gateway_behavior(self, all_icons):
         """API Gatewayの振る舞いを管理する"""
@@ -817,11 +932,11 @@ class AWSIcon(pygame.sprite.Sprite):
             
             # Lambdaを探して接続状態に移行
             if all_icons and random.random() < 0.02:  # 2%の確率でLambda探索
-                lambda_icons = [icon for icon in all_icons if icon.service_type == "Lambda"]
+                lambda_icons = icons_of_type(all_icons, "Lambda")
                 if lambda_icons:
                     # 制限を解除: 他のAPI Gatewayが接続しているLambdaも対象に含める
                     # ランダムにLambdaを選択
-                    self.target_lambda = random.choice(lambda_icons)
+                    self.target_lambda = random.choice(list(lambda_icons))
                     self.api_state = 'connect'
                     self.state_timer = 0
                     # 現在位置を記憶
@@ -934,19 +1049,16 @@ class AWSIcon(pygame.sprite.Sprite):
                 
                 # IAMアイコンが近くにある場合は、そちらに向かう確率を高める
                 if all_icons:
-                    iam_icons = [icon for icon in all_icons if icon.service_type == "IAM"]
+                    iam_icons = icons_of_type(all_icons, "IAM")
                     if iam_icons and random.random() < 0.4:  # 40%の確率でIAMに向かう
-                        iam_icon = random.choice(iam_icons)
+                        iam_icon = random.choice(list(iam_icons))
                         self.target_position = [iam_icon.rect.centerx, iam_icon.rect.centery]
             
             # API Gatewayが近くにある場合、アクティブ状態に移行
             if all_icons:
-                api_gateways = [icon for icon in all_icons if icon.service_type == "API Gateway"]
-                for api in api_gateways:
-                    if self._is_near(api, 100):  # 100px以内にAPI Gatewayがある
-                        self.lambda_state = 'active'
-                        self.state_timer = 0
-                        break
+                if icons_near(all_icons, "API Gateway", self, 100):  # 100px以内にAPI Gatewayがある
+                    self.lambda_state = 'active'
+                    self.state_timer = 0
             
             # クールダウンの更新
             if self.burst_cooldown > 0:
@@ -1011,46 +1123,27 @@ class AWSIcon(pygame.sprite.Sprite):
                 
         # IAMアイコンとの関係（依存関係）
         if all_icons:
-            iam_icons = [icon for icon in all_icons if icon.service_type == "IAM"]
-            if iam_icons:
-                # 最も近いIAMを探す
-                closest_iam = None
-                min_distance = float('inf')
-                
-                for icon in iam_icons:
-                    dx = icon.rect.centerx - self.rect.centerx
-                    dy = icon.rect.centery - self.rect.centery
-                    distance = math.sqrt(dx*dx + dy*dy)
-                    
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_iam = icon
-                
-                # 最も近いIAMが見つかった場合、その方向に弱い引力
-                if closest_iam:
-                    dx = closest_iam.rect.centerx - self.rect.centerx
-                    dy = closest_iam.rect.centery - self.rect.centery
-                    distance = math.sqrt(dx*dx + dy*dy)
-                    
-                    if distance > 200:  # 200px以上離れている場合
-                        # 引力の強さ（距離に反比例）
-                        attraction = 0.05
-                        direction_x = dx / distance
-                        direction_y = dy / distance
-                        self.velocity[0] += direction_x * attraction
-                        self.velocity[1] += direction_y * attraction
-                        
-            # DynamoDBとの関係（DynamoDBがLambdaに依存する関係を表現）
-            dynamodb_icons = [icon for icon in all_icons if icon.service_type == "DynamoDB"]
-            for dynamodb in dynamodb_icons:
-                # DynamoDBとの距離を計算
-                dx = self.rect.centerx - dynamodb.rect.centerx
-                dy = self.rect.centery - dynamodb.rect.centery
+            # 最も近いIAMを探す
+            closest_iam = nearest_of_type(all_icons, "IAM", self)
+
+            # 最も近いIAMが見つかった場合、その方向に弱い引力
+            if closest_iam is not None:
+                dx = closest_iam.rect.centerx - self.rect.centerx
+                dy = closest_iam.rect.centery - self.rect.centery
                 distance = math.sqrt(dx*dx + dy*dy)
-                
-                # 近くにいる場合は相互作用を記録
-                if distance < 100:
-                    self.last_interaction = dynamodb
-                    self.interaction_timer = 30
-                    dynamodb.last_interaction = self
-                    dynamodb.interaction_timer = 30
+
+                if distance > 200:  # 200px以上離れている場合
+                    # 引力の強さ（距離に反比例）
+                    attraction = 0.05
+                    direction_x = dx / distance
+                    direction_y = dy / distance
+                    self.velocity[0] += direction_x * attraction
+                    self.velocity[1] += direction_y * attraction
+
+            # DynamoDBとの関係（DynamoDBがLambdaに依存する関係を表現）
+            # 100px以内にいるDynamoDBとの相互作用を記録
+            for dynamodb in icons_near(all_icons, "DynamoDB", self, 100):
+                self.last_interaction = dynamodb
+                self.interaction_timer = 30
+                dynamodb.last_interaction = self
+                dynamodb.interaction_timer = 30
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""シナリオ別のパフォーマンスベンチマーク
+
+実際の Game.update() / Game.render() を、シード固定のシナリオごとに実行し、
+フェーズ別（アイコン更新・相互作用・描画など）のフレーム時間の
+平均・p95・p99をJSONに記録する。保存済みのベースラインと比較して、
+劣化（リグレッション）を検出できる。
+
+    python benchmark.py --output results.json
+    python benchmark.py --scenario mixed_100 --baseline baseline.json
+"""
+
+import os
+
+# 画面のない環境（CIなど）でも描画処理まで計測できるよう、
+# pygameのimport前にダミードライバを設定する（環境変数で上書き可能）
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+from aws_icon import AWSIcon
+from main import Game
+from profiler import summarize
+
+# ベンチマークシナリオ
+# name: シナリオ名 / description: 説明
+# setup(game): 計測前の初期配置 / per_frame(game, frame): 毎フレームの更新前に行う操作
+# frames: デフォルトの計測フレーム数 / warmup: 計測前に捨てるフレーム数
+Scenario = namedtuple(
+    "Scenario", ["name", "description", "setup", "per_frame", "frames", "warmup"]
+)
+
+
+def _populate(count):
+    def setup(game):
+        game.populate(count)
+    return setup
+
+
+def _setup_ec2_swarm(game):
+    """EC2の3体組を多数配置し、計測中に進化（AutoScalingへの合体）を発生させる"""
+    for row in range(5):
+        for col in range(6):
+            x = 60 + col * 95
+            y = 70 + row * 120
+            # EC2が体力を失わないようVPCも近くに置く（VPCはクォータ分のみ有効）
+            if row * 6 + col < game.VPC_DEFAULT_QUOTA:
+                game._spawn_icon("VPC", (x + 20, y + 50))
+            for dx, dy in ((0, 0), (30, 0), (15, 25)):
+                icon = game._spawn_icon("EC2", (x + dx, y + dy))
+                icon.velocity = [0, 0]
+
+
+def _setup_autoscaling_churn(game):
+    """AutoScalingを多数配置し、スケールアウト（EC2起動）とスケールインを繰り返させる"""
+    for _ in range(game.VPC_DEFAULT_QUOTA):
+        game._spawn_icon("VPC")
+    for _ in range(40):
+        game._spawn_icon("AutoScaling")
+    for _ in range(120):
+        game._spawn_icon("EC2")
+
+
+def _spam_vpcs(game, frame):
+    """毎フレームVPCを生成し続け、クォータ超過による即死と通知を発生させる"""
+    for _ in range(5):
+        game._spawn_icon("VPC")
+
+
+def _setup_retirement_storm(game):
+    for _ in range(game.VPC_DEFAULT_QUOTA):
+        game._spawn_icon("VPC")
+    for _ in range(600):
+        icon = game._spawn_icon("EC2")
+        icon.age_frames = AWSIcon.EC2_RETIREMENT_MIN_AGE_FRAMES
+
+
+def _retire_ec2s(game, frame):
+    """毎フレーム一定数のEC2をリタイアさせ、通知と体力減少による大量終了を発生させる"""
+    candidates = [icon for icon in game.all_icons
+                  if icon.service_type == "EC2" and not icon.retiring]
+    for icon in random.sample(candidates, min(10, len(candidates))):
+        icon.retiring = True
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in [
+        Scenario("mixed_100", "100 mixed icons", _populate(100), None, 300, 30),
+        Scenario("mixed_1000", "1,000 mixed icons", _populate(1000), None, 60, 5),
+        Scenario("mixed_5000", "5,000 mixed icons", _populate(5000), None, 10, 1),
+        Scenario("ec2_swarm", "EC2 triplets evolving into AutoScaling",
+                 _setup_ec2_swarm, None, 240, 0),
+        Scenario("autoscaling_churn", "AutoScaling scale-out/scale-in churn",
+                 _setup_autoscaling_churn, None, 300, 0),
+        Scenario("vpc_quota_spam", "VPC spawns beyond the default quota",
+                 _populate(100), _spam_vpcs, 200, 0),
+        Scenario("retirement_storm", "mass EC2 retirement",
+                 _setup_retirement_storm, _retire_ec2s, 200, 0),
+    ]
+}
+
+
+def run_scenario(scenario, seed=0, frames=None):
+    """シナリオを実行し、フェーズ別のフレーム時間の統計を返す"""
+    frames = scenario.frames if frames is None else frames
+    game = Game(seed)
+    scenario.setup(game)
+    icons_start = len(game.all_icons)
+    profiler = game.profiler
+    profiler.history = scenario.warmup + frames
+
+    profiler.enabled = True
+    started = time.perf_counter()
+    for frame in range(scenario.warmup + frames):
+        if frame == scenario.warmup:
+            profiler.reset()
+            started = time.perf_counter()
+        profiler.begin_frame()
+        if scenario.per_frame:
+            scenario.per_frame(game, frame)
+        game.update()
+        game.render()
+        profiler.end_frame()
+    wall_time = time.perf_counter() - started
+
+    return {
+        "description": scenario.description,
+        "seed": seed,
+        "frames": frames,
+        "icons_start": icons_start,
+        "icons_end": len(game.all_icons),
+        "wall_time_s": wall_time,
+        "phases": profiler.summary(),
+    }
+
+
+def run_benchmarks(names, seed=0, frames=None, log=print):
+    """複数シナリオを実行して結果（JSON化できる辞書）を返す"""
+    results = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        result = run_scenario(SCENARIOS[name], seed, frames)
+        results["scenarios"][name] = result
+        frame = result["phases"].get("frame", summarize([]))
+        log(f"{name:<20} {result['frames']:>5} frames  "
+            f"mean {frame['mean_ms']:8.2f} ms  p95 {frame['p95_ms']:8.2f} ms  "
+            f"p99 {frame['p99_ms']:8.2f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance=0.10, min_delta_ms=0.05):
+    """結果をベースラインと比較し、劣化した項目のリストを返す
+
+    平均またはp95がベースラインより tolerance（割合）を超えて悪化し、
+    かつ差が min_delta_ms を超える場合に劣化とみなす（微小な揺らぎは無視する）。
+    戻り値は (シナリオ名, フェーズ名, 指標, ベースライン, 今回) のリスト。
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for phase, stats in result["phases"].items():
+            base_stats = base["phases"].get(phase)
+            if base_stats is None:
+                continue
+            for metric in ("mean_ms", "p95_ms"):
+                before, after = base_stats[metric], stats[metric]
+                if (after > before * (1 + tolerance)
+                        and after - before > min_delta_ms):
+                    regressions.append((name, phase, metric, before, after))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AWS Icon Life benchmark")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="実行するシナリオ（複数指定可。省略時は全シナリオ）")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="計測フレーム数（省略時はシナリオごとの既定値）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--output", help="結果を書き出すJSONファイル")
+    parser.add_argument("--baseline", help="比較対象のベースラインJSONファイル")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="劣化とみなす悪化率（デフォルト: 0.10 = 10%%）")
+    parser.add_argument("--list", action="store_true", help="シナリオ一覧を表示して終了")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:<20} {scenario.description}")
+        return 0
+
+    results = run_benchmarks(args.scenario or list(SCENARIOS), args.seed, args.frames)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, phase, metric, before, after in regressions:
+            change = f"{after / before - 1:+.0%}" if before else "new"
+            print(f"REGRESSION {name}/{phase} {metric}: "
+                  f"{before:.2f} ms -> {after:.2f} ms ({change})")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,12 @@ UI_BORDER_COLOR = (200, 200, 200)
 # AutoScalingはランダム配置では出現せず、EC2の進化によってのみ発生する
 AWS_ICONS = ["EC2", "S3", "VPC", "Lambda", "EBS", "RDS", "IAM", "DynamoDB", "API Gateway", "CloudFront"]
 
+# サービス種別の整数ID（物理演算の配列などで文字列の代わりに使う）
+SERVICE_TYPE_IDS = {
+    service_type: type_id
+    for type_id, service_type in enumerate(AWS_ICONS + ["AutoScaling"])
+}
+
 # ARN採番に使う共通の値（アカウント内で固定。ARNのregion/account部分に使用）
 AWS_PARTITION = "aws"
 AWS_REGION = "us-east-1"
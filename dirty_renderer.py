@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """前フレームから変化した領域だけを描き直すレンダラー
+
+    アイコンごとに描画範囲（draw_bounds）と描画結果を決める値（draw_signature）を
+    覚えておき、値が変わったアイコンの前回と今回の範囲、消えたアイコンの前回の範囲、
+    呼び出し側が指定した範囲（extra_dirty）をダーティ矩形とする。
+    重なる矩形はまとめたうえで、矩形ごとにクリップして背景→アイコン→レイヤーの順に描き直し、
+    render()が返す矩形だけを pygame.display.update(rects) で画面に反映すればよい。
+    ダーティ矩形の面積が画面のthreshold（割合）を超えた場合は全体を描き直す。
+    """
+
+    FULL_REDRAW_THRESHOLD = 0.4  # 画面に対するダーティ矩形の面積の割合がこれを超えたら全体を描き直す
+
+    def __init__(self, surface, background_color, draw_background=None,
+                 threshold=FULL_REDRAW_THRESHOLD):
+        """draw_backgroundは背景色で塗った後に呼ばれる背景の追加描画（区切り線など）"""
+        self.surface = surface
+        self.background_color = background_color
+        self.draw_background = draw_background
+        self.threshold = threshold
+        self.previous = {}  # {アイコン: (描画範囲, 描画状態)}（前回描画したもの）
+        self.full_redraw_pending = True  # 初回は全体を描く
+        # 直近のフレームのダーティ矩形の面積の割合と、全体/部分描画の回数
+        self.last_dirty_ratio = 1.0
+        self.full_redraws = 0
+        self.partial_redraws = 0
+
+    def invalidate(self):
+        """次のrender()で全体を描き直させる（ウィンドウの再表示時など）"""
+        self.full_redraw_pending = True
+
+    def render(self, icons, layers=(), extra_dirty=(), full=False):
+        """アイコンとレイヤーを描画し、画面に反映すべき矩形のリストを返す
+
+        layersは (範囲の矩形, 描画関数) のリストで、アイコンの上に順に重ねる
+        （範囲がNoneのレイヤーは描かない）。全体を描き直した場合はNoneを返すので、
+        呼び出し側は pygame.display.flip() で画面全体を反映する。
+        """
+        icons = list(icons)
+        dirty = [pygame.Rect(rect) for rect in extra_dirty]
+        current = {}
+        previous = self.previous
+        for icon in icons:
+            state = (icon.draw_bounds(), icon.draw_signature())
+            current[icon] = state
+            before = previous.pop(icon, None)
+            if before is None:
+                dirty.append(state[0])
+            elif before[1] != state[1]:
+                dirty.append(before[0])
+                dirty.append(state[0])
+        # 前回描画したが今回はいないアイコン（削除・進化したもの）の跡を消す
+        dirty.extend(bounds for bounds, _ in previous.values())
+        self.previous = current
+
+        screen_rect = self.surface.get_rect()
+        dirty = self._merge([rect.clip(screen_rect) for rect in dirty])
+        area = sum(rect.width * rect.height for rect in dirty)
+        self.last_dirty_ratio = area / (screen_rect.width * screen_rect.height)
+
+        if full or self.full_redraw_pending or self.last_dirty_ratio > self.threshold:
+            self.full_redraw_pending = False
+            self.full_redraws += 1
+            self._draw(screen_rect, icons, layers)
+            return None
+
+        self.partial_redraws += 1
+        if dirty:
+            bounds = [current[icon][0] for icon in icons]
+            for rect in dirty:
+                self.surface.set_clip(rect)
+                self._draw(rect, [icons[i] for i in rect.collidelistall(bounds)], layers)
+            self.surface.set_clip(None)
+        return dirty
+
+    def _draw(self, rect, icons, layers):
+        """背景・アイコン・rectに重なるレイヤーの順に描画する"""
+        surface = self.surface
+        surface.fill(self.background_color, rect)
+        if self.draw_background:
+            self.draw_background(surface)
+        for icon in icons:
+            icon.draw(surface)
+        for layer_rect, draw in layers:
+            if layer_rect is not None and rect.colliderect(layer_rect):
+                draw(surface)
+
+    @staticmethod
+    def _merge(rects):
+        """重なり合う矩形のうち、まとめても面積が増えないものを1つにまとめる（空の矩形は除く）
+
+        まとめると余計な領域まで描き直すことになる組はそのまま残す
+        （重なった部分は2回描かれるが、結果は同じ）。
+        """
+        merged = []
+        for rect in rects:
+            if not rect.width or not rect.height:
+                continue
+            index = 0
+            while index < len(merged):
+                other = merged[index]
+                union = rect.union(other)
+                if (rect.colliderect(other) and union.width * union.height
+                        <= rect.width * rect.height + other.width * other.height):
+                    rect = union
+                    merged.pop(index)
+                    index = 0
+                else:
+                    index += 1
+            merged.append(rect)
+        return merged
@@ -4,6 +4,9 @@
 import math
 from collections import namedtuple
 
+from icon_registry import icons_of_type
+from spatial_hash import SpatialHashGrid
+
 # 進化の結果を表すデータ
 # icons: 進化して消えるアイコンのリスト
 # source_type / target_type: 進化前 / 進化後のサービスタイプ
@@ -14,6 +17,38 @@ Evolution = namedtuple(
 )
 
 
+class _UnionFind:
+    """要素の連結関係をまとめるUnion-Find（経路半減・サイズによる併合）"""
+
+    def __init__(self, items):
+        self.items = items
+        self.parent = {item: item for item in items}
+        self.size = {item: 1 for item in items}
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] is not item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a is root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self):
+        """連結成分のリスト（各成分は items の順、成分は先頭要素の順）"""
+        groups = {}
+        for item in self.items:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
 class EvolutionSystem:
     """アイコンの「進化」を管理するクラス
 
@@ -32,25 +67,31 @@ class EvolutionSystem:
         "EC2": "AutoScaling",
     }
 
+    def __init__(self):
+        # 直近のupdate()で行った隣接判定（距離計算）の回数（プロファイラ表示用）
+        self.distance_checks = 0
+        # 進化元のサービスタイプごとの空間ハッシュ（フレーム間で使い回して差分更新する）
+        self.grids = {}
+
     def update(self, all_icons):
         """進化条件を判定し、発生した進化（Evolution）のリストを返す
 
         各アイコンの evolution_timer / evolution_progress を更新する。
         進化で消えるアイコンの削除と進化後アイコンの生成は呼び出し側が行う。
         """
-        icons = list(all_icons)
+        self.distance_checks = 0
         evolutions = []
         for source_type, target_type in self.EVOLUTION_RULES.items():
-            evolutions.extend(self._process_rule(icons, source_type, target_type))
+            evolutions.extend(self._process_rule(all_icons, source_type, target_type))
         return evolutions
 
     def _process_rule(self, icons, source_type, target_type):
         """1つの進化ルールについて、タイマーの更新と進化の判定を行う"""
-        source_icons = [icon for icon in icons if icon.service_type == source_type]
+        source_icons = list(icons_of_type(icons, source_type))
         evolutions = []
         qualified_ids = set()
 
-        for cluster in self._find_clusters(source_icons):
+        for cluster in self._find_clusters(source_icons, source_type):
             # GROUP_SIZE以上のアイコンが隣接しているクラスタのみ進化条件を満たす
             if len(cluster) < self.GROUP_SIZE:
                 continue
@@ -83,28 +124,31 @@ class EvolutionSystem:
 
         return evolutions
 
-    def _find_clusters(self, icons):
-        """隣接（ADJACENCY_DISTANCE以内）で連結しているアイコンのクラスタを列挙する"""
-        clusters = []
-        visited = set()
-        for start in icons:
-            if id(start) in visited:
-                continue
-            cluster = []
-            stack = [start]
-            visited.add(id(start))
-            while stack:
-                icon = stack.pop()
-                cluster.append(icon)
-                for other in icons:
-                    if id(other) not in visited and self._is_adjacent(icon, other):
-                        visited.add(id(other))
-                        stack.append(other)
-            clusters.append(cluster)
-        return clusters
+    def _find_clusters(self, icons, source_type=None):
+        """隣接（ADJACENCY_DISTANCE以内）で連結しているアイコンのクラスタを列挙する
+
+        サービスタイプごとの空間ハッシュ（セルサイズ＝隣接距離）を毎フレーム差分更新し、
+        周囲のセルにいる候補とだけ距離判定してUnion-Findで連結する。
+        クラスタは先頭のアイコンの順に、クラスタ内のアイコンは icons の順に並ぶ。
+        """
+        grid = self.grids.get(source_type)
+        if grid is None:
+            grid = self.grids[source_type] = SpatialHashGrid(self.ADJACENCY_DISTANCE)
+        grid.sync(icons, lambda icon: icon.rect.center)
+
+        order = {icon: index for index, icon in enumerate(icons)}
+        clusters = _UnionFind(icons)
+        for icon in icons:
+            index = order[icon]
+            for other in grid.query(*icon.rect.center, self.ADJACENCY_DISTANCE):
+                # 各ペアは順序が後ろのアイコン側から1回だけ判定する
+                if order[other] > index and self._is_adjacent(icon, other):
+                    clusters.union(icon, other)
+        return clusters.groups()
 
     def _is_adjacent(self, icon1, icon2):
         """2つのアイコンが隣接しているかを判定"""
+        self.distance_checks += 1
         dx = icon1.rect.centerx - icon2.rect.centerx
         dy = icon1.rect.centery - icon2.rect.centery
         return math.hypot(dx, dy) < self.ADJACENCY_DISTANCE
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import time
+from collections import deque
+
+from profiler import percentile
+
+
+class FixedTimestep:
+    """描画とは独立に、シミュレーションを一定のティックレートで進めるためのアキュムレータ
+
+    描画フレームごとに advance() を呼ぶと、前回からの経過時間を貯めておき、
+    1ティック分（1 / tick_rate 秒）貯まるごとに進めるべきティック数を返す。
+    描画が遅れた場合は1回の描画の前に複数ティック進める（その間の描画は飛ばす）。
+    ただし1回あたり max_steps ティックまでとし、それでも追いつけない分は捨てる
+    （処理が追いつかなくなり、ティックが増え続ける悪循環を防ぐ）。
+    alpha は貯まった端数（0.0〜1.0）で、前ティックと現ティックの位置の補間に使う。
+
+    speed を2以上にすると経過時間をその倍数として貯める早送りになる（上限もspeed倍）。
+    speed が None の場合は「可能な限り速く」で、描画1回ごとに1ティック分の実時間を
+    使い切るまでティックを進める。frame_ticks() は描画フレームごとに進めるティックを1つずつ返す。
+    """
+
+    MAX_STEPS = 5      # 1回の描画の前に進める最大ティック数
+    HISTORY = 600      # フレーム間隔の統計を取る直近フレーム数
+    EPSILON = 1e-9     # ティック数の切り捨て時に許容する誤差（ティック単位）
+    SPEED_WINDOW = 1.0  # 実際の速さ（achieved_speed）を測る直近の時間（秒）
+
+    def __init__(self, tick_rate, max_steps=MAX_STEPS, clock=time.perf_counter,
+                 history=HISTORY, speed=1):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self.speed = speed  # 実時間に対する倍率（Noneは可能な限り速く）
+        self.intervals = deque(maxlen=history)  # 描画フレームの間隔（秒）
+        self._progress = deque()  # 直近の (時刻, それまでのティック数)
+        self.reset()
+
+    def reset(self):
+        """アキュムレータと統計をリセットし、現在時刻から計測し直す"""
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self._last = None
+        self.intervals.clear()
+        self._progress.clear()
+        self.ticks = 0             # 進めたティックの合計
+        self.frames = 0            # 描画フレーム（advance()の呼び出し）の合計
+        self.skipped_renders = 0   # 遅れを取り戻すために飛ばした描画の数
+        self.dropped_ticks = 0     # 追いつけずに捨てたティックの数
+
+    def advance(self):
+        """経過時間を貯め、この描画フレームで進めるべきティック数を返す
+
+        可能な限り速く進める場合（speedがNone）は0を返す。進めるティックはframe_ticks()で得る。
+        """
+        now = self.clock()
+        if self._last is None:
+            # 最初の呼び出しでは1ティックだけ進める
+            self._last = now
+            self.accumulator = self.dt
+        else:
+            elapsed = now - self._last
+            self._last = now
+            self.intervals.append(elapsed)
+            self.accumulator += elapsed * (self.speed or 0)
+        self.frames += 1
+        self._record_progress(now)
+
+        if self.speed is None:
+            self.accumulator = 0.0
+            self.alpha = 1.0  # 補間せず最新の状態を描く
+            return 0
+
+        # 浮動小数点の誤差で1ティック分にわずかに足りない場合も1ティックとみなす
+        max_steps = self.max_steps * self.speed
+        steps = min(int(self.accumulator / self.dt + self.EPSILON), max_steps)
+        self.accumulator -= steps * self.dt
+        if self.accumulator / self.dt + self.EPSILON >= 1:
+            # 上限まで進めても残る遅れは捨てる（alphaは0〜1に保つ）
+            dropped = int(self.accumulator / self.dt + self.EPSILON)
+            self.dropped_ticks += dropped
+            self.accumulator -= dropped * self.dt
+        self.alpha = min(1.0, max(0.0, self.accumulator / self.dt))
+
+        self.ticks += steps
+        # 早送り中は1描画あたりspeedティックが通常なので、それを超えた分を飛ばした描画とする
+        expected = self.speed
+        if steps > expected:
+            self.skipped_renders += (steps - 1) // expected
+        return steps
+
+    def frame_ticks(self):
+        """この描画フレームで進めるティックを1つずつ返すイテレータ（advance()を含む）"""
+        steps = self.advance()
+        if self.speed is not None:
+            yield from range(steps)
+            return
+        # 可能な限り速く: 1ティック分（1 / tick_rate 秒）の実時間を使い切るまで進める
+        deadline = self.clock() + self.dt
+        while True:
+            self.ticks += 1
+            yield
+            if self.clock() >= deadline:
+                break
+
+    def _record_progress(self, now):
+        """実際の速さを測るため、時刻とティック数を記録する（SPEED_WINDOWより古いものは捨てる）"""
+        progress = self._progress
+        progress.append((now, self.ticks))
+        while len(progress) > 2 and now - progress[1][0] >= self.SPEED_WINDOW:
+            progress.popleft()
+
+    def achieved_speed(self):
+        """直近SPEED_WINDOW秒に実際に進んだ速さ（実時間に対する倍率）"""
+        if len(self._progress) < 2:
+            return 0.0
+        (start, start_ticks), (end, end_ticks) = self._progress[0], self._progress[-1]
+        if end <= start:
+            return 0.0
+        return (end_ticks - start_ticks) / (end - start) / self.tick_rate
+
+    def stats(self):
+        """フレーム間隔のばらつき（ジッター）などの統計を返す（時間はミリ秒）"""
+        values = sorted(self.intervals)
+        if values:
+            mean = sum(values) / len(values)
+            stdev = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+        else:
+            mean = stdev = 0.0
+        target = self.dt * 1000
+        return {
+            "target_ms": target,
+            "interval_mean_ms": mean * 1000,
+            "interval_stdev_ms": stdev * 1000,
+            "interval_p95_ms": percentile(values, 0.95) * 1000,
+            "interval_p99_ms": percentile(values, 0.99) * 1000,
+            # 目標の間隔からのずれの平均（フレームペーシングの乱れ）
+            "jitter_ms": (sum(abs(v * 1000 - target) for v in values) / len(values)
+                          if values else 0.0),
+            "ticks_per_frame": self.ticks / self.frames if self.frames else 0.0,
+            "skipped_renders": self.skipped_renders,
+            "dropped_ticks": self.dropped_ticks,
+            "requested_speed": self.speed,
+            "achieved_speed": self.achieved_speed(),
+        }
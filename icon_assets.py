@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pygame
+
+from constants import ICON_COLORS, SERVICE_TYPE_IDS
+
+
+class IconAssetCache:
+    """サービスタイプごとのアイコン画像（50x50のSurface）を1回だけ用意して共有するキャッシュ
+
+    同じサービスのアイコンはすべて同じSurfaceを参照するため、生成のたびに
+    ファイルの存在確認・読み込み・拡大縮小やサービス名の描画を行わずに済む。
+    画像は次の順で探す:
+      1. アトラス（全サービスの画像を1枚に並べたPNG。build_atlas()で作成）
+      2. assets/icons/<サービス名の小文字>.png
+      3. 色付きの四角形とサービス名のテキストによる代替画像
+    画面（pygame.display）が作成済みなら、画面のピクセル形式に変換して保持する。
+    """
+
+    ICON_SIZE = (50, 50)
+    ICON_DIR = os.path.join("assets", "icons")
+    ATLAS_PATH = os.path.join("assets", "icon_atlas.png")
+    # アトラス内の並び順（列番号＝サービス種別の整数ID）
+    ATLAS_ORDER = list(SERVICE_TYPE_IDS)
+
+    def __init__(self, icon_dir=ICON_DIR, atlas_path=ATLAS_PATH):
+        self.icon_dir = icon_dir
+        self.atlas_path = atlas_path
+        self.surfaces = {}  # {サービスタイプ: Surface}
+        self._atlas = None
+        self._atlas_loaded = False
+
+    def get(self, service_type):
+        """サービスタイプのアイコン画像を返す（初回のみ読み込み・生成する）"""
+        surface = self.surfaces.get(service_type)
+        if surface is None:
+            surface = self._for_display(self._load(service_type))
+            self.surfaces[service_type] = surface
+        return surface
+
+    def convert_for_display(self):
+        """キャッシュ済みの画像を画面のピクセル形式に変換し直す（画面作成直後に呼ぶ）"""
+        for service_type, surface in self.surfaces.items():
+            self.surfaces[service_type] = self._for_display(surface)
+
+    def clear(self):
+        """キャッシュとアトラスを破棄する（画像を差し替えた場合など）"""
+        self.surfaces.clear()
+        self._atlas = None
+        self._atlas_loaded = False
+
+    def build_atlas(self, path=None):
+        """全サービスの画像をATLAS_ORDERの順に横1列に並べたアトラスを保存する
+
+        アトラス自体からは読み込まず、個別のPNG（なければ代替画像）から作る。
+        """
+        width, height = self.ICON_SIZE
+        atlas = pygame.Surface((width * len(self.ATLAS_ORDER), height), pygame.SRCALPHA)
+        for column, service_type in enumerate(self.ATLAS_ORDER):
+            atlas.blit(self._load_file(service_type) or self._render_placeholder(service_type),
+                       (column * width, 0))
+        pygame.image.save(atlas, path or self.atlas_path)
+        return atlas
+
+    def _load(self, service_type):
+        """アトラス→個別PNG→代替画像の順に画像を用意する"""
+        surface = self._load_from_atlas(service_type)
+        if surface is None:
+            surface = self._load_file(service_type)
+        if surface is None:
+            surface = self._render_placeholder(service_type)
+        return surface
+
+    def _load_from_atlas(self, service_type):
+        """アトラスから切り出す（アトラスがない・サービスが載っていない場合はNone）"""
+        if not self._atlas_loaded:
+            self._atlas_loaded = True
+            if os.path.exists(self.atlas_path):
+                try:
+                    self._atlas = pygame.image.load(self.atlas_path)
+                except pygame.error:
+                    self._atlas = None
+        if self._atlas is None or service_type not in self.ATLAS_ORDER:
+            return None
+        width, height = self.ICON_SIZE
+        column = self.ATLAS_ORDER.index(service_type)
+        area = pygame.Rect(column * width, 0, width, height)
+        # 古いアトラス（サービス追加前に作ったもの）には載っていない
+        if not self._atlas.get_rect().contains(area):
+            return None
+        return self._atlas.subsurface(area).copy()
+
+    def _load_file(self, service_type):
+        """assets/icons/<サービス名の小文字>.pngを読み込んでICON_SIZEに縮小する（なければNone）"""
+        icon_path = os.path.join(self.icon_dir, f"{service_type.lower()}.png")
+        if not os.path.exists(icon_path):
+            return None
+        try:
+            return pygame.transform.scale(pygame.image.load(icon_path), self.ICON_SIZE)
+        except pygame.error:
+            return None
+
+    def _render_placeholder(self, service_type):
+        """色付きの四角形にサービス名を描いた代替画像を作る"""
+        surface = pygame.Surface(self.ICON_SIZE)
+        surface.fill(ICON_COLORS.get(service_type, (200, 200, 200)))
+        # サービス名がアイコンの幅に収まるようフォントサイズを調整する
+        font_size = 20
+        while True:
+            font = pygame.font.SysFont(None, font_size)
+            text = font.render(service_type, True, (0, 0, 0))
+            if text.get_width() <= self.ICON_SIZE[0] - 4 or font_size <= 10:
+                break
+            font_size -= 1
+        text_rect = text.get_rect(center=surface.get_rect().center)
+        surface.blit(text, text_rect)
+        return surface
+
+    @staticmethod
+    def _for_display(surface):
+        """画面があればそのピクセル形式に変換する（透過ありはconvert_alpha）"""
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            if surface.get_flags() & pygame.SRCALPHA:
+                return surface.convert_alpha()
+            return surface.convert()
+        return surface
+
+
+# プロセス全体で共有するキャッシュ
+icon_assets = IconAssetCache()
+
+
+def icon_surface(service_type):
+    """共有キャッシュからサービスタイプのアイコン画像を取得する"""
+    return icon_assets.get(service_type)
+
+
+if __name__ == "__main__":
+    # python icon_assets.py [出力パス] でアトラスを作り直す
+    pygame.font.init()
+    path = sys.argv[1] if len(sys.argv) > 1 else IconAssetCache.ATLAS_PATH
+    icon_assets.build_atlas(path)
+    print(f"Wrote icon atlas for {len(IconAssetCache.ATLAS_ORDER)} services to {path}")
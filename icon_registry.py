@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import pygame
+
+from neighbor_index import NeighborIndex
+
+
+class IconRegistry(pygame.sprite.Group):
+    """サービスタイプごとのバケットを持つアイコンのグループ
+
+    pygame.sprite.Group と同じように使えるうえ、追加・削除のたびに
+    {サービスタイプ: アイコン} のバケットを更新するので、
+    特定のサービスタイプのアイコンを全件走査せずに取り出せる。
+    バケット内の順序はグループへの追加順（グループの反復順）と同じ。
+    neighbors はタイプごとの近傍検索（NeighborIndex）で、アイコンが移動したら
+    invalidate() で作り直させる（Simulationが毎フレームの更新前に行う）。
+    """
+
+    def __init__(self, *sprites):
+        self.buckets = {}  # {サービスタイプ: {アイコン: None}}（挿入順を保つ集合として使う）
+        self.neighbors = NeighborIndex()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        bucket = self.buckets.get(sprite.service_type)
+        if bucket is None:
+            bucket = self.buckets[sprite.service_type] = {}
+        bucket[sprite] = None
+        self.neighbors.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        bucket = self.buckets.get(sprite.service_type)
+        if bucket is not None:
+            bucket.pop(sprite, None)
+        self.neighbors.remove(sprite)
+
+    def of_type(self, service_type):
+        """指定サービスタイプのアイコン（追加順の読み取り専用ビュー）"""
+        bucket = self.buckets.get(service_type)
+        return bucket.keys() if bucket else ()
+
+    def count_of(self, service_type):
+        """指定サービスタイプのアイコン数"""
+        return len(self.buckets.get(service_type, ()))
+
+    def type_counts(self):
+        """{サービスタイプ: アイコン数}（アイコンが1つ以上あるタイプのみ）"""
+        return {service_type: len(bucket)
+                for service_type, bucket in self.buckets.items() if bucket}
+
+
+def icons_of_type(icons, service_type):
+    """アイコンの集まりから指定サービスタイプのアイコンを取り出す
+
+    IconRegistryならバケットをそのまま返し、リストなど通常のコレクションなら走査して絞り込む。
+    """
+    of_type = getattr(icons, "of_type", None)
+    if of_type is not None:
+        return of_type(service_type)
+    return [icon for icon in icons if icon.service_type == service_type]
+
+
+def nearest_of_type(icons, service_type, icon, radius=None):
+    """iconに最も近い指定サービスタイプのアイコン（radius指定時は距離radius未満のみ、なければNone）
+
+    IconRegistryなら近傍検索を使い、通常のコレクションなら全件から最小距離のものを探す。
+    距離が等しい場合は反復順で先のものを返す。
+    """
+    x, y = icon.rect.center
+    neighbors = getattr(icons, "neighbors", None)
+    if neighbors is not None:
+        return neighbors.nearest(service_type, x, y, radius, exclude=icon)
+    closest = None
+    min_distance = float('inf')
+    for other in icons_of_type(icons, service_type):
+        if other is icon:
+            continue
+        dx = other.rect.centerx - x
+        dy = other.rect.centery - y
+        distance = math.sqrt(dx*dx + dy*dy)
+        if distance < min_distance:
+            closest, min_distance = other, distance
+    if radius is not None and min_distance >= radius:
+        return None
+    return closest
+
+
+def icons_near(icons, service_type, icon, radius):
+    """iconから距離radius未満にある指定サービスタイプのアイコン（反復順のリスト、icon自身は除く）"""
+    x, y = icon.rect.center
+    neighbors = getattr(icons, "neighbors", None)
+    if neighbors is not None:
+        return neighbors.within(service_type, x, y, radius, exclude=icon)
+    return [other for other in icons_of_type(icons, service_type)
+            if other is not icon and icon._is_near(other, radius)]
@@ -2,22 +2,24 @@
 # -*- coding: utf-8 -*-
 
 import pygame
+import argparse
 import sys
 import os
 import random
-import math
-from datetime import datetime, timedelta, timezone
 from pygame.locals import *
 
 # 自作モジュールのインポート
 from constants import *
-from aws_icon import AWSIcon
-from evolution_system import EvolutionSystem
-from progress_system import ProgressSystem
+from simulation import Simulation
+from icon_assets import icon_assets
+from text_cache import text_cache
+from dirty_renderer import DirtyRectRenderer
+from frame_pacing import FixedTimestep
 from ui_panel import UIPanel
+from profiler_overlay import ProfilerOverlay
 
-class Game:
-    """ゲームのメインクラス"""
+class Game(Simulation):
+    """ゲームのメインクラス（Simulationに画面描画と入力処理を加える）"""
     
     # キーボードのアルファベットと生成するサービスの対応
     # （EBSはEがEC2と重複するため頭文字ではなくBlock storeのBを割り当て）
@@ -34,54 +36,40 @@ class Game:
         K_c: "CloudFront",
     }
 
-    # VPCのデフォルトクォータ（AWSアカウントのリージョンあたり5個）
-    # これを超えて6個目を作ろうとすると即座に失敗することを表現する
-    VPC_DEFAULT_QUOTA = 5
-    # デフォルトクォータ超過時のAWS CreateVpcエラーメッセージを忠実に再現
-    # （errorCode: VpcLimitExceeded）
-    VPC_QUOTA_ERROR_MESSAGE = (
-        "An error occurred (VpcLimitExceeded) when calling the CreateVpc "
-        "operation: The maximum number of VPCs has been reached."
-    )
+    # シミュレーションを進めるティックレート（1秒あたりのupdate()回数）。
+    # フレーム数で表した定数（進化・クールダウン・リタイアなど）はこの速さで経過する
+    SIMULATION_TICK_RATE = FPS
 
-    # EC2インスタンスのリタイア通知に使うリージョン（ARNの採番と同じ値を使う）
-    EC2_RETIREMENT_REGION = AWS_REGION
+    # 早送りの速さ（実時間に対する倍率。Noneは描画の合間に可能な限り速く進める）
+    SPEEDS = (1, 2, 4, 8, 16, 32, 64, None)
 
-    # 相互作用に関する定数
-    VELOCITY_SLOWDOWN_FACTOR = 0.9
-    VELOCITY_INCREASE_FACTOR = 1.1
-    VELOCITY_MAX_MULTIPLIER = 2
-    HEALTH_RECOVERY_AMOUNT = 0.1
-    VELOCITY_FOLLOW_FACTOR = 0.3
-    
-    def __init__(self):
+    def __init__(self, seed=None):
         """初期化"""
         pygame.init()
+        super().__init__(seed)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
+        # 画面作成前に用意したアイコン画像も画面のピクセル形式にそろえる（blitの高速化）
+        icon_assets.convert_for_display()
         self.clock = pygame.time.Clock()
         self.running = True
         
-        # アイコングループ
-        self.all_icons = pygame.sprite.Group()
-        
         # UIパネル
         self.ui_panel = UIPanel(GAME_AREA_WIDTH, 0, UI_PANEL_WIDTH, SCREEN_HEIGHT)
-        
-        # 選択中のアイコン
-        self.selected_icon = None
-        
-        # 直接操作中のアイコン
-        self.direct_control_icon = None
-        
-        # 進行システム
-        self.progress_system = ProgressSystem()
 
-        # 進化システム
-        self.evolution_system = EvolutionSystem()
+        # 変化した領域だけを描き直すレンダラー（前フレームのパネル・通知の状態と合わせて使う）
+        self.renderer = DirtyRectRenderer(self.screen, BACKGROUND_COLOR, self._draw_separator)
+        self._panel_state = None
+        self._notification_rect = None
+        self._overlay_was_visible = False
 
-        # EC2リタイア通知に使うAWSアカウントID（ARNの採番と同じ値を使う）
-        self.aws_account_id = AWS_ACCOUNT_ID
+        # 描画とは独立にシミュレーションを一定のティックレートで進めるためのアキュムレータ
+        self.timestep = FixedTimestep(self.SIMULATION_TICK_RATE)
+        self.speed_index = 0  # SPEEDSのうち現在の速さの位置（+/-キーで切り替え）
+
+        # フェーズ別処理時間のオーバーレイ（F3で表示を切り替え、表示中のみ計測する）
+        self.profiler_overlay = ProfilerOverlay()
+        self.show_profiler = False
         
         # 初期アイコンの生成
         self._create_initial_icons()
@@ -91,48 +79,6 @@ class Game:
         # 起動時には何もアイコンを配置しない
         pass
 
-    def _spawn_icon(self, service, position=None):
-        """指定サービスのアイコンを生成して追加する（位置未指定ならランダム配置）"""
-        if position is None:
-            position = (random.randint(50, GAME_AREA_WIDTH - 50),
-                        random.randint(50, SCREEN_HEIGHT - 50))
-        icon = AWSIcon(service, position)
-
-        # VPCはデフォルトクォータ（5個）を超えると6個目以降は即死する。
-        # AWSアカウントでデフォルトでは5個までしかVPCを作れないことの表現。
-        if service == "VPC":
-            existing_vpcs = sum(
-                1 for i in self.all_icons
-                if i.service_type == "VPC" and i.health > 0
-            )
-            if existing_vpcs >= self.VPC_DEFAULT_QUOTA:
-                icon.health = 0  # 即死（次の更新で除去される）
-                self.progress_system.add_notification(self.VPC_QUOTA_ERROR_MESSAGE)
-
-        self.all_icons.add(icon)
-        return icon
-
-    def _ec2_retirement_message(self, icon):
-        """AWSのEC2インスタンスリタイア通知メール本文を忠実に再現する
-
-        公式メッセージ:
-        "EC2 has detected degradation of the underlying hardware hosting your
-        Amazon EC2 instance (instance-ID: ...) associated with your AWS account
-        (AWS Account ID: ...) in the ... region. Due to this degradation your
-        instance could already be unreachable. We will stop your instance
-        after ... UTC."
-        """
-        stop_time = (datetime.now(timezone.utc) + timedelta(days=14)).strftime(
-            "%Y-%m-%d %H:%M:%S")
-        return (
-            f"EC2 has detected degradation of the underlying hardware hosting "
-            f"your Amazon EC2 instance (instance-ID: {icon.instance_id}) "
-            f"associated with your AWS account (AWS Account ID: "
-            f"{self.aws_account_id}) in the {self.EC2_RETIREMENT_REGION} region. "
-            f"Due to this degradation your instance could already be "
-            f"unreachable. We will stop your instance after {stop_time} UTC."
-        )
-
     def handle_events(self):
         """イベント処理"""
         for event in pygame.event.get():
@@ -141,6 +87,18 @@ class Game:
             elif event.type == KEYDOWN:
                 if event.key == K_ESCAPE:
                     self.running = False
+                elif event.key == K_F3:
+                    # F3でプロファイラのオーバーレイを切り替える
+                    self.toggle_profiler()
+                elif event.key in (K_EQUALS, K_PLUS, K_KP_PLUS):
+                    # +キーで早送りを1段階速くする
+                    self.set_speed(self.speed_index + 1)
+                elif event.key in (K_MINUS, K_KP_MINUS):
+                    # -キーで1段階遅くする
+                    self.set_speed(self.speed_index - 1)
+                elif event.key in (K_0, K_KP0):
+                    # 0キーで等速に戻す
+                    self.set_speed(0)
                 elif event.key == K_SPACE:
                     # スペースキーで新しいランダムなアイコンを追加
                     self._spawn_icon(random.choice(AWS_ICONS))
@@ -148,6 +106,9 @@ class Game:
                     # アルファベットキーで対応するサービスのアイコンを生成
                     # （ShiftはShift+Aの実績オーバーレイ用に予約し、生成はしない）
                     self._spawn_icon(self.KEY_TO_SERVICE[event.key])
+            elif event.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+                # ウィンドウが再表示されたら画面全体を描き直す
+                self.renderer.invalidate()
             elif event.type == MOUSEBUTTONDOWN:
                 # UIパネル外（ゲームエリア内）のみ処理
                 if event.pos[0] < GAME_AREA_WIDTH:
@@ -163,7 +124,20 @@ class Game:
             elif event.type == MOUSEMOTION:
                 # ドラッグ操作中のアイコン移動
                 if self.direct_control_icon:
-                    self.direct_control_icon.rect.center = event.pos
+                    self.direct_control_icon.center = event.pos
+
+    def toggle_profiler(self):
+        """プロファイラのオーバーレイ表示と計測を切り替える（非表示中は計測しない）"""
+        self.show_profiler = not self.show_profiler
+        self.profiler.enabled = self.show_profiler
+        if not self.show_profiler:
+            self.profiler.reset()
+
+    def set_speed(self, index):
+        """シミュレーションの速さをSPEEDSのindex番目にする（範囲外は端に丸める）"""
+        self.speed_index = max(0, min(index, len(self.SPEEDS) - 1))
+        self.timestep.speed = self.SPEEDS[self.speed_index]
+
     def _start_drag_control(self, position):
         """指定位置のアイコンを選択してドラッグ操作を開始。アイコンがあればTrue、なければFalseを返す"""
         # 以前の選択をクリア
@@ -185,251 +159,146 @@ class Game:
     
     def update(self):
         """ゲームの状態を更新"""
-        # アイコンの更新とHealthが0になったアイコンを削除
-        dead_icons = set()
-        for icon in self.all_icons:
-            icon.update(self.all_icons)
-            if icon.health <= 0:
-                dead_icons.add(icon)
-            # EC2リタイア発動時に通知を出す（発動した瞬間のみ）
-            # retiring/retirement_announcedは全アイコンで__init__済み。
-            # instance_idはEC2のみが持つため、service_typeでガードする
-            if (icon.service_type == "EC2"
-                    and icon.retiring
-                    and not icon.retirement_announced):
-                icon.retirement_announced = True
-                self.progress_system.add_notification(
-                    self._ec2_retirement_message(icon)
-                )
-        
-        # 削除対象のアイコンを処理
-        if dead_icons:
-            # 選択中のアイコンが削除される場合は選択を解除
-            if self.selected_icon in dead_icons:
-                self.selected_icon = None
-            # 直接操作中のアイコンが削除される場合は操作を解除
-            if self.direct_control_icon in dead_icons:
-                self.direct_control_icon = None
-            # アイコンをグループから効率的に削除
-            for icon in dead_icons:
-                if icon in self.all_icons:
-                    self.all_icons.remove(icon)
-
-        # AutoScalingのスケールアウトによるアイコン起動リクエストを処理
-        for icon in list(self.all_icons):
-            requests = getattr(icon, 'spawn_requests', None)
-            if requests:
-                for service_type, position in requests:
-                    self.all_icons.add(AWSIcon(service_type, position))
-                icon.spawn_requests = []
+        super().update()
 
-        # 進行状況の更新
-        self.progress_system.check_achievements(self.all_icons)
-        self.progress_system.update_notifications()
-        
         # UIパネルの更新
-        self.ui_panel.update(self.all_icons, self.selected_icon)
-        
-        # アイコン間の相互作用を処理
-        self._handle_interactions()
+        with self.profiler.phase("ui_panel"):
+            self.ui_panel.update(self.all_icons, self.selected_icon)
 
-        # アイコンの進化を処理
-        self._handle_evolutions()
+    def render(self, alpha=None):
+        """描画処理（alphaを指定すると前ティックと現ティックの間の位置に補間して描く）"""
+        with self.profiler.phase("render"):
+            if alpha is None:
+                self._render()
+                return
+            icons = self._show_interpolated(alpha)
+            try:
+                self._render()
+            finally:
+                # 描画用の矩形を物理状態の位置に戻す（次の更新は補間前の位置で行う）
+                for icon in icons:
+                    icon.sync_rect()
 
-    def _handle_evolutions(self):
-        """アイコンの進化を処理"""
-        for evolution in self.evolution_system.update(self.all_icons):
-            # 進化元のアイコンを削除（選択中・操作中の場合は参照も解除）
-            for icon in evolution.icons:
-                if self.selected_icon is icon:
-                    self.selected_icon = None
-                if self.direct_control_icon is icon:
-                    self.direct_control_icon = None
-                self.all_icons.remove(icon)
+    def _show_interpolated(self, alpha):
+        """物理ワールドのアイコンを補間した位置に表示させ、そのアイコンのリストを返す"""
+        world = self.world
+        icons = world.icons[:world.count]
+        for icon, position in zip(icons, world.interpolated_positions(alpha).tolist()):
+            icon.show_at(position)
+        return icons
 
-            # 進化後のアイコンを重心位置に生成
-            self.all_icons.add(
-                AWSIcon(evolution.target_type, evolution.position, evolution.velocity)
-            )
-            # 進化発動を実績として記録（通知＋Shift+Aオーバーレイに反映）
-            self.progress_system.record_evolution(
-                evolution.source_type, evolution.target_type
-            )
+    def _render(self):
+        """前フレームから変化した領域を描き直して画面に反映する"""
+        # Shift+A押下中は全実績の状況を最前面にオーバーレイ表示
+        keys = pygame.key.get_pressed()
+        show_achievements = keys[K_a] and (keys[K_LSHIFT] or keys[K_RSHIFT])
+        # オーバーレイの表示中と消した直後のフレームは画面全体を描き直す
+        overlay_visible = show_achievements or self.show_profiler
+        full = overlay_visible or self._overlay_was_visible
+        self._overlay_was_visible = overlay_visible
 
-    def _handle_interactions(self):
-        """アイコン間の相互作用を処理"""
-        # すべてのアイコンペアをチェック
-        for i, icon1 in enumerate(self.all_icons):
-            for icon2 in list(self.all_icons)[i+1:]:
-                # 近接しているかチェック
-                if icon1._is_near(icon2, 70):  # 70pxの距離内にある場合
-                    # 相互作用を記録
-                    icon1.last_interaction = icon2
-                    icon2.last_interaction = icon1
-                    icon1.interaction_timer = 30  # 30フレーム（約0.5秒）
-                    icon2.interaction_timer = 30
-                    
-                    # 依存関係の処理
-                    if icon2.service_type in icon1.dependencies:
-                        # 依存関係が満たされた場合、体力回復を加速
-                        icon1.recover(5)
-                    
-                    # 補完関係の処理
-                    self._handle_complementary_relations(icon1, icon2)
-                    
-                    # 重なり防止のための位置調整
-                    self._adjust_overlapping_positions(icon1, icon2)
-    
-    def _adjust_overlapping_positions(self, icon1, icon2):
-        """重なっているアイコンの位置を調整"""
-        # アイコン間のベクトルを計算
-        dx = icon2.rect.centerx - icon1.rect.centerx
-        dy = icon2.rect.centery - icon1.rect.centery
-        
-        # ベクトルの長さ（距離）を計算
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        # 最小距離は両方のアイコンの半径の合計（サイズが異なるアイコンにも対応）
-        min_distance = icon1.rect.width / 2 + icon2.rect.width / 2
-        
-        # 重なっている場合のみ調整
-        if distance < min_distance and distance > 0:  # 0除算を防ぐ
-            # 重なりの度合いを計算
-            overlap = min_distance - distance
-            
-            # 正規化したベクトル
-            if distance > 0:
-                dx /= distance
-                dy /= distance
-            
-            # 重なりを解消するための移動量
-            move_x = dx * overlap / 2
-            move_y = dy * overlap / 2
-            
-            # 両方のアイコンを反対方向に移動
-            icon1.rect.x -= move_x
-            icon1.rect.y -= move_y
-            icon2.rect.x += move_x
-            icon2.rect.y += move_y
-            
-            # ゲームエリア内に収める
-            icon1.rect.left = max(0, min(icon1.rect.left, GAME_AREA_WIDTH - icon1.rect.width))
-            icon1.rect.top = max(0, min(icon1.rect.top, SCREEN_HEIGHT - icon1.rect.height))
-            icon2.rect.left = max(0, min(icon2.rect.left, GAME_AREA_WIDTH - icon2.rect.width))
-            icon2.rect.top = max(0, min(icon2.rect.top, SCREEN_HEIGHT - icon2.rect.height))
-    
-    def _cap_velocity(self, velocity, increase_factor, max_multiplier):
-        """速度成分を増加させつつ、元の速度の max_multiplier 倍を超えないようキャップする"""
-        capped = []
-        for v in velocity:
-            candidate = v * increase_factor
-            limit = v * max_multiplier
-            if v > 0:
-                capped.append(min(candidate, limit))
-            elif v < 0:
-                capped.append(max(candidate, limit))
-            else:
-                capped.append(candidate)
-        return capped
+        # UIパネルは表示内容が変わったときだけ描き直す
+        dirty = []
+        self.ui_panel.set_speed(self.timestep.speed, self.timestep.achieved_speed())
+        panel_state = self.ui_panel.state_key()
+        if panel_state != self._panel_state:
+            self._panel_state = panel_state
+            dirty.append(self.ui_panel.rect)
 
-    def _handle_complementary_relations(self, icon1, icon2):
-        """補完関係の処理"""
-        # EC2とEBSの補完関係
-        if (icon1.service_type == "EC2" and icon2.service_type == "EBS") or \
-           (icon1.service_type == "EBS" and icon2.service_type == "EC2"):
-            # 両方のアイコンの速度を少し遅くする（安定性を表現）
-            icon1.velocity = [v * self.VELOCITY_SLOWDOWN_FACTOR for v in icon1.velocity]
-            icon2.velocity = [v * self.VELOCITY_SLOWDOWN_FACTOR for v in icon2.velocity]
-            # 体力を少し回復（過度な回復を防ぐ）
-            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
-            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
-            
-            # EC2とEBSが近くにいる場合、EBSはEC2に追従する傾向を強める
-            if icon1.service_type == "EC2" and icon2.service_type == "EBS":
-                # EC2の動きにEBSを追従させる
-                icon2.velocity = [
-                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon2.velocity[0] + self.VELOCITY_FOLLOW_FACTOR * icon1.velocity[0],
-                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon2.velocity[1] + self.VELOCITY_FOLLOW_FACTOR * icon1.velocity[1]
-                ]
-            elif icon1.service_type == "EBS" and icon2.service_type == "EC2":
-                # EC2の動きにEBSを追従させる
-                icon1.velocity = [
-                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon1.velocity[0] + self.VELOCITY_FOLLOW_FACTOR * icon2.velocity[0],
-                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon1.velocity[1] + self.VELOCITY_FOLLOW_FACTOR * icon2.velocity[1]
-                ]
-        
-        # LambdaとDynamoDBの補完関係
-        if (icon1.service_type == "Lambda" and icon2.service_type == "DynamoDB") or \
-           (icon1.service_type == "DynamoDB" and icon2.service_type == "Lambda"):
-            # 両方のアイコンの速度を少し速くする（効率性を表現）- 上限あり
-            icon1.velocity = self._cap_velocity(icon1.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
-            icon2.velocity = self._cap_velocity(icon2.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
-            # 体力を少し回復（過度な回復を防ぐ）
-            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
-            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
+        # 通知はフェードするため、表示中は毎フレーム前回と今回の範囲を描き直す
+        notification_rect = self.progress_system.notification_area(self.screen)
+        for rect in (self._notification_rect, notification_rect):
+            if rect is not None:
+                dirty.append(rect)
+        self._notification_rect = notification_rect
 
-        # S3とCloudFrontの補完関係
-        if (icon1.service_type == "S3" and icon2.service_type == "CloudFront") or \
-           (icon1.service_type == "CloudFront" and icon2.service_type == "S3"):
-            # 速度を少し速くする（効率性を表現）- 上限あり
-            icon1.velocity = self._cap_velocity(icon1.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
-            icon2.velocity = self._cap_velocity(icon2.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
-            # 体力を少し回復（過度な回復を防ぐ）
-            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
-            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
+        font = text_cache.font(None, 24)
+        layers = [
+            # 進行システム（通知）の描画
+            (notification_rect, lambda surface: self.progress_system.draw(surface, font)),
+            # UIパネルの描画
+            (self.ui_panel.rect, self.ui_panel.draw),
+        ]
+        rects = self.renderer.render(self.all_icons, layers, dirty, full)
 
-            # CloudFrontの場合は追加で速度を上げる（配信の高速化を表現）
-            cloudfront_boost_factor = 1.2
-            if icon1.service_type == "CloudFront":
-                icon1.velocity = self._cap_velocity(icon1.velocity, cloudfront_boost_factor, self.VELOCITY_MAX_MULTIPLIER)
-            elif icon2.service_type == "CloudFront":
-                icon2.velocity = self._cap_velocity(icon2.velocity, cloudfront_boost_factor, self.VELOCITY_MAX_MULTIPLIER)
-    
-    def render(self):
-        """描画処理"""
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # ゲームエリアとUIの区切り線
+        if show_achievements:
+            self.progress_system.draw_overlay(self.screen)
+
+        # プロファイラのオーバーレイ（F3で切り替え）
+        if self.show_profiler:
+            self.profiler_overlay.draw(self.screen, self.profiler, self.timestep.stats())
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def _draw_separator(self, surface):
+        """ゲームエリアとUIの区切り線"""
         pygame.draw.line(
-            self.screen,
+            surface,
             UI_BORDER_COLOR,
             (GAME_AREA_WIDTH, 0),
             (GAME_AREA_WIDTH, SCREEN_HEIGHT),
             2
         )
-        
-        # アイコンの描画（カスタム描画メソッドを使用）
-        for icon in self.all_icons:
-            icon.draw(self.screen)
-        
-        # 進行システムの描画
-        font = pygame.font.SysFont(None, 24)
-        self.progress_system.draw(self.screen, font)
-        
-        # UIパネルの描画
-        self.ui_panel.draw(self.screen)
-
-        # Shift+A押下中は全実績の状況を最前面にオーバーレイ表示
-        keys = pygame.key.get_pressed()
-        if keys[K_a] and (keys[K_LSHIFT] or keys[K_RSHIFT]):
-            self.progress_system.draw_overlay(self.screen)
-
-        pygame.display.flip()
     
     def run(self):
-        """ゲームのメインループ"""
+        """ゲームのメインループ
+
+        シミュレーションは描画と独立に固定のティックレート（SIMULATION_TICK_RATE）で進める。
+        描画が遅れた分は次の描画の前に複数ティック進めて取り戻し、
+        描画はティック間の端数に応じて位置を補間する。
+        早送り中（+/-キー）は1回の描画の前に速さの倍数だけティックを進め、
+        最速の場合は描画の合間の1ティック分の時間を使い切るまで進める。
+        """
+        timestep = self.timestep
+        timestep.reset()
         while self.running:
+            self.profiler.begin_frame()
             self.handle_events()
-            self.update()
-            self.render()
+            for _ in timestep.frame_ticks():
+                self.update()
+            self.render(timestep.alpha)
+            self.profiler.end_frame()
             self.clock.tick(FPS)
         
         pygame.quit()
         sys.exit()
 
+def run_headless(frames, seed=None, icons=0):
+    """画面を開かずにシミュレーションを最速で進め、フレームレートを報告する"""
+    simulation = Simulation(seed)
+    simulation.populate(icons)
+    elapsed = simulation.run_headless(frames)
+    fps = frames / elapsed if elapsed > 0 else float("inf")
+    print(f"Simulated {frames} frames in {elapsed:.3f}s "
+          f"({fps:.1f} FPS, {len(simulation.all_icons)} icons remaining)")
+    return fps
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析する"""
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--headless", action="store_true",
+                        help="画面を開かずにシミュレーションのみを最速で実行する")
+    parser.add_argument("--frames", type=int, default=600,
+                        help="ヘッドレス実行で進めるフレーム数（デフォルト: 600）")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="乱数のシード（指定すると再現可能な実行になる）")
+    parser.add_argument("--icons", type=int, default=100,
+                        help="ヘッドレス実行開始時に配置するアイコン数（デフォルト: 100）")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.headless:
+        run_headless(args.frames, args.seed, args.icons)
+        sys.exit()
+
     # assets/iconsディレクトリが存在しない場合は作成
     os.makedirs("assets/icons", exist_ok=True)
     
-    game = Game()
+    game = Game(args.seed)
     game.run()
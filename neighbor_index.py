@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+from spatial_hash import SpatialHashGrid
+
+
+class NeighborIndex:
+    """サービスタイプごとの空間ハッシュで「最も近いタイプXのアイコン」を求める近傍検索
+
+    タイプごとのグリッドは invalidate() の後、そのタイプが最初に検索されたときに
+    1回だけ構築される（1フレームに1回 invalidate() する想定）。
+    距離が等しい候補は登録順（グループの反復順）で先のものを優先するため、
+    全件を順に走査して min() を取る場合と同じ結果になる。
+    """
+
+    CELL_SIZE = 128  # グリッドのセルサイズ（ピクセル）
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.members = {}  # {サービスタイプ: {アイコン: 登録順}}
+        self.grids = {}    # {サービスタイプ: SpatialHashGrid}（構築済みのタイプのみ）
+        self._next_order = 0
+
+    def add(self, icon):
+        """アイコンを登録する（グリッド構築済みのタイプなら即座にセルへ追加）"""
+        self.members.setdefault(icon.service_type, {})[icon] = self._next_order
+        self._next_order += 1
+        grid = self.grids.get(icon.service_type)
+        if grid is not None:
+            grid.update(icon, *icon.rect.center)
+
+    def remove(self, icon):
+        """アイコンの登録を外す"""
+        members = self.members.get(icon.service_type)
+        if members is not None:
+            members.pop(icon, None)
+        grid = self.grids.get(icon.service_type)
+        if grid is not None:
+            grid.remove(icon)
+
+    def invalidate(self):
+        """アイコンが移動した後に呼び、次の検索でグリッドを作り直させる"""
+        self.grids.clear()
+
+    def _grid(self, service_type):
+        grid = self.grids.get(service_type)
+        if grid is None:
+            grid = self.grids[service_type] = SpatialHashGrid(self.cell_size)
+            for icon in self.members.get(service_type, ()):
+                grid.update(icon, *icon.rect.center)
+        return grid
+
+    def nearest(self, service_type, x, y, radius=None, exclude=None):
+        """(x, y)に最も近いタイプservice_typeのアイコンを返す
+
+        radiusを指定した場合は距離がradius未満のものだけを対象とし、
+        見つからなければNoneを返す。radiusがNoneなら距離の制限はない。
+        """
+        grid = self._grid(service_type)
+        if not grid:
+            return None
+        order = self.members[service_type]
+        search = self.cell_size if radius is None else radius
+        while True:
+            candidates = grid.query(x, y, search)
+            best = None
+            best_key = None
+            for icon in candidates:
+                if icon is exclude:
+                    continue
+                dx = icon.rect.centerx - x
+                dy = icon.rect.centery - y
+                key = (math.sqrt(dx*dx + dy*dy), order[icon])
+                if best_key is None or key < best_key:
+                    best, best_key = icon, key
+            if radius is not None:
+                return best if best is not None and best_key[0] < radius else None
+            # 探索範囲内で見つかった最近傍は、範囲外のどの要素よりも近い
+            if (best is not None and best_key[0] <= search) or len(candidates) == len(grid):
+                return best
+            search *= 2
+
+    def within(self, service_type, x, y, radius, exclude=None):
+        """(x, y)から距離radius未満のタイプservice_typeのアイコンを登録順のリストで返す"""
+        grid = self._grid(service_type)
+        if not grid:
+            return []
+        order = self.members[service_type]
+        found = []
+        for icon in grid.query(x, y, radius):
+            if icon is exclude:
+                continue
+            dx = icon.rect.centerx - x
+            dy = icon.rect.centery - y
+            if math.sqrt(dx*dx + dy*dy) < radius:
+                found.append(icon)
+        found.sort(key=order.__getitem__)
+        return found
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+
+from constants import GAME_AREA_WIDTH, SCREEN_HEIGHT, SERVICE_TYPE_IDS
+
+
+class PhysicsWorld:
+    """全アイコンの物理状態を連続したNumPy配列（Struct of Arrays）で保持し、一括で更新するクラス
+
+    位置・速度・体力・経過フレーム数・サービス種別IDなどを1アイコン1行で格納し、
+    移動・速度制限・壁での反射・ゲームエリアへのクランプ・生存コスト・黄色体力時の
+    ランダムな力・停滞判定を、全アイコン分まとめてベクトル演算で処理する。
+    AWSIconは自分の行を参照する薄いビューとして振る舞う。
+
+    行は常に先頭から詰めて使い（0〜count-1）、削除時は末尾の行を空いた位置に移す。
+    そのため一括更新は配列のスライスだけで済む。
+    """
+
+    INITIAL_CAPACITY = 64
+
+    # 行ごとに保持するフィールド: (属性名, dtype, 1行あたりの要素形状)
+    FIELDS = (
+        ("pos", np.float64, (2,)),          # 中心座標
+        ("prev_pos", np.float64, (2,)),     # 前フレームの中心座標（停滞判定用）
+        ("tick_pos", np.float64, (2,)),     # 直前のティック開始時の中心座標（描画の補間用）
+        ("half", np.float64, (2,)),         # 幅・高さの半分
+        ("vel", np.float64, (2,)),          # 速度
+        ("health", np.float64, ()),         # 体力
+        ("max_health", np.float64, ()),     # 最大体力
+        ("age", np.int64, ()),              # 生成からの経過フレーム数
+        ("type_id", np.int16, ()),          # サービス種別ID（constants.SERVICE_TYPE_IDS）
+        ("stationary", np.int32, ()),       # 停滞しているフレーム数
+        ("stopped", np.bool_, ()),          # 停止状態（移動しない）
+        ("retiring", np.bool_, ()),         # リタイア中（回復しない）
+        ("recovers_while_moving", np.bool_, ()),  # 動いている間に回復するか
+    )
+
+    def __init__(self, params, capacity=INITIAL_CAPACITY, seed=None):
+        """params: 物理定数（SURVIVAL_COSTなど）を属性として持つオブジェクト（AWSIconクラス）"""
+        self.params = params
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.capacity = 0
+        self.icons = []  # 行番号 → その行を参照しているアイコン
+        # step()のたびに増える世代番号（アイコン側のrectの再同期判定に使う）
+        self.generation = 0
+        for name, dtype, shape in self.FIELDS:
+            setattr(self, name, np.zeros((0,) + shape, dtype=dtype))
+        self._grow(max(1, capacity))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, capacity):
+        """配列の容量をcapacityまで拡張する"""
+        for name, dtype, shape in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + shape, dtype=dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.icons.extend([None] * (capacity - len(self.icons)))
+        self.capacity = capacity
+
+    def allocate(self, icon, position, velocity, size, service_type,
+                 recovers_while_moving, health=100, max_health=100):
+        """アイコン用の行を確保して初期値を書き込み、行番号を返す"""
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+        row = self.count
+        self.count += 1
+        self.icons[row] = icon
+        self.pos[row] = position
+        self.prev_pos[row] = position
+        self.tick_pos[row] = position
+        self.half[row] = (size[0] / 2, size[1] / 2)
+        self.vel[row] = velocity
+        self.health[row] = health
+        self.max_health[row] = max_health
+        self.age[row] = 0
+        self.type_id[row] = SERVICE_TYPE_IDS.get(service_type, -1)
+        self.stationary[row] = 0
+        self.stopped[row] = False
+        self.retiring[row] = False
+        self.recovers_while_moving[row] = recovers_while_moving
+        return row
+
+    def _free_row(self, row):
+        """行を解放する（末尾の行を空いた位置に移し、配列を詰めたままにする）"""
+        last = self.count - 1
+        if row != last:
+            for name, _, _ in self.FIELDS:
+                array = getattr(self, name)
+                array[row] = array[last]
+            moved = self.icons[last]
+            self.icons[row] = moved
+            moved._row = row
+        self.icons[last] = None
+        self.count = last
+
+    def _copy_row(self, source, row, icon):
+        """別のワールドの行の内容をこのワールドの新しい行にコピーし、アイコンを付け替える"""
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+        new_row = self.count
+        self.count += 1
+        for name, _, _ in self.FIELDS:
+            getattr(self, name)[new_row] = getattr(source, name)[row]
+        self.icons[new_row] = icon
+        icon._world = self
+        icon._row = new_row
+        icon._rect_generation = -1
+
+    def attach(self, icon):
+        """他のワールド（単独生成時の専用ワールドなど）にいるアイコンをこのワールドに移す"""
+        old_world, old_row = icon._world, icon._row
+        if old_world is self:
+            return
+        self._copy_row(old_world, old_row, icon)
+        old_world._free_row(old_row)
+
+    def release(self, icon):
+        """アイコンをこのワールドから切り離す
+
+        ゲームから除去された後もアイコンへの参照（AutoScalingの監視対象など）が
+        残ることがあるため、行の内容は専用の1行ワールドへ退避し、
+        その行が別のアイコンに再利用されても値が変わらないようにする。
+        """
+        if icon._world is not self:
+            return
+        row = icon._row
+        PhysicsWorld(self.params, capacity=1)._copy_row(self, row, icon)
+        self._free_row(row)
+
+    def begin_tick(self):
+        """ティックの開始時の位置を記録する（描画時の補間の始点になる）"""
+        self.tick_pos[:self.count] = self.pos[:self.count]
+
+    def interpolated_positions(self, alpha):
+        """ティック開始時の位置と現在の位置をalpha（0.0〜1.0）で線形補間した位置の配列"""
+        start = self.tick_pos[:self.count]
+        return start + (self.pos[:self.count] - start) * alpha
+
+    def dead_icons(self):
+        """体力が0以下になったアイコンのリスト"""
+        rows = np.flatnonzero(self.health[:self.count] <= 0)
+        return [self.icons[row] for row in rows]
+
+    def step(self, rows=None):
+        """物理状態を1フレーム分まとめて更新する
+
+        rowsを省略すると全行を更新する（行番号のリストを渡すとその行のみ）。
+        """
+        p = self.params
+        sel = slice(0, self.count) if rows is None else np.asarray(rows, dtype=np.intp)
+        pos = self.pos[sel]
+        vel = self.vel[sel]
+        half = self.half[sel]
+        health = self.health[sel]
+        max_health = self.max_health[sel]
+        n = len(pos)
+        if n == 0:
+            return
+
+        # 停止していないアイコンのみ移動
+        moving = ~self.stopped[sel]
+        pos[moving] += vel[moving]
+
+        # 速度の上限を制限
+        np.clip(vel, -p.MAX_VELOCITY, p.MAX_VELOCITY, out=vel)
+
+        # 画面端での反射（ゲームエリア内のみ）
+        x, y = pos[:, 0], pos[:, 1]
+        hw, hh = half[:, 0], half[:, 1]
+        vel[(x - hw < 0) | (x + hw > GAME_AREA_WIDTH), 0] *= -1
+        vel[(y - hh < 0) | (y + hh > SCREEN_HEIGHT), 1] *= -1
+
+        # ゲームエリア内に収める
+        np.clip(x, hw, GAME_AREA_WIDTH - hw, out=x)
+        np.clip(y, hh, SCREEN_HEIGHT - hh, out=y)
+
+        # 全アイコン共通の微細なHealth減少（生存コスト）
+        np.maximum(health - p.SURVIVAL_COST, 0, out=health)
+
+        # 経過フレーム数（EC2のリタイア判定に使う）
+        age = self.age[sel]
+        age += 1
+
+        # Healthが黄色の域の場合、低確率でランダムな力を加えて停滞を防ぐ
+        ratio = health / max_health
+        kicked = np.flatnonzero(
+            (ratio > p.YELLOW_HEALTH_LOWER_THRESHOLD)
+            & (ratio <= p.YELLOW_HEALTH_UPPER_THRESHOLD)
+            & (self.rng.random(n) < p.YELLOW_HEALTH_RANDOM_MOVE_PROBABILITY)
+        )
+        if kicked.size:
+            angle = self.rng.uniform(0, 2 * math.pi, kicked.size)
+            force = self.rng.uniform(
+                p.YELLOW_HEALTH_MIN_FORCE, p.YELLOW_HEALTH_MAX_FORCE, kicked.size)
+            vel[kicked, 0] += np.cos(angle) * force
+            vel[kicked, 1] += np.sin(angle) * force
+
+        # 動きの追跡と停滞時のHealth減少
+        prev_pos = self.prev_pos[sel]
+        stationary = self.stationary[sel]
+        moved = np.hypot(x - prev_pos[:, 0], y - prev_pos[:, 1])
+        still = moved < p.MOVEMENT_THRESHOLD
+        stationary[still] += 1
+        stationary[~still] = 0
+        # 依存関係を持たないアイコンは動いている間に回復
+        # （リタイア中や、体力が0になり除去を待つアイコン（即死したVPCなど）は回復しない）
+        recovering = (~still & self.recovers_while_moving[sel]
+                      & ~self.retiring[sel] & (health > 0) & (health < max_health))
+        health[recovering] = np.minimum(
+            max_health[recovering],
+            health[recovering] + np.minimum(
+                p.MOVING_RECOVERY_MAX, moved[recovering] * p.MOVING_RECOVERY_RATE),
+        )
+        # 停滞時間が長すぎる場合はHealthを減少
+        stagnant = stationary > p.MAX_STATIONARY_FRAMES
+        health[stagnant] = np.maximum(health[stagnant] - p.STATIONARY_HEALTH_DECREASE, 0)
+        prev_pos[:] = pos
+
+        # 行番号指定（ファンシーインデックス）の場合はコピーなので書き戻す
+        if rows is not None:
+            self.pos[sel] = pos
+            self.vel[sel] = vel
+            self.health[sel] = health
+            self.age[sel] = age
+            self.stationary[sel] = stationary
+            self.prev_pos[sel] = prev_pos
+
+        self.generation += 1
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import time
+from collections import deque
+from itertools import islice
+
+
+class _NullPhase:
+    """計測無効時に使う何もしないコンテキストマネージャ"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """1つのフェーズの処理時間を計測するコンテキストマネージャ（フェーズごとに使い回す）"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """1フレームの処理時間をフェーズ（アイコン更新・相互作用・描画など）ごとに計測するクラス
+
+    begin_frame() と end_frame() の間で phase(名前) を with 文で使うと、
+    そのフェーズの所要時間が積算され、フレーム終了時に履歴へ追加される。
+    無効（enabled=False）の間は phase() が共有の空のコンテキストを返すだけなので、
+    計測コストはほぼかからない。
+    """
+
+    # フレーム全体の所要時間を記録するキー
+    FRAME = "frame"
+    # サービス種別ごとの動きパターン（_lambda_behaviorなど）の計測に付けるフェーズ名の接頭辞
+    BEHAVIOR_PREFIX = "behavior:"
+
+    def __init__(self, history=600, enabled=False):
+        self.enabled = enabled
+        self.history = history
+        self.samples = {}   # {フェーズ名: deque[秒]}
+        self.current = {}   # 計測中フレームの {フェーズ名: 秒}
+        self.counter_samples = {}  # {カウンタ名: deque[回数]}
+        self.counters = {}  # 計測中フレームの {カウンタ名: 回数}
+        self._phases = {}
+        self._frame_start = None
+
+    def phase(self, name):
+        """フェーズの計測用コンテキストマネージャを返す"""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def behavior(self, service_type):
+        """サービス種別ごとの動きパターンの計測用コンテキストマネージャを返す"""
+        return self.phase(self.BEHAVIOR_PREFIX + service_type)
+
+    def count(self, name, value=1):
+        """フレーム内のカウンタ（ペア判定数・距離計算数など）を加算する"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def begin_frame(self):
+        """フレームの計測を開始する"""
+        if not self.enabled:
+            return
+        self.current = {}
+        self.counters = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """フレームの計測を終了し、各フェーズの時間を履歴に追加する"""
+        if not self.enabled or self._frame_start is None:
+            return
+        self.current[self.FRAME] = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        self._append(self.samples, self.current)
+        self._append(self.counter_samples, self.counters)
+
+    def _append(self, history, values):
+        for name, value in values.items():
+            samples = history.get(name)
+            if samples is None:
+                samples = history[name] = deque(maxlen=self.history)
+            samples.append(value)
+
+    def reset(self):
+        """計測履歴をすべて消去する"""
+        self.samples = {}
+        self.current = {}
+        self.counter_samples = {}
+        self.counters = {}
+        self._frame_start = None
+
+    def phase_names(self):
+        """計測済みのフェーズ名（フレーム全体とサービス種別ごとの計測を除く、初出順）"""
+        return [name for name in self.samples
+                if name != self.FRAME and not name.startswith(self.BEHAVIOR_PREFIX)]
+
+    def behavior_names(self):
+        """計測済みのサービス種別名（初出順）"""
+        prefix = self.BEHAVIOR_PREFIX
+        return [name[len(prefix):] for name in self.samples if name.startswith(prefix)]
+
+    def recent_mean(self, name, frames=60):
+        """直近framesフレームにおけるフェーズの平均時間（ミリ秒）"""
+        return _recent_mean(self.samples.get(name), frames) * 1000
+
+    def recent_count(self, name, frames=60):
+        """直近framesフレームにおけるカウンタの1フレームあたりの平均値"""
+        return _recent_mean(self.counter_samples.get(name), frames)
+
+    def histogram(self, bin_ms, bins, frames=None):
+        """直近のフレーム時間のヒストグラム（bin_msミリ秒刻み、最後のビンはそれ以上）"""
+        counts = [0] * bins
+        samples = self.samples.get(self.FRAME, ())
+        if frames is not None:
+            samples = islice(reversed(samples), frames)
+        for elapsed in samples:
+            index = min(bins - 1, int(elapsed * 1000 / bin_ms))
+            counts[index] += 1
+        return counts
+
+    def summary(self):
+        """フェーズごとの平均・p95・p99（ミリ秒）を返す"""
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+
+def _recent_mean(samples, frames):
+    if not samples:
+        return 0.0
+    recent = list(islice(reversed(samples), frames))
+    return sum(recent) / len(recent)
+
+
+def percentile(sorted_values, fraction):
+    """昇順に並んだ値の百分位点（最近傍順位法）"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def summarize(samples):
+    """秒単位のサンプル列から平均・p95・p99・最大（ミリ秒）を計算する"""
+    values = sorted(samples)
+    if not values:
+        return {"mean_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+
+from text_cache import text_cache
+
+
+class ProfilerOverlay:
+    """FrameProfilerの計測結果を画面左上に半透明で重ねて表示するクラス（F3で切り替え）
+
+    フェーズごとの直近平均時間、フレーム時間のヒストグラム、
+    サービス種別ごとの動きパターンの処理時間、フレームあたりのカウンタ、
+    フレームペーシング（描画間隔のばらつき・飛ばした描画・捨てたティック）を表示する。
+    """
+
+    WIDTH = 330
+    PADDING = 10
+    LINE_HEIGHT = 16
+    ROLLING_FRAMES = 60       # 平均を取る直近フレーム数
+    FRAME_BUDGET_MS = 1000 / 60  # 60FPSを保つための1フレームの予算
+    HISTOGRAM_BIN_MS = 2      # ヒストグラムのビン幅（ミリ秒）
+    HISTOGRAM_BINS = 16
+    HISTOGRAM_HEIGHT = 40
+
+    BACKGROUND = (0, 0, 0, 170)
+    TEXT_COLOR = (240, 240, 240)
+    HEADING_COLOR = (255, 200, 80)
+    BAR_COLOR = (80, 180, 255)
+    OVER_BUDGET_COLOR = (255, 90, 90)
+
+    # 表示するカウンタ: (カウンタ名, 表示ラベル)
+    COUNTERS = (
+        ("icons", "Icons"),
+        ("pair_tests", "Pair tests / frame"),
+        ("distance_checks", "Distance checks / frame"),
+    )
+
+    def __init__(self):
+        self.font = text_cache.font(None, 18)
+        self.heading_font = text_cache.font(None, 20)
+
+    def draw(self, surface, profiler, pacing=None):
+        """計測結果を描画する（pacingはFixedTimestep.stats()のフレームペーシングの統計）"""
+        lines = self._build_lines(profiler, pacing)
+        height = (self.PADDING * 2 + len(lines) * self.LINE_HEIGHT
+                  + self.HISTOGRAM_HEIGHT + self.LINE_HEIGHT)
+        panel = pygame.Surface((self.WIDTH, height), pygame.SRCALPHA)
+        panel.fill(self.BACKGROUND)
+
+        y = self.PADDING
+        for kind, text, value_ms in lines:
+            font = self.heading_font if kind == "heading" else self.font
+            color = self.HEADING_COLOR if kind == "heading" else self.TEXT_COLOR
+            panel.blit(font.render(text, True, color), (self.PADDING, y))
+            if value_ms is not None:
+                self._draw_bar(panel, y, value_ms)
+            y += self.LINE_HEIGHT
+
+        y += self.LINE_HEIGHT // 2
+        self._draw_histogram(panel, y, profiler)
+        surface.blit(panel, (self.PADDING, self.PADDING))
+
+    def _build_lines(self, profiler, pacing=None):
+        """表示行のリスト [(種類, テキスト, バー表示する値(ms)またはNone)] を作る"""
+        frames = self.ROLLING_FRAMES
+        frame_ms = profiler.recent_mean(profiler.FRAME, frames)
+        fps = 1000 / frame_ms if frame_ms > 0 else 0
+        lines = [("heading", f"Profiler (F3)  frame {frame_ms:.2f} ms  {fps:.0f} FPS", None)]
+
+        lines.append(("heading", "Phases", None))
+        for name in profiler.phase_names():
+            ms = profiler.recent_mean(name, frames)
+            lines.append(("item", f"  {name:<14}{ms:7.2f} ms", ms))
+
+        behaviors = profiler.behavior_names()
+        if behaviors:
+            lines.append(("heading", "Behaviours", None))
+            for service_type in behaviors:
+                ms = profiler.recent_mean(profiler.BEHAVIOR_PREFIX + service_type, frames)
+                lines.append(("item", f"  {service_type:<14}{ms:7.2f} ms", ms))
+
+        lines.append(("heading", "Counters", None))
+        for name, label in self.COUNTERS:
+            value = profiler.recent_count(name, frames)
+            lines.append(("item", f"  {label:<24}{value:9.0f}", None))
+
+        if pacing:
+            lines.append(("heading", "Frame pacing", None))
+            lines.append(("item", f"  {'Interval mean / p99':<20}"
+                          f"{pacing['interval_mean_ms']:6.2f} /{pacing['interval_p99_ms']:6.2f} ms", None))
+            lines.append(("item", f"  {'Jitter':<20}{pacing['jitter_ms']:6.2f} ms", None))
+            lines.append(("item", f"  {'Ticks / frame':<20}{pacing['ticks_per_frame']:6.2f}", None))
+            requested = pacing.get("requested_speed", 1)
+            lines.append(("item", f"  {'Speed req / actual':<20}"
+                          f"{'max' if requested is None else requested:>6} /"
+                          f"{pacing.get('achieved_speed', 0.0):6.1f}x", None))
+            lines.append(("item", f"  {'Skipped / dropped':<20}"
+                          f"{pacing['skipped_renders']:6d} /{pacing['dropped_ticks']:6d}", None))
+
+        lines.append(("heading", f"Frame time histogram ({self.HISTOGRAM_BIN_MS} ms bins)", None))
+        return lines
+
+    def _draw_bar(self, panel, y, value_ms):
+        """1フレームの予算に対する割合を横棒で表示する"""
+        x = self.WIDTH - 110
+        max_width = 100
+        ratio = value_ms / self.FRAME_BUDGET_MS
+        width = max(1, int(min(1.0, ratio) * max_width))
+        color = self.OVER_BUDGET_COLOR if ratio > 1 else self.BAR_COLOR
+        pygame.draw.rect(panel, color, (x, y + 3, width, self.LINE_HEIGHT - 6))
+
+    def _draw_histogram(self, panel, y, profiler):
+        """フレーム時間のヒストグラムを棒グラフで表示する（予算超過のビンは赤）"""
+        counts = profiler.histogram(self.HISTOGRAM_BIN_MS, self.HISTOGRAM_BINS,
+                                    profiler.history)
+        peak = max(counts) or 1
+        bar_width = (self.WIDTH - self.PADDING * 2) // self.HISTOGRAM_BINS
+        for index, count in enumerate(counts):
+            height = int(count / peak * self.HISTOGRAM_HEIGHT)
+            if height == 0:
+                continue
+            over_budget = index * self.HISTOGRAM_BIN_MS >= self.FRAME_BUDGET_MS
+            color = self.OVER_BUDGET_COLOR if over_budget else self.BAR_COLOR
+            x = self.PADDING + index * bar_width
+            pygame.draw.rect(panel, color, (x, y + self.HISTOGRAM_HEIGHT - height,
+                                            bar_width - 2, height))
@@ -4,26 +4,62 @@
 import pygame
 
 from evolution_system import EvolutionSystem
+from icon_registry import icons_of_type
+from text_cache import text_cache
 
 class ProgressSystem:
-    """ゲームの進行状況を管理するクラス"""
-    
+    """ゲームの進行状況を管理するクラス
+
+    依存関係・補完関係の実績は宣言的なルール（DEPENDENCY_RULES / COMPLEMENTARY_RULES）で表し、
+    シミュレーションから届く近接イベント（record_dependency）と
+    相互作用イベント（record_interaction）で判定する。達成したルールは
+    判定対象から外すため、すべて達成した後は判定のコストがほぼかからない。
+    """
+
+    # 依存関係の実績: {実績キー: (依存するサービス, 依存先のサービス, 説明)}
+    # 依存するサービスのアイコンが依存先のアイコンから DEPENDENCY_DISTANCE 未満にいれば達成
+    DEPENDENCY_RULES = {
+        "EC2-VPC": ("EC2", "VPC", "EC2 exists in VPC"),
+        "Lambda-IAM": ("Lambda", "IAM", "Lambda has IAM role"),
+        "RDS-VPC": ("RDS", "VPC", "RDS exists in VPC"),
+        "API Gateway-Lambda": ("API Gateway", "Lambda", "API Gateway connected to Lambda"),
+        "CloudFront-S3": ("CloudFront", "S3", "CloudFront connected to S3"),
+        "EBS-EC2": ("EBS", "EC2", "EBS attached to EC2"),
+    }
+    # 補完関係の実績: {実績キー: (サービス1, サービス2, 説明)}
+    # サービス1のアイコンの直近の相互作用相手がサービス2のアイコンなら達成
+    COMPLEMENTARY_RULES = {
+        "EC2-EBS": ("EC2", "EBS", "EC2 and EBS integration"),
+        "Lambda-DynamoDB": ("Lambda", "DynamoDB", "Lambda and DynamoDB integration"),
+        "S3-CloudFront": ("S3", "CloudFront", "S3 and CloudFront integration"),
+    }
+    # 依存関係が満たされているとみなす距離（ピクセル）
+    DEPENDENCY_DISTANCE = 150
+    # 各通知ブロックの上下余白（ピクセル）
+    NOTIFICATION_PADDING = 10
+
     def __init__(self):
         # 依存関係の達成状況
         self.dependency_achievements = {
-            "EC2-VPC": {"achieved": False, "description": "EC2 exists in VPC"},
-            "Lambda-IAM": {"achieved": False, "description": "Lambda has IAM role"},
-            "RDS-VPC": {"achieved": False, "description": "RDS exists in VPC"},
-            "API Gateway-Lambda": {"achieved": False, "description": "API Gateway connected to Lambda"},
-            "CloudFront-S3": {"achieved": False, "description": "CloudFront connected to S3"},
-            "EBS-EC2": {"achieved": False, "description": "EBS attached to EC2"}
+            key: {"achieved": False, "description": description}
+            for key, (_, _, description) in self.DEPENDENCY_RULES.items()
         }
         
         # 補完関係の達成状況
         self.complementary_achievements = {
-            "EC2-EBS": {"achieved": False, "description": "EC2 and EBS integration"},
-            "Lambda-DynamoDB": {"achieved": False, "description": "Lambda and DynamoDB integration"},
-            "S3-CloudFront": {"achieved": False, "description": "S3 and CloudFront integration"}
+            key: {"achieved": False, "description": description}
+            for key, (_, _, description) in self.COMPLEMENTARY_RULES.items()
+        }
+
+        # 未達成のルール: {(サービス1, サービス2): 実績キー}
+        # 達成したルールはここから外し、以降は判定しない
+        self.pending_dependencies = {
+            (service1, service2): key
+            for key, (service1, service2, _) in self.DEPENDENCY_RULES.items()
+        }
+        self.pending_complementary = {
+            (service1, service2): key
+            for key, (service1, service2, _) in self.COMPLEMENTARY_RULES.items()
         }
 
         # 進化の達成状況（同種アイコンの合体による進化発動）
@@ -42,83 +78,61 @@ class ProgressSystem:
         self.notifications = []
         self.notification_duration = 180  # 通知表示フレーム数（約3秒）
         self.notification_timers = {}  # 通知ごとのタイマー
-    
+        # 通知ごとの描画済みブロック {メッセージ: (背景, 文字, 高さ)}（表示中のみ保持）
+        self.notification_blocks = {}
+
+        # 実績オーバーレイの描画済み画像と、その時点の達成状況
+        self._overlay_surface = None
+        self._overlay_key = None
+
+    @property
+    def has_pending_relations(self):
+        """未達成の依存関係・補完関係の実績が残っているか"""
+        return bool(self.pending_dependencies or self.pending_complementary)
+
+    def record_dependency(self, icon, other_icon):
+        """近接イベント: iconが依存先候補other_iconの近く（DEPENDENCY_DISTANCE未満）にいる"""
+        key = self.pending_dependencies.pop(
+            (icon.service_type, other_icon.service_type), None)
+        if key is not None:
+            self._achieve(self.dependency_achievements[key], "Dependency Achieved")
+
+    def record_interaction(self, icon, other_icon):
+        """相互作用イベント: iconの直近の相互作用相手がother_iconである"""
+        key = self.pending_complementary.pop(
+            (icon.service_type, other_icon.service_type), None)
+        if key is not None:
+            self._achieve(self.complementary_achievements[key], "Complementary Relation")
+
+    def _achieve(self, achievement, label):
+        """実績を達成済みにして通知する"""
+        achievement["achieved"] = True
+        self.add_notification(f"{label}: {achievement['description']}")
+
     def check_achievements(self, all_icons):
-        """アイコン間の関係を確認し、達成状況を更新"""
-        # 依存関係の確認
-        self._check_dependencies(all_icons)
-        
-        # 補完関係の確認
-        self._check_complementary_relations(all_icons)
-    
-    def _check_dependencies(self, all_icons):
-        """依存関係の達成状況を確認"""
-        # EC2-VPC
-        self._check_dependency_pair(all_icons, "EC2", "VPC", "EC2-VPC")
-        
-        # Lambda-IAM
-        self._check_dependency_pair(all_icons, "Lambda", "IAM", "Lambda-IAM")
-        
-        # RDS-VPC
-        self._check_dependency_pair(all_icons, "RDS", "VPC", "RDS-VPC")
-        
-        # API Gateway-Lambda
-        self._check_dependency_pair(all_icons, "API Gateway", "Lambda", "API Gateway-Lambda")
-        
-        # CloudFront-S3
-        self._check_dependency_pair(all_icons, "CloudFront", "S3", "CloudFront-S3")
-        
-        # EBS-EC2
-        self._check_dependency_pair(all_icons, "EBS", "EC2", "EBS-EC2")
-    
-    def _check_complementary_relations(self, all_icons):
-        """補完関係の達成状況を確認"""
-        # EC2-EBS
-        self._check_complementary_pair(all_icons, "EC2", "EBS", "EC2-EBS")
-        
-        # Lambda-DynamoDB
-        self._check_complementary_pair(all_icons, "Lambda", "DynamoDB", "Lambda-DynamoDB")
-        
-        # S3-CloudFront
-        self._check_complementary_pair(all_icons, "S3", "CloudFront", "S3-CloudFront")
-    def _check_dependency_pair(self, all_icons, service1, service2, achievement_key):
-        """特定の依存関係が満たされているかを確認"""
-        service1_icons = [icon for icon in all_icons if icon.service_type == service1]
-        service2_icons = [icon for icon in all_icons if icon.service_type == service2]
-        
-        # 両方のサービスが存在する場合のみチェック
-        if service1_icons and service2_icons:
-            # 依存関係が満たされているかを確認（近接しているか）
-            for icon1 in service1_icons:
-                for icon2 in service2_icons:
-                    if icon1._is_near(icon2, 150):  # 150pxの距離内にあるか
-                        # まだ達成されていない場合、通知を追加
-                        if not self.dependency_achievements[achievement_key]["achieved"]:
-                            self.dependency_achievements[achievement_key]["achieved"] = True
-                            description = self.dependency_achievements[achievement_key]["description"]
-                            self.add_notification(f"Dependency Achieved: {description}")
-                        return
-            
-            # 近接していない場合でも、達成状態はリセットしない
-            # 一度達成したものは永続的に達成状態を維持
-    
-    def _check_complementary_pair(self, all_icons, service1, service2, achievement_key):
-        """特定の補完関係が満たされているかを確認"""
-        service1_icons = [icon for icon in all_icons if icon.service_type == service1]
-        service2_icons = [icon for icon in all_icons if icon.service_type == service2]
-        
-        # 両方のサービスが存在する場合のみチェック
-        if service1_icons and service2_icons:
-            # 補完関係が満たされているかを確認（相互作用しているか）
-            for icon1 in service1_icons:
-                for icon2 in service2_icons:
-                    if hasattr(icon1, 'last_interaction') and icon1.last_interaction == icon2:
-                        # まだ達成されていない場合、通知を追加
-                        if not self.complementary_achievements[achievement_key]["achieved"]:
-                            self.complementary_achievements[achievement_key]["achieved"] = True
-                            description = self.complementary_achievements[achievement_key]["description"]
-                            self.add_notification(f"Complementary Relation: {description}")
-                        return
+        """アイコン間の関係を全件確認し、未達成の実績を更新する
+
+        ゲーム本体は record_dependency() / record_interaction() のイベントで判定するため、
+        これは単体での確認やイベントを発生させない呼び出し元向けの手段。
+        """
+        # 依存関係の確認（未達成のルールのみ）
+        for service1, service2 in list(self.pending_dependencies):
+            targets = icons_of_type(all_icons, service2)
+            for icon1 in icons_of_type(all_icons, service1):
+                partner = next((icon2 for icon2 in targets
+                                if icon1._is_near(icon2, self.DEPENDENCY_DISTANCE)), None)
+                if partner is not None:
+                    self.record_dependency(icon1, partner)
+                    break
+
+        # 補完関係の確認（未達成のルールのみ）
+        for service1, service2 in list(self.pending_complementary):
+            for icon1 in icons_of_type(all_icons, service1):
+                partner = getattr(icon1, 'last_interaction', None)
+                if (partner is not None and partner.service_type == service2
+                        and partner in all_icons):
+                    self.record_interaction(icon1, partner)
+                    break
     
     def record_evolution(self, source_type, target_type):
         """進化の発動を実績として記録し、未達成なら通知する"""
@@ -157,6 +171,7 @@ class ProgressSystem:
                 self.notifications.remove(message)
             if message in self.notification_timers:
                 del self.notification_timers[message]
+            self.notification_blocks.pop(message, None)
     def get_dependency_achievement_rate(self):
         """依存関係の達成率を計算"""
         achieved = sum(1 for item in self.dependency_achievements.values() if item["achieved"])
@@ -194,16 +209,35 @@ class ProgressSystem:
 
         下でアイコンたちが活動している様子が透けて見えるように、
         半透明の暗幕の上に各実績の達成/未達成を一覧表示する。
+        オーバーレイの画像は達成状況が変わったときだけ作り直す。
         """
+        key = self._achievement_state()
+        if key != self._overlay_key:
+            self._overlay_surface = self._render_overlay()
+            self._overlay_key = key
+        surface.blit(self._overlay_surface, (0, 0))
+
+    def _achievement_state(self):
+        """全実績の達成状況のタプル（オーバーレイを作り直すかの判定に使う）"""
+        return tuple(
+            (key, item["achieved"])
+            for achievements in (self.dependency_achievements,
+                                 self.complementary_achievements,
+                                 self.evolution_achievements)
+            for key, item in achievements.items()
+        )
+
+    def _render_overlay(self):
+        """実績オーバーレイの画像を作る"""
         from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 
         # 半透明の暗幕（アルファ付きSurfaceで下のアイコンを透過させる）
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
 
-        title_font = pygame.font.SysFont(None, 48)
-        heading_font = pygame.font.SysFont(None, 32)
-        item_font = pygame.font.SysFont(None, 28)
+        title_font = text_cache.font(None, 48)
+        heading_font = text_cache.font(None, 32)
+        item_font = text_cache.font(None, 28)
 
         achieved_color = (80, 220, 120)   # 達成: 緑
         pending_color = (160, 160, 160)   # 未達成: グレー
@@ -214,8 +248,8 @@ class ProgressSystem:
 
         # タイトル（全体の達成率）
         total_achieved, total_total = self.get_total_achievement_rate()
-        title_surface = title_font.render(
-            f"Achievements  {total_achieved} / {total_total}", True, white)
+        title_surface = text_cache.render(
+            f"Achievements  {total_achieved} / {total_total}", title_font, white)
         overlay.blit(title_surface, (margin_x, y))
         y += 70
 
@@ -229,8 +263,8 @@ class ProgressSystem:
              self.get_evolution_achievement_rate()),
         ]
         for heading, achievements, (sec_achieved, sec_total) in sections:
-            heading_surface = heading_font.render(
-                f"{heading}  {sec_achieved} / {sec_total}", True, white)
+            heading_surface = text_cache.render(
+                f"{heading}  {sec_achieved} / {sec_total}", heading_font, white)
             overlay.blit(heading_surface, (margin_x, y))
             y += 42
 
@@ -238,79 +272,89 @@ class ProgressSystem:
                 achieved = item["achieved"]
                 marker = "[x]" if achieved else "[ ]"
                 color = achieved_color if achieved else pending_color
-                line_surface = item_font.render(
-                    f"{marker}  {item['description']}", True, color)
+                line_surface = text_cache.render(
+                    f"{marker}  {item['description']}", item_font, color)
                 overlay.blit(line_surface, (margin_x + 24, y))
                 y += 32
             y += 24
 
-        surface.blit(overlay, (0, 0))
+        return overlay
 
     def _wrap_text(self, text, font, max_width):
-        """テキストをmax_width以内に収まるよう単語単位で折り返して行のリストを返す"""
-        words = text.split(" ")
-        lines = []
-        current = ""
-        for word in words:
-            candidate = word if not current else f"{current} {word}"
-            if font.size(candidate)[0] <= max_width:
-                current = candidate
-            else:
-                if current:
-                    lines.append(current)
-                # 単語単体がmax_widthを超える場合もそのまま1行として扱う
-                current = word
-        if current:
-            lines.append(current)
-        return lines or [""]
+        """テキストをmax_width以内に収まるよう単語単位で折り返して行のリストを返す（結果はキャッシュされる）"""
+        return text_cache.wrap_words(text, font, max_width)
 
-    def _draw_notifications(self, surface, font):
-        """通知メッセージを描画（横幅を超える場合は縮小せず折り返す）"""
-        if not self.notifications:
-            return
+    def _notification_block(self, message):
+        """通知1件分の (背景, 文字, 高さ) を返す（初めて表示するときに1回だけ作る）
+
+        背景と文字は別のSurfaceにしておき、フェードは描画時に
+        それぞれのset_alpha()を変えるだけで表現する。
+        """
+        block = self.notification_blocks.get(message)
+        if block is not None:
+            return block
 
-        # 定数をインポート
         from constants import GAME_AREA_WIDTH
 
         # 文字が小さくなりすぎないよう、フォントサイズは固定して折り返す
-        notification_font = pygame.font.SysFont(None, 26)
+        notification_font = text_cache.font(None, 26)
         line_height = notification_font.get_linesize()
         max_text_width = GAME_AREA_WIDTH - 40  # 左右に20pxずつ余白
-        v_padding = 10  # 各通知ブロックの上下余白
+        v_padding = self.NOTIFICATION_PADDING
+        lines = self._wrap_text(message, notification_font, max_text_width)
+        block_height = len(lines) * line_height + v_padding * 2
 
-        # 各通知を折り返し、ブロックの高さを算出
-        blocks = []
-        for message in self.notifications:
-            lines = self._wrap_text(message, notification_font, max_text_width)
-            block_height = len(lines) * line_height + v_padding * 2
-            blocks.append((message, lines, block_height))
+        # 通知背景（ゲームエリア幅いっぱい、行数に応じた高さ）
+        background = pygame.Surface((GAME_AREA_WIDTH, block_height))
+        background.fill((0, 0, 100))  # 濃い青色
 
-        # 通知全体をゲームエリア下部に積み上げる
-        total_height = sum(block_height for _, _, block_height in blocks)
-        y = surface.get_height() - total_height - 20
+        # 各行を中央揃えで描画（縮小はしない）。行は重ならないため、
+        # BLEND_RGBA_MAXで透明なSurfaceに文字のアルファごと写す
+        text = pygame.Surface((GAME_AREA_WIDTH, block_height), pygame.SRCALPHA)
+        for j, line in enumerate(lines):
+            line_surface = notification_font.render(line, True, (255, 255, 255))
+            text_x = (GAME_AREA_WIDTH - line_surface.get_width()) // 2
+            text_y = v_padding + j * line_height
+            text.blit(line_surface, (text_x, text_y), special_flags=pygame.BLEND_RGBA_MAX)
 
-        for message, lines, block_height in blocks:
-            # 通知の透明度（表示時間に応じて変化）
-            alpha = 255
-            if message in self.notification_timers:
-                timer = self.notification_timers[message]
-                if timer < 30:  # フェードイン
-                    alpha = int(255 * timer / 30)
-                elif timer > self.notification_duration - 30:  # フェードアウト
-                    alpha = int(255 * (self.notification_duration - timer) / 30)
-
-            # 通知背景（ゲームエリア幅いっぱい、行数に応じた高さ）
-            bg_surface = pygame.Surface((GAME_AREA_WIDTH, block_height))
-            bg_surface.fill((0, 0, 100))  # 濃い青色
-            bg_surface.set_alpha(int(alpha * 0.8))
-            surface.blit(bg_surface, (0, y))
-
-            # 各行を中央揃えで描画（縮小はしない）
-            for j, line in enumerate(lines):
-                line_surface = notification_font.render(line, True, (255, 255, 255))
-                line_surface.set_alpha(alpha)
-                text_x = (GAME_AREA_WIDTH - line_surface.get_width()) / 2
-                text_y = y + v_padding + j * line_height
-                surface.blit(line_surface, (text_x, text_y))
+        block = self.notification_blocks[message] = (background, text, block_height)
+        return block
+
+    def notification_area(self, surface):
+        """通知が描画される範囲の矩形を返す（通知がなければNone）"""
+        if not self.notifications:
+            return None
+        from constants import GAME_AREA_WIDTH
+
+        total_height = sum(self._notification_block(message)[2]
+                           for message in self.notifications)
+        return pygame.Rect(0, surface.get_height() - total_height - 20,
+                           GAME_AREA_WIDTH, total_height)
+
+    def _notification_alpha(self, message):
+        """通知の透明度（表示時間に応じてフェードイン・フェードアウトする）"""
+        alpha = 255
+        if message in self.notification_timers:
+            timer = self.notification_timers[message]
+            if timer < 30:  # フェードイン
+                alpha = int(255 * timer / 30)
+            elif timer > self.notification_duration - 30:  # フェードアウト
+                alpha = int(255 * (self.notification_duration - timer) / 30)
+        return alpha
 
+    def _draw_notifications(self, surface, font):
+        """通知メッセージを描画（横幅を超える場合は縮小せず折り返す）"""
+        area = self.notification_area(surface)
+        if area is None:
+            return
+
+        # 通知全体をゲームエリア下部に積み上げる
+        y = area.y
+        for message in self.notifications:
+            background, text, block_height = self._notification_block(message)
+            alpha = self._notification_alpha(message)
+            background.set_alpha(int(alpha * 0.8))
+            surface.blit(background, (0, y))
+            text.set_alpha(alpha)
+            surface.blit(text, (0, y))
             y += block_height
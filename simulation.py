@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pygame
+
+from constants import (
+    AWS_ICONS, AWS_REGION, AWS_ACCOUNT_ID, GAME_AREA_WIDTH, SCREEN_HEIGHT,
+)
+from aws_icon import AWSIcon
+from evolution_system import EvolutionSystem
+from icon_registry import IconRegistry
+from progress_system import ProgressSystem
+from spatial_hash import SpatialHashGrid
+from physics_world import PhysicsWorld
+from profiler import FrameProfiler
+
+
+class Simulation:
+    """画面表示に依存しないシミュレーション本体（ワールドの状態と更新処理）
+
+    pygame.displayを一切使わないため、ヘッドレス環境でも実時間より速く
+    update()を回せる。画面描画や入力処理はこのクラスを継承したGameが担う。
+    """
+
+    # VPCのデフォルトクォータ（AWSアカウントのリージョンあたり5個）
+    # これを超えて6個目を作ろうとすると即座に失敗することを表現する
+    VPC_DEFAULT_QUOTA = 5
+    # デフォルトクォータ超過時のAWS CreateVpcエラーメッセージを忠実に再現
+    # （errorCode: VpcLimitExceeded）
+    VPC_QUOTA_ERROR_MESSAGE = (
+        "An error occurred (VpcLimitExceeded) when calling the CreateVpc "
+        "operation: The maximum number of VPCs has been reached."
+    )
+
+    # EC2インスタンスのリタイア通知に使うリージョン（ARNの採番と同じ値を使う）
+    EC2_RETIREMENT_REGION = AWS_REGION
+
+    # 相互作用に関する定数
+    VELOCITY_SLOWDOWN_FACTOR = 0.9
+    VELOCITY_INCREASE_FACTOR = 1.1
+    VELOCITY_MAX_MULTIPLIER = 2
+    HEALTH_RECOVERY_AMOUNT = 0.1
+    VELOCITY_FOLLOW_FACTOR = 0.3
+    INTERACTION_DISTANCE = 70  # 相互作用が発生するアイコン中心間の距離（ピクセル）
+    
+    def __init__(self, seed=None):
+        """初期化（seedを指定すると乱数を初期化して再現可能にする）"""
+        # アイコン画像の代替表示（サービス名）にフォントを使うため、フォントのみ初期化する
+        pygame.font.init()
+        if seed is not None:
+            random.seed(seed)
+
+        # アイコングループ
+        self.all_icons = IconRegistry()
+
+        # 全アイコンの位置・速度・体力を配列でまとめて保持・更新する物理ワールド
+        self.world = PhysicsWorld(AWSIcon, seed=seed)
+
+        # 相互作用判定用の空間ハッシュ（セルサイズ＝相互作用距離）
+        self.interaction_grid = SpatialHashGrid(self.INTERACTION_DISTANCE)
+
+        # 選択中のアイコン
+        self.selected_icon = None
+        
+        # 直接操作中のアイコン
+        self.direct_control_icon = None
+        
+        # 進行システム
+        self.progress_system = ProgressSystem()
+
+        # 進化システム
+        self.evolution_system = EvolutionSystem()
+
+        # EC2リタイア通知に使うAWSアカウントID（ARNの採番と同じ値を使う）
+        self.aws_account_id = AWS_ACCOUNT_ID
+
+        # これまでに進めたフレーム数
+        self.frame = 0
+
+        # フェーズごとの処理時間の計測（ベンチマークやオーバーレイ表示で有効にする）
+        self.profiler = FrameProfiler()
+
+    def populate(self, count):
+        """ランダムなサービスのアイコンをランダムな位置にcount個配置する"""
+        for _ in range(count):
+            self._spawn_icon(random.choice(AWS_ICONS))
+
+    def _spawn_icon(self, service, position=None):
+        """指定サービスのアイコンを生成して追加する（位置未指定ならランダム配置）"""
+        if position is None:
+            position = (random.randint(50, GAME_AREA_WIDTH - 50),
+                        random.randint(50, SCREEN_HEIGHT - 50))
+        icon = AWSIcon(service, position, world=self.world)
+
+        # VPCはデフォルトクォータ（5個）を超えると6個目以降は即死する。
+        # AWSアカウントでデフォルトでは5個までしかVPCを作れないことの表現。
+        if service == "VPC":
+            existing_vpcs = sum(
+                1 for i in self.all_icons.of_type("VPC") if i.health > 0
+            )
+            if existing_vpcs >= self.VPC_DEFAULT_QUOTA:
+                icon.health = 0  # 即死（次の更新で除去される）
+                self.progress_system.add_notification(self.VPC_QUOTA_ERROR_MESSAGE)
+
+        self.all_icons.add(icon)
+        return icon
+
+    def _ec2_retirement_message(self, icon):
+        """AWSのEC2インスタンスリタイア通知メール本文を忠実に再現する
+
+        公式メッセージ:
+        "EC2 has detected degradation of the underlying hardware hosting your
+        Amazon EC2 instance (instance-ID: ...) associated with your AWS account
+        (AWS Account ID: ...) in the ... region. Due to this degradation your
+        instance could already be unreachable. We will stop your instance
+        after ... UTC."
+        """
+        stop_time = (datetime.now(timezone.utc) + timedelta(days=14)).strftime(
+            "%Y-%m-%d %H:%M:%S")
+        return (
+            f"EC2 has detected degradation of the underlying hardware hosting "
+            f"your Amazon EC2 instance (instance-ID: {icon.instance_id}) "
+            f"associated with your AWS account (AWS Account ID: "
+            f"{self.aws_account_id}) in the {self.EC2_RETIREMENT_REGION} region. "
+            f"Due to this degradation your instance could already be "
+            f"unreachable. We will stop your instance after {stop_time} UTC."
+        )
+
+    def update(self):
+        """ゲームの状態を更新"""
+        profiler = self.profiler
+        # 計測が無効な間はサービス種別ごとの計測も行わない
+        behavior_profiler = profiler if profiler.enabled else None
+
+        # 描画時の補間の始点として、このティック開始時の位置を記録する
+        self.world.begin_tick()
+
+        # アイコン個別の状態（動きのパターン・依存関係など）を更新
+        progress = self.progress_system
+        with profiler.phase("icons"):
+            # 前フレームの移動を反映させるため、近傍検索のグリッドを作り直させる
+            self.all_icons.neighbors.invalidate()
+            for icon in self.all_icons:
+                # ワールド外で生成されたアイコンが追加された場合はワールドに取り込む
+                if icon.world is not self.world:
+                    self.world.attach(icon)
+                icon.update_behavior(self.all_icons, behavior_profiler)
+                # 依存関係・補完関係の実績は近接・相互作用のイベントで判定する
+                # （すべて達成した後は何もしない）
+                if progress.has_pending_relations:
+                    self._record_relation_events(icon)
+                # EC2リタイア発動時に通知を出す（発動した瞬間のみ）
+                # retiring/retirement_announcedは全アイコンで__init__済み。
+                # instance_idはEC2のみが持つため、service_typeでガードする
+                if (icon.service_type == "EC2"
+                        and icon.retiring
+                        and not icon.retirement_announced):
+                    icon.retirement_announced = True
+                    self.progress_system.add_notification(
+                        self._ec2_retirement_message(icon)
+                    )
+
+        with profiler.phase("physics"):
+            # 移動・生存コスト・停滞判定などを全アイコン分まとめて更新
+            self.world.step()
+            
+            # Healthが0になったアイコンを削除
+            dead_icons = set(self.world.dead_icons())
+            if dead_icons:
+                # 選択中のアイコンが削除される場合は選択を解除
+                if self.selected_icon in dead_icons:
+                    self.selected_icon = None
+                # 直接操作中のアイコンが削除される場合は操作を解除
+                if self.direct_control_icon in dead_icons:
+                    self.direct_control_icon = None
+                # アイコンをグループから効率的に削除
+                for icon in dead_icons:
+                    self._remove_icon(icon)
+
+            # AutoScalingのスケールアウトによるアイコン起動リクエストを処理
+            for icon in list(self.all_icons):
+                requests = getattr(icon, 'spawn_requests', None)
+                if requests:
+                    for service_type, position in requests:
+                        self.all_icons.add(
+                            AWSIcon(service_type, position, world=self.world))
+                    icon.spawn_requests = []
+
+        # 進行状況の更新
+        with profiler.phase("achievements"):
+            self.progress_system.update_notifications()
+        
+        # アイコン間の相互作用を処理
+        with profiler.phase("interactions"):
+            self._handle_interactions()
+
+        # アイコンの進化を処理
+        with profiler.phase("evolutions"):
+            self._handle_evolutions()
+        profiler.count("distance_checks", self.evolution_system.distance_checks)
+        profiler.count("icons", len(self.all_icons))
+
+        self.frame += 1
+
+    def _record_relation_events(self, icon):
+        """アイコンの依存先・直近の相互作用相手を実績判定のイベントとして通知する"""
+        if icon.dependency_partner is not None:
+            self.progress_system.record_dependency(icon, icon.dependency_partner)
+        partner = icon.last_interaction
+        if partner is not None and partner in self.all_icons:
+            self.progress_system.record_interaction(icon, partner)
+
+    def run_headless(self, frames):
+        """描画せずにframesフレーム分を可能な限り速く進め、経過時間（秒）を返す"""
+        profiler = self.profiler
+        start = time.perf_counter()
+        for _ in range(frames):
+            profiler.begin_frame()
+            self.update()
+            profiler.end_frame()
+        return time.perf_counter() - start
+
+    def _handle_evolutions(self):
+        """アイコンの進化を処理"""
+        for evolution in self.evolution_system.update(self.all_icons):
+            # 進化元のアイコンを削除（選択中・操作中の場合は参照も解除）
+            for icon in evolution.icons:
+                if self.selected_icon is icon:
+                    self.selected_icon = None
+                if self.direct_control_icon is icon:
+                    self.direct_control_icon = None
+                self._remove_icon(icon)
+
+            # 進化後のアイコンを重心位置に生成
+            self.all_icons.add(
+                AWSIcon(evolution.target_type, evolution.position,
+                        evolution.velocity, world=self.world)
+            )
+            # 進化発動を実績として記録（通知＋Shift+Aオーバーレイに反映）
+            self.progress_system.record_evolution(
+                evolution.source_type, evolution.target_type
+            )
+
+    def _remove_icon(self, icon):
+        """アイコンをグループと物理ワールドから除去する"""
+        self.all_icons.remove(icon)
+        self.world.release(icon)
+
+    def _handle_interactions(self):
+        """アイコン間の相互作用を処理"""
+        # 空間ハッシュで近傍候補のみを絞り込み、相互作用距離内のペアだけを処理する。
+        # ペアの向き（icon1/icon2）と処理順は全ペア走査時と同じくグループ内の順序に従う
+        icons = list(self.all_icons)
+        order = {icon: index for index, icon in enumerate(icons)}
+        grid = self.interaction_grid
+        grid.sync(icons, self._icon_center)
+        pair_tests = 0
+
+        for index, icon1 in enumerate(icons):
+            x, y = icon1.rect.center
+            candidates = [
+                icon2 for icon2 in grid.query(x, y, self.INTERACTION_DISTANCE)
+                if order[icon2] > index
+            ]
+            candidates.sort(key=order.__getitem__)
+            pair_tests += len(candidates)
+            for icon2 in candidates:
+                # 近接しているかチェック
+                if icon1._is_near(icon2, self.INTERACTION_DISTANCE):  # 70pxの距離内にある場合
+                    # 相互作用を記録
+                    icon1.last_interaction = icon2
+                    icon2.last_interaction = icon1
+                    icon1.interaction_timer = 30  # 30フレーム（約0.5秒）
+                    icon2.interaction_timer = 30
+                    
+                    # 依存関係の処理
+                    if icon2.service_type in icon1.dependencies:
+                        # 依存関係が満たされた場合、体力回復を加速
+                        icon1.recover(5)
+                    
+                    # 補完関係の処理
+                    self._handle_complementary_relations(icon1, icon2)
+                    
+                    # 重なり防止のための位置調整（移動したアイコンはセルを付け替える）
+                    self._adjust_overlapping_positions(icon1, icon2)
+                    grid.update(icon1, *icon1.rect.center)
+                    grid.update(icon2, *icon2.rect.center)
+
+        # 候補ペアごとに1回ずつ距離を計算している
+        self.profiler.count("pair_tests", pair_tests)
+        self.profiler.count("distance_checks", pair_tests)
+
+    @staticmethod
+    def _icon_center(icon):
+        """空間ハッシュに登録する位置（アイコンの中心）"""
+        return icon.rect.center
+    
+    def _adjust_overlapping_positions(self, icon1, icon2):
+        """重なっているアイコンの位置を調整"""
+        # アイコン間のベクトルを計算
+        dx = icon2.rect.centerx - icon1.rect.centerx
+        dy = icon2.rect.centery - icon1.rect.centery
+        
+        # ベクトルの長さ（距離）を計算
+        distance = math.sqrt(dx*dx + dy*dy)
+        
+        # 最小距離は両方のアイコンの半径の合計（サイズが異なるアイコンにも対応）
+        min_distance = icon1.rect.width / 2 + icon2.rect.width / 2
+        
+        # 重なっている場合のみ調整
+        if distance < min_distance and distance > 0:  # 0除算を防ぐ
+            # 重なりの度合いを計算
+            overlap = min_distance - distance
+            
+            # 正規化したベクトル
+            if distance > 0:
+                dx /= distance
+                dy /= distance
+            
+            # 重なりを解消するための移動量
+            move_x = dx * overlap / 2
+            move_y = dy * overlap / 2
+            
+            # 両方のアイコンを反対方向に移動
+            x1, y1 = icon1.center
+            x2, y2 = icon2.center
+            icon1.center = (x1 - move_x, y1 - move_y)
+            icon2.center = (x2 + move_x, y2 + move_y)
+            
+            # ゲームエリア内に収める
+            icon1.clamp_to_game_area()
+            icon2.clamp_to_game_area()
+    
+    def _cap_velocity(self, velocity, increase_factor, max_multiplier):
+        """速度成分を増加させつつ、元の速度の max_multiplier 倍を超えないようキャップする"""
+        capped = []
+        for v in velocity:
+            candidate = v * increase_factor
+            limit = v * max_multiplier
+            if v > 0:
+                capped.append(min(candidate, limit))
+            elif v < 0:
+                capped.append(max(candidate, limit))
+            else:
+                capped.append(candidate)
+        return capped
+
+    def _handle_complementary_relations(self, icon1, icon2):
+        """補完関係の処理"""
+        # EC2とEBSの補完関係
+        if (icon1.service_type == "EC2" and icon2.service_type == "EBS") or \
+           (icon1.service_type == "EBS" and icon2.service_type == "EC2"):
+            # 両方のアイコンの速度を少し遅くする（安定性を表現）
+            icon1.velocity = [v * self.VELOCITY_SLOWDOWN_FACTOR for v in icon1.velocity]
+            icon2.velocity = [v * self.VELOCITY_SLOWDOWN_FACTOR for v in icon2.velocity]
+            # 体力を少し回復（過度な回復を防ぐ）
+            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
+            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
+            
+            # EC2とEBSが近くにいる場合、EBSはEC2に追従する傾向を強める
+            if icon1.service_type == "EC2" and icon2.service_type == "EBS":
+                # EC2の動きにEBSを追従させる
+                icon2.velocity = [
+                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon2.velocity[0] + self.VELOCITY_FOLLOW_FACTOR * icon1.velocity[0],
+                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon2.velocity[1] + self.VELOCITY_FOLLOW_FACTOR * icon1.velocity[1]
+                ]
+            elif icon1.service_type == "EBS" and icon2.service_type == "EC2":
+                # EC2の動きにEBSを追従させる
+                icon1.velocity = [
+                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon1.velocity[0] + self.VELOCITY_FOLLOW_FACTOR * icon2.velocity[0],
+                    (1 - self.VELOCITY_FOLLOW_FACTOR) * icon1.velocity[1] + self.VELOCITY_FOLLOW_FACTOR * icon2.velocity[1]
+                ]
+        
+        # LambdaとDynamoDBの補完関係
+        if (icon1.service_type == "Lambda" and icon2.service_type == "DynamoDB") or \
+           (icon1.service_type == "DynamoDB" and icon2.service_type == "Lambda"):
+            # 両方のアイコンの速度を少し速くする（効率性を表現）- 上限あり
+            icon1.velocity = self._cap_velocity(icon1.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
+            icon2.velocity = self._cap_velocity(icon2.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
+            # 体力を少し回復（過度な回復を防ぐ）
+            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
+            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
+
+        # S3とCloudFrontの補完関係
+        if (icon1.service_type == "S3" and icon2.service_type == "CloudFront") or \
+           (icon1.service_type == "CloudFront" and icon2.service_type == "S3"):
+            # 速度を少し速くする（効率性を表現）- 上限あり
+            icon1.velocity = self._cap_velocity(icon1.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
+            icon2.velocity = self._cap_velocity(icon2.velocity, self.VELOCITY_INCREASE_FACTOR, self.VELOCITY_MAX_MULTIPLIER)
+            # 体力を少し回復（過度な回復を防ぐ）
+            icon1.recover(self.HEALTH_RECOVERY_AMOUNT)
+            icon2.recover(self.HEALTH_RECOVERY_AMOUNT)
+
+            # CloudFrontの場合は追加で速度を上げる（配信の高速化を表現）
+            cloudfront_boost_factor = 1.2
+            if icon1.service_type == "CloudFront":
+                icon1.velocity = self._cap_velocity(icon1.velocity, cloudfront_boost_factor, self.VELOCITY_MAX_MULTIPLIER)
+            elif icon2.service_type == "CloudFront":
+                icon2.velocity = self._cap_velocity(icon2.velocity, cloudfront_boost_factor, self.VELOCITY_MAX_MULTIPLIER)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+
+
+class SpatialHashGrid:
+    """一様なセルで空間を分割し、近傍候補を高速に絞り込むための空間ハッシュ
+
+    各要素は中心座標が属するセルに登録される。セルサイズを判定距離と同じにすると、
+    距離判定の候補は周囲3x3セルの要素だけになり、全ペア比較（O(n²)）を避けられる。
+    要素が移動した場合は update() でセルを付け替える（セルが変わらなければ何もしない）。
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}       # {(セルx, セルy): {要素: None}}（挿入順を保つためdictを使う）
+        self.item_cells = {}  # {要素: (セルx, セルy)}
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def cell_of(self, x, y):
+        """座標が属するセルのキーを返す"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def update(self, item, x, y):
+        """要素を登録する。登録済みならセルが変わった場合のみ付け替える"""
+        cell = self.cell_of(x, y)
+        old_cell = self.item_cells.get(item)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self._discard(item, old_cell)
+        self.cells.setdefault(cell, {})[item] = None
+        self.item_cells[item] = cell
+
+    def remove(self, item):
+        """要素を登録から外す（未登録なら何もしない）"""
+        cell = self.item_cells.pop(item, None)
+        if cell is not None:
+            self._discard(item, cell)
+
+    def _discard(self, item, cell):
+        bucket = self.cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        """すべての登録を削除する"""
+        self.cells.clear()
+        self.item_cells.clear()
+
+    def sync(self, items, position_of):
+        """要素の集合と位置をグリッドに反映する
+
+        items に含まれる要素は position_of(要素) の位置に合わせてセルを更新し、
+        items に含まれなくなった要素は登録から外す。
+        """
+        seen = set()
+        for item in items:
+            x, y = position_of(item)
+            self.update(item, x, y)
+            seen.add(item)
+        if len(seen) != len(self.item_cells):
+            for item in [i for i in self.item_cells if i not in seen]:
+                self.remove(item)
+
+    def query(self, x, y, radius):
+        """(x, y)から半径radiusの範囲と重なるセルに登録された要素（近傍候補）を返す
+
+        候補にはradiusより遠い要素も含まれるため、正確な距離判定は呼び出し側で行う。
+        """
+        min_cx, min_cy = self.cell_of(x - radius, y - radius)
+        max_cx, max_cy = self.cell_of(x + radius, y + radius)
+        cells = self.cells
+        candidates = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""パラメータスイープ（モンテカルロ一括実行）
+
+AWSIcon.SURVIVAL_COST や EvolutionSystem.REQUIRED_FRAMES などの定数を上書きした
+ヘッドレスのシミュレーションを、パラメータの組み合わせ（グリッドまたはランダムサンプル）
+×シードの数だけプロセスプールで並列に実行し、個体数の推移と実績の達成フレームを
+パラメータの組ごとに集計した表（CSV）にまとめる。
+
+    python sweep.py --param AWSIcon.SURVIVAL_COST=0.005,0.01,0.02 \\
+        --param EvolutionSystem.REQUIRED_FRAMES=120,180 --seeds 8 --output sweep.csv
+    python sweep.py --range AWSIcon.DEPENDENCY_HEALTH_DECREASE=0.01:0.1 --samples 20
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+from aws_icon import AWSIcon
+from evolution_system import EvolutionSystem
+from simulation import Simulation
+
+# 上書きできる定数を持つクラス（パラメータ名は "クラス名.定数名"。定数名だけでも可）
+TARGETS = {
+    "AWSIcon": AWSIcon,
+    "EvolutionSystem": EvolutionSystem,
+    "Simulation": Simulation,
+}
+
+# 1ワーカーに渡すチャンク数の目安（ワーカー数×この数のチャンクに分ける）
+CHUNKS_PER_WORKER = 4
+
+
+def resolve_param(name):
+    """パラメータ名を (クラス, 定数名) に解決する（存在しない場合はValueError）"""
+    if "." in name:
+        class_name, attr = name.split(".", 1)
+        target = TARGETS.get(class_name)
+        if target is None or not hasattr(target, attr):
+            raise ValueError(f"unknown parameter: {name}")
+        return target, attr
+    for target in TARGETS.values():
+        if hasattr(target, name):
+            return target, name
+    raise ValueError(f"unknown parameter: {name}")
+
+
+def qualified_name(name):
+    """パラメータ名を "クラス名.定数名" の形にそろえる"""
+    target, attr = resolve_param(name)
+    return f"{target.__name__}.{attr}"
+
+
+@contextmanager
+def overridden(params):
+    """with文の間だけクラスの定数をparams（{パラメータ名: 値}）で上書きする"""
+    saved = []
+    try:
+        for name, value in params.items():
+            target, attr = resolve_param(name)
+            saved.append((target, attr, getattr(target, attr)))
+            setattr(target, attr, value)
+        yield
+    finally:
+        for target, attr, value in reversed(saved):
+            setattr(target, attr, value)
+
+
+def grid(values):
+    """{パラメータ名: [値, ...]} のすべての組み合わせを辞書のリストで返す"""
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*(values[name] for name in names))]
+
+
+def sample(ranges, count, seed=None):
+    """{パラメータ名: (下限, 上限)} から一様にcount組を選ぶ（整数の範囲なら整数で選ぶ）"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        params = {}
+        for name, (low, high) in ranges.items():
+            if isinstance(low, int) and isinstance(high, int):
+                params[name] = rng.randint(low, high)
+            else:
+                params[name] = rng.uniform(low, high)
+        samples.append(params)
+    return samples
+
+
+def _achievement_flags(progress):
+    """全実績の {キー: 達成済みか} を返す"""
+    flags = {}
+    for achievements in (progress.dependency_achievements,
+                         progress.complementary_achievements,
+                         progress.evolution_achievements):
+        for key, item in achievements.items():
+            flags[key] = item["achieved"]
+    return flags
+
+
+def run_trial(task):
+    """1回分のシミュレーションを実行して結果を返す（プロセスプールのワーカーで呼ばれる）
+
+    task は (params, seed, frames, icons, sample_every)。結果の population は
+    sample_every フレームごとの個体数、achievements は各実績を達成したフレーム
+    （未達成ならNone）。
+    """
+    params, seed, frames, icons, sample_every = task
+    with overridden(params):
+        simulation = Simulation(seed)
+        simulation.populate(icons)
+        progress = simulation.progress_system
+        achieved_at = {key: None for key in _achievement_flags(progress)}
+        pending = set(achieved_at)
+        population = [len(simulation.all_icons)]
+        for frame in range(1, frames + 1):
+            simulation.update()
+            if pending:
+                for key, achieved in _achievement_flags(progress).items():
+                    if achieved and key in pending:
+                        achieved_at[key] = frame
+                        pending.discard(key)
+            if frame % sample_every == 0:
+                population.append(len(simulation.all_icons))
+        return {
+            "params": params,
+            "seed": seed,
+            "population": population,
+            "final_counts": dict(simulation.all_icons.type_counts()),
+            "achievements": achieved_at,
+        }
+
+
+def run_sweep(param_sets, seeds, frames, icons, sample_every=60, workers=None,
+              chunksize=None):
+    """パラメータの組×シードの全試行をプロセスプールで実行し、結果のリストを返す
+
+    試行はチャンク単位でワーカーに渡す（1試行ごとのプロセス間通信のコストを抑える）。
+    workers=1 ならプロセスを作らずにこのプロセスで順に実行する。
+    """
+    tasks = [(params, seed, frames, icons, sample_every)
+             for params in param_sets for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [run_trial(task) for task in tasks]
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(tasks) / (workers * CHUNKS_PER_WORKER)))
+    with Pool(min(workers, len(tasks))) as pool:
+        return list(pool.imap_unordered(run_trial, tasks, chunksize))
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def _stdev(values):
+    if len(values) < 2:
+        return 0.0 if values else None
+    mean = _mean(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def aggregate(results, sample_every=60):
+    """試行の結果をパラメータの組ごとにまとめ、表の行（辞書）のリストを返す
+
+    各行はパラメータの値、試行数、最終個体数の平均・標準偏差、
+    sample_everyフレームごとの平均個体数（pop@<フレーム>）、
+    実績ごとの達成率（<キー>:rate）と達成までの平均フレーム（<キー>:frames）を持つ。
+    """
+    groups = {}
+    for result in results:
+        key = tuple(sorted(result["params"].items()))
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, trials in sorted(groups.items()):
+        row = dict(key)
+        row["runs"] = len(trials)
+        finals = [trial["population"][-1] for trial in trials]
+        row["final_population_mean"] = _mean(finals)
+        row["final_population_stdev"] = _stdev(finals)
+        samples = min(len(trial["population"]) for trial in trials)
+        for index in range(samples):
+            row[f"pop@{index * sample_every}"] = _mean(
+                [trial["population"][index] for trial in trials])
+        for name in trials[0]["achievements"]:
+            frames = [trial["achievements"][name] for trial in trials
+                      if trial["achievements"].get(name) is not None]
+            row[f"{name}:rate"] = len(frames) / len(trials)
+            row[f"{name}:frames"] = _mean(frames)
+        rows.append(row)
+    return rows
+
+
+def write_table(rows, output):
+    """集計表をCSVで書き出す（列は全行の列をまとめたもの）"""
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    writer = csv.DictWriter(output, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def _parse_value(text):
+    """数値の文字列を整数または小数に変換する"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_assignment(text):
+    """"名前=値" を (正規化したパラメータ名, 値の文字列) に分ける"""
+    name, sep, value = text.partition("=")
+    if not sep or not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        return qualified_name(name.strip()), value
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def _param_values(text):
+    name, values = _parse_assignment(text)
+    return name, [_parse_value(value) for value in values.split(",")]
+
+
+def _param_range(text):
+    name, bounds = _parse_assignment(text)
+    low, sep, high = bounds.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=LOW:HIGH, got {text!r}")
+    return name, (_parse_value(low), _parse_value(high))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AWS Icon Life parameter sweep")
+    parser.add_argument("--param", action="append", type=_param_values, default=[],
+                        metavar="NAME=V1,V2,...",
+                        help="グリッドで試す定数の値（例: AWSIcon.SURVIVAL_COST=0.005,0.01）")
+    parser.add_argument("--range", action="append", type=_param_range, default=[],
+                        metavar="NAME=LOW:HIGH",
+                        help="ランダムサンプルする定数の範囲（--samplesと併用）")
+    parser.add_argument("--samples", type=int, default=10,
+                        help="--rangeからサンプルするパラメータの組の数（デフォルト: 10）")
+    parser.add_argument("--seeds", type=int, default=4,
+                        help="パラメータの組ごとに試すシードの数（デフォルト: 4）")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="最初のシード（seed, seed+1, ... を使う。サンプリングにも使う）")
+    parser.add_argument("--frames", type=int, default=1800,
+                        help="1試行で進めるフレーム数（デフォルト: 1800）")
+    parser.add_argument("--icons", type=int, default=100,
+                        help="開始時にランダム配置するアイコン数（デフォルト: 100）")
+    parser.add_argument("--sample-every", type=int, default=60,
+                        help="個体数を記録する間隔（フレーム、デフォルト: 60）")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="ワーカープロセス数（デフォルト: CPUコア数）")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="1回にワーカーへ渡す試行数（デフォルト: 自動）")
+    parser.add_argument("--output", help="集計表を書き出すCSVファイル（省略時は標準出力）")
+    parser.add_argument("--raw", help="試行ごとの結果を書き出すJSONファイル")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    param_sets = grid(dict(args.param)) if args.param else [{}]
+    if args.range:
+        sampled = sample(dict(args.range), args.samples, args.seed)
+        param_sets = [{**fixed, **params} for fixed in param_sets for params in sampled]
+    seeds = list(range(args.seed, args.seed + args.seeds))
+
+    results = run_sweep(param_sets, seeds, args.frames, args.icons,
+                        args.sample_every, args.workers, args.chunksize)
+    rows = aggregate(results, args.sample_every)
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_table(rows, f)
+        print(f"Wrote {len(rows)} parameter sets ({len(results)} runs) to {args.output}")
+    else:
+        write_table(rows, sys.stdout)
+    if args.raw:
+        with open(args.raw, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
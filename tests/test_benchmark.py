@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import benchmark
+from main import Game
+from profiler import FrameProfiler, percentile, summarize
+
+
+class TestFrameProfiler:
+    def test_disabled_profiler_records_nothing(self):
+        profiler = FrameProfiler()
+
+        profiler.begin_frame()
+        with profiler.phase("icons"):
+            pass
+        profiler.end_frame()
+
+        assert profiler.samples == {}
+
+    def test_enabled_profiler_records_phases_and_frame(self):
+        profiler = FrameProfiler(enabled=True)
+
+        for _ in range(3):
+            profiler.begin_frame()
+            with profiler.phase("icons"):
+                pass
+            with profiler.phase("render"):
+                pass
+            profiler.end_frame()
+
+        assert profiler.phase_names() == ["icons", "render"]
+        assert len(profiler.samples["frame"]) == 3
+
+    def test_history_is_bounded(self):
+        profiler = FrameProfiler(history=5, enabled=True)
+
+        for _ in range(10):
+            profiler.begin_frame()
+            profiler.end_frame()
+
+        assert len(profiler.samples["frame"]) == 5
+
+
+class TestStatistics:
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+
+    def test_summarize_converts_to_milliseconds(self):
+        stats = summarize([0.001, 0.002, 0.003])
+
+        assert stats["mean_ms"] == pytest.approx(2.0)
+        assert stats["max_ms"] == pytest.approx(3.0)
+
+
+def make_results(mean_ms, p95_ms):
+    return {"scenarios": {"mixed_100": {"phases": {
+        "frame": {"mean_ms": mean_ms, "p95_ms": p95_ms}}}}}
+
+
+class TestBaselineComparison:
+    def test_slower_run_is_a_regression(self):
+        regressions = benchmark.compare(make_results(12.0, 15.0), make_results(10.0, 15.0))
+
+        assert regressions == [("mixed_100", "frame", "mean_ms", 10.0, 12.0)]
+
+    def test_change_within_tolerance_is_not_a_regression(self):
+        regressions = benchmark.compare(make_results(10.5, 15.0), make_results(10.0, 15.0))
+
+        assert regressions == []
+
+    def test_tiny_absolute_change_is_ignored(self):
+        regressions = benchmark.compare(make_results(0.02, 0.02), make_results(0.01, 0.01))
+
+        assert regressions == []
+
+
+class TestScenarios:
+    def test_expected_scenarios_exist(self):
+        assert {"mixed_100", "mixed_1000", "mixed_5000", "ec2_swarm",
+                "autoscaling_churn", "vpc_quota_spam",
+                "retirement_storm"} <= set(benchmark.SCENARIOS)
+
+    def test_run_scenario_reports_phase_statistics(self):
+        result = benchmark.run_scenario(benchmark.SCENARIOS["vpc_quota_spam"], frames=3)
+
+        assert result["frames"] == 3
+        for phase in ("frame", "icons", "interactions", "render"):
+            assert set(result["phases"][phase]) >= {"mean_ms", "p95_ms", "p99_ms"}
+
+
+class TestProfilerOverlay:
+    def test_toggle_enables_profiling_and_draws(self):
+        game = Game(seed=0)
+        game.populate(20)
+
+        game.toggle_profiler()
+        for _ in range(3):
+            game.profiler.begin_frame()
+            game.update()
+            game.render()
+            game.profiler.end_frame()
+
+        assert game.profiler.enabled is True
+        assert game.profiler.behavior_names()
+        assert game.profiler.recent_count("icons") == 20
+        assert sum(game.profiler.histogram(2, 16)) == 3
+
+    def test_hiding_overlay_stops_and_clears_profiling(self):
+        game = Game(seed=0)
+        game.toggle_profiler()
+        game.profiler.begin_frame()
+        game.update()
+        game.profiler.end_frame()
+
+        game.toggle_profiler()
+
+        assert game.profiler.enabled is False
+        assert game.profiler.samples == {}
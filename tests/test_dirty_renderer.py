@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+import pytest
+
+from aws_icon import AWSIcon
+from dirty_renderer import DirtyRectRenderer
+from main import Game
+
+BACKGROUND = (240, 240, 240)
+
+
+@pytest.fixture
+def surface():
+    return pygame.Surface((400, 300))
+
+
+def make_icon(service_type, position):
+    return AWSIcon(service_type, position, velocity=[0, 0])
+
+
+def full_redraw(icons, size):
+    """比較用に毎回全体を描き直した画面"""
+    expected = pygame.Surface(size)
+    DirtyRectRenderer(expected, BACKGROUND).render(icons)
+    return expected
+
+
+def same_pixels(first, second):
+    return pygame.image.tobytes(first, "RGB") == pygame.image.tobytes(second, "RGB")
+
+
+class TestDirtyRectRenderer:
+    def test_first_frame_is_full_redraw(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND)
+
+        assert renderer.render([make_icon("S3", (100, 100))]) is None
+
+    def test_unchanged_icons_produce_no_dirty_rects(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND)
+        icons = [make_icon("S3", (100, 100)), make_icon("IAM", (250, 200))]
+        renderer.render(icons)
+
+        assert renderer.render(icons) == []
+
+    def test_moved_icon_dirties_old_and_new_bounds(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND)
+        icon = make_icon("S3", (100, 100))
+        other = make_icon("IAM", (300, 200))
+        renderer.render([icon, other])
+        old_bounds = icon.draw_bounds()
+
+        icon.center = (104, 102)
+        rects = renderer.render([icon, other])
+
+        assert len(rects) == 1
+        assert rects[0].contains(old_bounds)
+        assert rects[0].contains(icon.draw_bounds())
+        assert not rects[0].colliderect(other.draw_bounds())
+
+    def test_removed_icon_is_erased(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND)
+        icon = make_icon("S3", (100, 100))
+        renderer.render([icon])
+
+        rects = renderer.render([])
+
+        assert rects == [icon.draw_bounds()]
+        assert surface.get_at(icon.rect.center)[:3] == BACKGROUND
+
+    def test_partial_redraw_matches_full_redraw(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND)
+        icons = [make_icon("EC2", (100, 100)), make_icon("S3", (130, 110)),
+                 make_icon("IAM", (300, 200))]
+        renderer.render(icons)
+
+        icons[0].center = (110, 104)  # 重なっているS3の下を通る
+        icons[2].health = 40          # 体力バーが現れる
+        icons[1].last_interaction = icons[2]
+        icons[1].interaction_timer = 30
+        assert renderer.render(icons) != []
+
+        assert same_pixels(surface, full_redraw(icons, surface.get_size()))
+
+    def test_large_change_falls_back_to_full_redraw(self, surface):
+        renderer = DirtyRectRenderer(surface, BACKGROUND, threshold=0.01)
+        icons = [make_icon("S3", (100, 100))]
+        renderer.render(icons)
+
+        icons[0].center = (200, 150)
+
+        assert renderer.render(icons) is None
+        assert renderer.full_redraws == 2
+
+
+class TestGameRendering:
+    def test_game_frames_match_full_redraw(self):
+        game = Game(seed=3)
+        game.populate(25)
+        game.ui_panel.update(game.all_icons, None)
+        game.render()
+
+        for _ in range(20):
+            game.update()
+            game.render()
+
+        # パネルと区切り線を含めて、全体を描き直した結果と一致する
+        expected = pygame.Surface(game.screen.get_size())
+        renderer = DirtyRectRenderer(expected, BACKGROUND, game._draw_separator)
+        font = pygame.font.SysFont(None, 24)
+        renderer.render(game.all_icons, [
+            (game.progress_system.notification_area(expected),
+             lambda surface: game.progress_system.draw(surface, font)),
+            (game.ui_panel.rect, game.ui_panel.draw),
+        ])
+        assert game.renderer.partial_redraws > 0
+        assert same_pixels(game.screen, expected)
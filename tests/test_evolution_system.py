@@ -171,3 +171,30 @@ class TestAutoScalingSpawnCost:
 
         assert low.health == pytest.approx(9)
         assert low.health >= 0
+
+
+class TestClustering:
+    def test_clusters_are_connected_components(self, system):
+        chain = [make_icon("EC2", (100 + i * 60, 100)) for i in range(4)]
+        lone = make_icon("EC2", (600, 500))
+
+        clusters = system._find_clusters(chain + [lone], "EC2")
+
+        assert clusters == [chain, [lone]]
+
+    def test_distance_checks_stay_local(self, system):
+        # 隣接しない位置に散らばったアイコンは周囲のセルの候補とだけ判定する
+        icons = [make_icon("EC2", (40 + (i % 10) * 80, 40 + (i // 10) * 120))
+                 for i in range(50)]
+
+        system.update(icons)
+
+        assert system.distance_checks < len(icons) * 4
+
+    def test_removed_icons_leave_the_grid(self, system):
+        icons = make_adjacent_ec2s(3)
+        system.update(icons)
+
+        system.update(icons[:2])
+
+        assert len(system.grids["EC2"]) == 2
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from frame_pacing import FixedTimestep
+from main import Game
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestFixedTimestep:
+    def test_first_frame_runs_one_tick(self, clock):
+        timestep = FixedTimestep(60, clock=clock)
+
+        assert timestep.advance() == 1
+        assert timestep.alpha == 0.0
+
+    def test_ticks_follow_elapsed_time_not_frame_count(self, clock):
+        timestep = FixedTimestep(60, clock=clock)
+        timestep.advance()
+
+        steps = []
+        for _ in range(10):
+            clock.now += 1 / 30  # 描画は30FPSしか出ない
+            steps.append(timestep.advance())
+
+        assert sum(steps) == 20
+        assert timestep.skipped_renders == 10
+
+    def test_remainder_becomes_interpolation_alpha(self, clock):
+        timestep = FixedTimestep(60, clock=clock)
+        timestep.advance()
+
+        clock.now += 1.5 / 60
+
+        assert timestep.advance() == 1
+        assert timestep.alpha == pytest.approx(0.5)
+
+    def test_catch_up_is_capped_and_backlog_dropped(self, clock):
+        timestep = FixedTimestep(60, max_steps=5, clock=clock)
+        timestep.advance()
+
+        clock.now += 1.0  # 1秒止まっていた
+
+        assert timestep.advance() == 5
+        assert timestep.dropped_ticks == 55
+        assert 0.0 <= timestep.alpha < 1.0
+
+    def test_stats_report_jitter(self, clock):
+        timestep = FixedTimestep(60, clock=clock)
+        timestep.advance()
+        for interval in (1 / 60, 1 / 60, 3 / 60):
+            clock.now += interval
+            timestep.advance()
+
+        stats = timestep.stats()
+
+        assert stats["target_ms"] == pytest.approx(1000 / 60)
+        assert stats["interval_p99_ms"] == pytest.approx(50.0)
+        assert stats["jitter_ms"] == pytest.approx(1000 / 60 * 2 / 3)
+
+
+class TestInterpolatedRender:
+    def test_icons_are_drawn_between_ticks_and_restored(self):
+        game = Game(seed=1)
+        icon = game._spawn_icon("S3", (100, 100))
+        icon.velocity = [2, 0]
+        game.update()
+        start_x = game.world.tick_pos[icon._row][0]
+        end_x = icon.center[0]
+        drawn = []
+        draw = icon.draw
+        icon.draw = lambda surface: drawn.append(icon.rect.centerx) or draw(surface)
+
+        game.render(0.5)
+
+        assert drawn == [round((start_x + end_x) / 2)]
+        assert icon.rect.centerx == round(end_x)
+
+
+class TestFastForward:
+    def test_speed_multiplies_ticks_per_frame(self, clock):
+        timestep = FixedTimestep(60, clock=clock, speed=4)
+        timestep.advance()
+
+        clock.now += 1 / 60
+
+        assert timestep.advance() == 4
+        assert timestep.skipped_renders == 0
+
+    def test_catch_up_cap_scales_with_speed(self, clock):
+        timestep = FixedTimestep(60, max_steps=5, clock=clock, speed=8)
+        timestep.advance()
+
+        clock.now += 1.0
+
+        assert timestep.advance() == 40
+
+    def test_max_speed_runs_ticks_until_frame_budget_is_spent(self, clock):
+        timestep = FixedTimestep(60, clock=clock, speed=None)
+        timestep.advance()
+
+        steps = 0
+        for _ in timestep.frame_ticks():
+            steps += 1
+            clock.now += 1 / 600  # 1ティックに実時間の1/10ティック分かかる
+
+        assert steps == 10
+        assert timestep.alpha == 1.0
+
+    def test_achieved_speed_is_measured_against_wall_time(self, clock):
+        timestep = FixedTimestep(60, clock=clock, speed=4)
+        for _ in range(120):
+            for _ in timestep.frame_ticks():
+                pass
+            clock.now += 1 / 60
+
+        assert timestep.achieved_speed() == pytest.approx(4.0, rel=0.05)
+        assert timestep.stats()["requested_speed"] == 4
+
+
+class TestSpeedControl:
+    def test_set_speed_clamps_to_available_speeds(self):
+        game = Game(seed=1)
+
+        game.set_speed(3)
+        assert game.timestep.speed == 8
+
+        game.set_speed(100)
+        assert game.timestep.speed is None
+
+        game.set_speed(-1)
+        assert game.timestep.speed == 1
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+
+from aws_icon import AWSIcon
+from icon_assets import IconAssetCache
+
+
+def make_cache(tmp_path):
+    icon_dir = tmp_path / "icons"
+    icon_dir.mkdir()
+    return IconAssetCache(str(icon_dir), str(tmp_path / "atlas.png"))
+
+
+class TestIconAssetCache:
+    def test_icons_of_same_type_share_one_surface(self):
+        first = AWSIcon("EC2", (100, 100))
+        second = AWSIcon("EC2", (200, 200))
+
+        assert first.image is second.image
+        assert first.image.get_size() == (50, 50)
+
+    def test_placeholder_is_built_once(self, tmp_path):
+        cache = make_cache(tmp_path)
+
+        surface = cache.get("S3")
+
+        assert cache.get("S3") is surface
+        assert surface.get_at((0, 0))[:3] == (227, 86, 0)
+
+    def test_png_is_loaded_and_scaled(self, tmp_path):
+        cache = make_cache(tmp_path)
+        image = pygame.Surface((100, 80))
+        image.fill((1, 2, 3))
+        pygame.image.save(image, str(tmp_path / "icons" / "vpc.png"))
+
+        surface = cache.get("VPC")
+
+        assert surface.get_size() == (50, 50)
+        assert surface.get_at((25, 25))[:3] == (1, 2, 3)
+
+    def test_atlas_is_preferred_over_files(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.build_atlas()
+        # アトラス作成後に個別の画像を置いても、アトラスの画像が使われる
+        image = pygame.Surface((50, 50))
+        image.fill((1, 2, 3))
+        pygame.image.save(image, str(tmp_path / "icons" / "iam.png"))
+
+        surface = cache.get("IAM")
+
+        assert surface.get_size() == (50, 50)
+        assert surface.get_at((0, 0))[:3] == (255, 215, 0)
+
+    def test_unknown_service_falls_back_when_atlas_exists(self, tmp_path):
+        cache = make_cache(tmp_path)
+        cache.build_atlas()
+
+        surface = cache.get("Kinesis")
+
+        assert surface.get_size() == (50, 50)
+        assert surface.get_at((0, 0))[:3] == (200, 200, 200)
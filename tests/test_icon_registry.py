@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from aws_icon import AWSIcon
+from icon_registry import IconRegistry, icons_of_type
+
+
+def make_icon(service_type, position=(100, 100)):
+    return AWSIcon(service_type, position, velocity=[0, 0])
+
+
+class TestIconRegistry:
+    def test_buckets_follow_add_and_remove(self):
+        ec2 = make_icon("EC2")
+        vpc = make_icon("VPC")
+        registry = IconRegistry(ec2, vpc)
+
+        assert list(registry.of_type("EC2")) == [ec2]
+        assert registry.count_of("VPC") == 1
+
+        registry.remove(ec2)
+
+        assert list(registry.of_type("EC2")) == []
+        assert len(registry) == 1
+
+    def test_kill_and_empty_update_buckets(self):
+        first = make_icon("Lambda")
+        second = make_icon("Lambda")
+        registry = IconRegistry(first, second)
+
+        first.kill()
+        assert list(registry.of_type("Lambda")) == [second]
+
+        registry.empty()
+        assert registry.count_of("Lambda") == 0
+
+    def test_bucket_keeps_group_order(self):
+        icons = [make_icon("EC2", (50 + i * 10, 100)) for i in range(5)]
+        registry = IconRegistry()
+        for icon in icons:
+            registry.add(make_icon("S3"))
+            registry.add(icon)
+
+        assert list(registry.of_type("EC2")) == icons
+        assert [i for i in registry if i.service_type == "EC2"] == icons
+
+    def test_type_counts_skips_empty_buckets(self):
+        ec2 = make_icon("EC2")
+        registry = IconRegistry(ec2, make_icon("S3"), make_icon("S3"))
+        registry.remove(ec2)
+
+        assert registry.type_counts() == {"S3": 2}
+
+    def test_icons_of_type_filters_plain_lists(self):
+        ec2 = make_icon("EC2")
+        icons = [make_icon("VPC"), ec2]
+
+        assert icons_of_type(icons, "EC2") == [ec2]
+        assert list(icons_of_type(IconRegistry(*icons), "EC2")) == [ec2]
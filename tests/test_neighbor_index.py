@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+from aws_icon import AWSIcon
+from icon_registry import IconRegistry, icons_near, nearest_of_type
+
+
+def make_icon(service_type, position):
+    return AWSIcon(service_type, position, velocity=[0, 0])
+
+
+class TestNearestOfType:
+    def test_finds_closest_icon_of_type(self):
+        ebs = make_icon("EBS", (100, 100))
+        near = make_icon("EC2", (160, 100))
+        far = make_icon("EC2", (400, 100))
+        registry = IconRegistry(ebs, far, near, make_icon("S3", (110, 100)))
+
+        assert nearest_of_type(registry, "EC2", ebs) is near
+        assert nearest_of_type(registry, "EC2", ebs, radius=50) is None
+
+    def test_unbounded_search_reaches_distant_icons(self):
+        lam = make_icon("Lambda", (50, 50))
+        iam = make_icon("IAM", (750, 550))
+        registry = IconRegistry(lam, iam)
+
+        assert nearest_of_type(registry, "IAM", lam) is iam
+
+    def test_equal_distances_prefer_group_order(self):
+        ebs = make_icon("EBS", (300, 300))
+        first = make_icon("EC2", (400, 300))
+        second = make_icon("EC2", (200, 300))
+        registry = IconRegistry(ebs, first, second)
+
+        assert nearest_of_type(registry, "EC2", ebs) is first
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(1)
+        icons = [make_icon(rng.choice(["EC2", "AutoScaling", "EBS"]),
+                           (rng.randint(50, 750), rng.randint(50, 550)))
+                 for _ in range(80)]
+        registry = IconRegistry(*icons)
+
+        for icon in icons:
+            for radius in (None, 150, 250):
+                assert (nearest_of_type(registry, "AutoScaling", icon, radius)
+                        is nearest_of_type(icons, "AutoScaling", icon, radius))
+            assert (icons_near(registry, "EC2", icon, 150)
+                    == icons_near(icons, "EC2", icon, 150))
+
+    def test_invalidate_picks_up_moved_icons(self):
+        ebs = make_icon("EBS", (100, 100))
+        ec2 = make_icon("EC2", (600, 500))
+        registry = IconRegistry(ebs, ec2)
+        assert nearest_of_type(registry, "EC2", ebs, radius=200) is None
+
+        ec2.center = (150, 100)
+        registry.neighbors.invalidate()
+
+        assert nearest_of_type(registry, "EC2", ebs, radius=200) is ec2
+
+    def test_removed_icons_are_not_returned(self):
+        ebs = make_icon("EBS", (100, 100))
+        ec2 = make_icon("EC2", (150, 100))
+        registry = IconRegistry(ebs, ec2)
+        assert nearest_of_type(registry, "EC2", ebs) is ec2
+
+        registry.remove(ec2)
+
+        assert nearest_of_type(registry, "EC2", ebs) is None
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from aws_icon import AWSIcon
+from constants import GAME_AREA_WIDTH
+from physics_world import PhysicsWorld
+
+
+@pytest.fixture
+def world():
+    return PhysicsWorld(AWSIcon, capacity=2)
+
+
+def make_icon(world, service_type, position, velocity=(0, 0)):
+    return AWSIcon(service_type, position, velocity=list(velocity), world=world)
+
+
+class TestPhysicsStep:
+    def test_icons_move_by_velocity(self, world):
+        icon = make_icon(world, "S3", (100, 100), (2, -1))
+
+        world.step()
+
+        assert icon.center == (102, 99)
+        assert icon.rect.center == (102, 99)
+
+    def test_velocity_is_clamped(self, world):
+        icon = make_icon(world, "S3", (300, 300), (10, -10))
+
+        world.step()
+
+        assert list(icon.velocity) == [AWSIcon.MAX_VELOCITY, -AWSIcon.MAX_VELOCITY]
+
+    def test_wall_reflects_velocity_and_clamps_position(self, world):
+        icon = make_icon(world, "S3", (GAME_AREA_WIDTH - 26, 300), (3, 0))
+
+        world.step()
+
+        assert icon.velocity[0] == -3
+        assert icon.rect.right == GAME_AREA_WIDTH
+
+    def test_survival_cost_and_age_apply_to_all_rows(self, world):
+        icons = [make_icon(world, "EC2", (100 + i * 100, 100)) for i in range(3)]
+
+        world.step()
+
+        for icon in icons:
+            assert icon.health == pytest.approx(100 - AWSIcon.SURVIVAL_COST)
+            assert icon.age_frames == 1
+
+    def test_stationary_icon_counts_frames(self, world):
+        icon = make_icon(world, "EC2", (100, 100))
+
+        for _ in range(5):
+            world.step()
+
+        assert icon.stationary_frames == 5
+
+    def test_moving_icon_without_dependencies_recovers(self, world):
+        icon = make_icon(world, "S3", (100, 100), (3, 0))
+        icon.health = 50
+
+        world.step()
+
+        # 3px移動したので移動距離に応じた回復が加わる
+        expected = 50 - AWSIcon.SURVIVAL_COST + 3 * AWSIcon.MOVING_RECOVERY_RATE
+        assert icon.health == pytest.approx(expected)
+
+
+class TestRowManagement:
+    def test_world_grows_beyond_initial_capacity(self, world):
+        icons = [make_icon(world, "S3", (10 * i + 30, 50)) for i in range(10)]
+
+        assert len(world) == 10
+        assert [icon.center[0] for icon in icons] == [10 * i + 30 for i in range(10)]
+
+    def test_release_keeps_values_and_rebinds_moved_row(self, world):
+        first = make_icon(world, "S3", (100, 100), (1, 0))
+        last = make_icon(world, "EC2", (200, 200), (0, 1))
+        first.health = 0
+
+        world.release(first)
+
+        assert len(world) == 1
+        assert first.world is not world
+        assert first.health == 0
+        assert last.center == (200, 200)
+        assert list(last.velocity) == [0, 1]
+
+    def test_attach_moves_standalone_icon_into_world(self, world):
+        icon = AWSIcon("S3", (100, 100), velocity=[3, 0])
+        icon.health = 70
+
+        world.attach(icon)
+        world.step()
+
+        assert icon.world is world
+        assert icon.center == (103, 100)
+        assert icon.health == pytest.approx(
+            70 - AWSIcon.SURVIVAL_COST + 3 * AWSIcon.MOVING_RECOVERY_RATE)
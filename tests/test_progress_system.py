@@ -70,6 +70,49 @@ class TestComplementaryAchievements:
         assert progress.complementary_achievements["Lambda-DynamoDB"]["achieved"] is False
 
 
+class TestRelationEvents:
+    def test_dependency_event_achieves_and_retires_rule(self, progress):
+        ec2 = make_icon("EC2", (100, 100))
+        vpc = make_icon("VPC", (150, 100))
+
+        progress.record_dependency(ec2, vpc)
+
+        assert progress.dependency_achievements["EC2-VPC"]["achieved"] is True
+        assert ("EC2", "VPC") not in progress.pending_dependencies
+
+    def test_repeated_event_notifies_only_once(self, progress):
+        ec2 = make_icon("EC2", (100, 100))
+        vpc = make_icon("VPC", (150, 100))
+
+        progress.record_dependency(ec2, vpc)
+        progress.record_dependency(ec2, vpc)
+
+        assert progress.notifications == ["Dependency Achieved: EC2 exists in VPC"]
+
+    def test_unrelated_pair_is_ignored(self, progress):
+        s3 = make_icon("S3", (100, 100))
+        iam = make_icon("IAM", (150, 100))
+
+        progress.record_interaction(s3, iam)
+
+        assert progress.notifications == []
+        assert progress.get_complementary_achievement_rate() == (0, 3)
+
+    def test_no_pending_relations_after_all_achieved(self, progress):
+        for service1, service2, _ in progress.DEPENDENCY_RULES.values():
+            progress.record_dependency(make_icon(service1, (0, 0)),
+                                       make_icon(service2, (0, 0)))
+        assert progress.has_pending_relations is True
+
+        for service1, service2, _ in progress.COMPLEMENTARY_RULES.values():
+            progress.record_interaction(make_icon(service1, (0, 0)),
+                                        make_icon(service2, (0, 0)))
+
+        assert progress.has_pending_relations is False
+        assert progress.get_dependency_achievement_rate() == (6, 6)
+        assert progress.get_complementary_achievement_rate() == (3, 3)
+
+
 class TestNotifications:
     def test_achievement_adds_notification(self, progress):
         ec2 = make_icon("EC2", (100, 100))
@@ -170,3 +213,36 @@ class TestNotificationWrapping:
         lines = progress._wrap_text("Short one", font, 400)
 
         assert lines == ["Short one"]
+
+
+class TestCachedSurfaces:
+    def test_overlay_is_rebuilt_only_when_achievements_change(self, progress, monkeypatch):
+        import pygame
+        builds = []
+        render_overlay = progress._render_overlay
+        monkeypatch.setattr(progress, "_render_overlay",
+                            lambda: builds.append(1) or render_overlay())
+        screen = pygame.Surface((850, 650))
+
+        progress.draw_overlay(screen)
+        progress.draw_overlay(screen)
+        assert len(builds) == 1
+
+        progress.record_evolution("EC2", "AutoScaling")
+        progress.draw_overlay(screen)
+        assert len(builds) == 2
+
+    def test_notification_block_is_built_once_and_dropped_on_expiry(self, progress):
+        import pygame
+        screen = pygame.Surface((850, 650))
+        progress.add_notification("cached message")
+
+        progress.draw(screen, None)
+        block = progress.notification_blocks["cached message"]
+        progress.update_notifications()
+        progress.draw(screen, None)
+        assert progress.notification_blocks["cached message"] is block
+
+        for _ in range(progress.notification_duration + 1):
+            progress.update_notifications()
+        assert "cached message" not in progress.notification_blocks
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from main import parse_args
+from simulation import Simulation
+
+
+def snapshot(simulation):
+    return [(icon.service_type, icon.center, icon.health)
+            for icon in simulation.all_icons]
+
+
+class TestHeadlessSimulation:
+    def test_run_headless_advances_frames(self):
+        simulation = Simulation(seed=1)
+        simulation.populate(20)
+
+        elapsed = simulation.run_headless(10)
+
+        assert simulation.frame == 10
+        assert elapsed >= 0
+
+    def test_populate_spawns_icons(self):
+        simulation = Simulation(seed=1)
+
+        simulation.populate(15)
+
+        assert len(simulation.all_icons) == 15
+
+    def test_same_seed_gives_same_world(self):
+        first = Simulation(seed=42)
+        first.populate(30)
+        first.run_headless(60)
+        second = Simulation(seed=42)
+        second.populate(30)
+        second.run_headless(60)
+
+        assert snapshot(first) == snapshot(second)
+
+
+class TestRelationAchievements:
+    def test_nearby_dependency_is_achieved_during_update(self):
+        simulation = Simulation(seed=1)
+        simulation._spawn_icon("EC2", (200, 200))
+        simulation._spawn_icon("VPC", (260, 200))
+
+        simulation.update()
+
+        achievements = simulation.progress_system.dependency_achievements
+        assert achievements["EC2-VPC"]["achieved"] is True
+
+
+class TestCommandLine:
+    def test_headless_options(self):
+        args = parse_args(["--headless", "--frames", "120", "--seed", "7"])
+
+        assert args.headless is True
+        assert args.frames == 120
+        assert args.seed == 7
+
+    def test_defaults_open_the_window(self):
+        args = parse_args([])
+
+        assert args.headless is False
+        assert args.seed is None
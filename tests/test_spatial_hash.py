@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from aws_icon import AWSIcon
+from main import Game
+from spatial_hash import SpatialHashGrid
+
+
+@pytest.fixture
+def grid():
+    return SpatialHashGrid(70)
+
+
+@pytest.fixture
+def game():
+    return Game()
+
+
+class TestSpatialHashGrid:
+    def test_query_returns_items_in_neighbouring_cells(self, grid):
+        grid.update("a", 100, 100)
+        grid.update("b", 160, 100)  # 隣のセル
+        grid.update("c", 400, 400)  # 遠いセル
+
+        candidates = grid.query(100, 100, 70)
+
+        assert set(candidates) == {"a", "b"}
+
+    def test_update_moves_item_between_cells(self, grid):
+        grid.update("a", 10, 10)
+        grid.update("a", 500, 500)
+
+        assert grid.query(10, 10, 70) == []
+        assert grid.query(500, 500, 70) == ["a"]
+        assert len(grid) == 1
+
+    def test_remove_drops_item_and_empty_cell(self, grid):
+        grid.update("a", 10, 10)
+        grid.remove("a")
+
+        assert "a" not in grid
+        assert grid.cells == {}
+
+    def test_sync_removes_stale_items(self, grid):
+        positions = {"a": (10, 10), "b": (20, 20)}
+        grid.sync(positions, positions.__getitem__)
+        del positions["b"]
+
+        grid.sync(positions, positions.__getitem__)
+
+        assert "b" not in grid
+        assert "a" in grid
+
+
+class TestGridInteractions:
+    def test_near_pair_interacts(self, game):
+        icon1 = game._spawn_icon("S3", (100, 100))
+        icon2 = game._spawn_icon("CloudFront", (160, 100))
+
+        game._handle_interactions()
+
+        assert icon1.last_interaction is icon2
+        assert icon2.last_interaction is icon1
+
+    def test_far_pair_does_not_interact(self, game):
+        icon1 = game._spawn_icon("S3", (100, 100))
+        icon2 = game._spawn_icon("CloudFront", (300, 100))
+
+        game._handle_interactions()
+
+        assert icon1.last_interaction is None
+        assert icon2.last_interaction is None
+
+    def test_pairs_across_cell_boundary_interact(self, game):
+        # 69と71はセル境界（70）をまたぐが距離は2px
+        icon1 = game._spawn_icon("S3", (69, 200))
+        icon2 = game._spawn_icon("S3", (71, 200))
+
+        game._handle_interactions()
+
+        assert icon1.last_interaction is icon2
+
+    def test_matches_all_pairs_scan(self, game, monkeypatch):
+        """グリッドで見つかる相互作用ペアが全ペア走査の結果と一致する"""
+        rng = random.Random(0)
+        icons = [
+            AWSIcon("S3", (rng.randint(30, 570), rng.randint(30, 620)), velocity=[0, 0])
+            for _ in range(60)
+        ]
+        expected = {
+            (id(a), id(b))
+            for i, a in enumerate(icons) for b in icons[i + 1:]
+            if a._is_near(b, game.INTERACTION_DISTANCE)
+        }
+        found = set()
+        # 位置調整で配置が変わらないよう、ペアの記録だけを行う
+        monkeypatch.setattr(game, "_adjust_overlapping_positions",
+                            lambda a, b: found.add((id(a), id(b))))
+        for icon in icons:
+            game.all_icons.add(icon)
+
+        game._handle_interactions()
+
+        assert found == expected
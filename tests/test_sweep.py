@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+
+import pytest
+
+import sweep
+from aws_icon import AWSIcon
+from evolution_system import EvolutionSystem
+
+
+class TestParameters:
+    def test_bare_names_resolve_to_owning_class(self):
+        assert sweep.qualified_name("REQUIRED_FRAMES") == "EvolutionSystem.REQUIRED_FRAMES"
+        assert sweep.qualified_name("AWSIcon.SURVIVAL_COST") == "AWSIcon.SURVIVAL_COST"
+
+    def test_unknown_parameter_is_rejected(self):
+        with pytest.raises(ValueError):
+            sweep.resolve_param("AWSIcon.NO_SUCH_CONSTANT")
+
+    def test_overrides_are_restored(self):
+        original = AWSIcon.SURVIVAL_COST
+
+        with sweep.overridden({"AWSIcon.SURVIVAL_COST": 1.0,
+                               "EvolutionSystem.REQUIRED_FRAMES": 5}):
+            assert AWSIcon.SURVIVAL_COST == 1.0
+            assert EvolutionSystem.REQUIRED_FRAMES == 5
+
+        assert AWSIcon.SURVIVAL_COST == original
+        assert EvolutionSystem.REQUIRED_FRAMES == 180
+
+    def test_grid_is_cartesian_product(self):
+        sets = sweep.grid({"A": [1, 2], "B": [3, 4, 5]})
+
+        assert len(sets) == 6
+        assert {"A": 2, "B": 5} in sets
+
+    def test_sample_respects_ranges_and_seed(self):
+        sets = sweep.sample({"A": (1, 3), "B": (0.0, 0.5)}, 20, seed=1)
+
+        assert sets == sweep.sample({"A": (1, 3), "B": (0.0, 0.5)}, 20, seed=1)
+        assert all(isinstance(s["A"], int) and 1 <= s["A"] <= 3 for s in sets)
+        assert all(0.0 <= s["B"] <= 0.5 for s in sets)
+
+
+class TestTrials:
+    def test_trial_records_population_and_achievements(self):
+        result = sweep.run_trial(({}, 0, 30, 20, 10))
+
+        assert result["population"][0] == 20
+        assert len(result["population"]) == 4
+        assert "EC2-VPC" in result["achievements"]
+
+    def test_higher_survival_cost_shrinks_population(self):
+        cheap = sweep.run_trial(({"AWSIcon.SURVIVAL_COST": 0.0}, 0, 20, 20, 10))
+        deadly = sweep.run_trial(({"AWSIcon.SURVIVAL_COST": 50.0}, 0, 20, 20, 10))
+
+        assert deadly["population"][-1] < cheap["population"][-1]
+
+    def test_pool_matches_serial_run(self):
+        param_sets = sweep.grid({"AWSIcon.SURVIVAL_COST": [0.01, 0.02]})
+
+        serial = sweep.run_sweep(param_sets, [0, 1], 10, 10, 5, workers=1)
+        pooled = sweep.run_sweep(param_sets, [0, 1], 10, 10, 5, workers=2)
+
+        def key(result):
+            return (result["params"]["AWSIcon.SURVIVAL_COST"], result["seed"])
+        assert sorted(pooled, key=key) == sorted(serial, key=key)
+
+
+class TestAggregation:
+    def test_rows_are_grouped_by_parameters(self):
+        results = [
+            {"params": {"A": 1}, "seed": 0, "population": [10, 8],
+             "achievements": {"EC2-VPC": 30}},
+            {"params": {"A": 1}, "seed": 1, "population": [10, 6],
+             "achievements": {"EC2-VPC": None}},
+            {"params": {"A": 2}, "seed": 0, "population": [10, 2],
+             "achievements": {"EC2-VPC": None}},
+        ]
+
+        rows = sweep.aggregate(results, sample_every=60)
+
+        assert rows[0]["A"] == 1 and rows[0]["runs"] == 2
+        assert rows[0]["final_population_mean"] == 7
+        assert rows[0]["pop@60"] == 7
+        assert rows[0]["EC2-VPC:rate"] == 0.5
+        assert rows[0]["EC2-VPC:frames"] == 30
+        assert rows[1]["EC2-VPC:frames"] is None
+
+    def test_table_is_written_as_csv(self):
+        output = io.StringIO()
+
+        sweep.write_table([{"A": 1, "runs": 2}, {"A": 2, "runs": 1}], output)
+
+        assert output.getvalue().splitlines() == ["A,runs", "1,2", "2,1"]
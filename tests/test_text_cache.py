@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+import pytest
+
+from text_cache import TextCache
+from ui_panel import UIPanel
+
+ARN = "arn:aws:ec2:us-east-1:123456789012:instance/i-0123456789abcdef0"
+
+
+@pytest.fixture
+def cache():
+    return TextCache()
+
+
+def wrap_chars_one_by_one(text, font, max_width):
+    """1文字ずつ計測する素朴な折り返し（比較用）"""
+    lines = []
+    current = ""
+    for ch in text:
+        candidate = current + ch
+        if font.size(candidate)[0] <= max_width:
+            current = candidate
+        else:
+            if current:
+                lines.append(current)
+            current = ch
+    if current:
+        lines.append(current)
+    return lines or [""]
+
+
+class TestFonts:
+    def test_font_is_created_once_per_name_and_size(self, cache):
+        font = cache.font(None, 24)
+
+        assert cache.font(None, 24) is font
+        assert cache.font(None, 18) is not font
+        assert cache.misses["fonts"] == 2
+
+
+class TestRender:
+    def test_same_text_returns_cached_surface(self, cache):
+        font = cache.font(None, 24)
+
+        surface = cache.render("EC2: 3", font, (50, 50, 50))
+
+        assert cache.render("EC2: 3", font, [50, 50, 50]) is surface
+        assert cache.render("EC2: 3", font, (255, 0, 0)) is not surface
+        assert cache.misses["renders"] == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TextCache(render_cache_size=2)
+        font = cache.font(None, 24)
+        first = cache.render("a", font, (0, 0, 0))
+        cache.render("b", font, (0, 0, 0))
+        cache.render("a", font, (0, 0, 0))  # "a"を最近使ったことにする
+
+        cache.render("c", font, (0, 0, 0))
+
+        assert cache.render("a", font, (0, 0, 0)) is first
+        assert ("b", font, (0, 0, 0), True) not in cache.surfaces
+
+
+class TestWrap:
+    def test_char_wrap_matches_one_by_one_measurement(self, cache):
+        font = cache.font(None, 18)
+
+        for max_width in (60, 120, 220):
+            assert cache.wrap_chars(ARN, font, max_width) == \
+                wrap_chars_one_by_one(ARN, font, max_width)
+
+    def test_wrap_layout_is_memoized(self, cache):
+        font = cache.font(None, 26)
+
+        lines = cache.wrap_words("a b c d e f g", font, 30)
+
+        assert cache.wrap_words("a b c d e f g", font, 30) is lines
+        assert cache.misses["wraps"] == 1
+
+
+class TestSteadyStateFrame:
+    def test_panel_redraw_builds_nothing_new(self):
+        from aws_icon import AWSIcon
+        from text_cache import text_cache
+
+        panel = UIPanel(600, 0, 250, 650)
+        icon = AWSIcon("EC2", (100, 100), velocity=[0, 0])
+        panel.update([icon], icon)
+        surface = pygame.Surface((850, 650))
+        panel.draw(surface)
+        before = dict(text_cache.misses)
+
+        panel.draw(surface)
+
+        assert text_cache.misses == before
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+import pytest
+
+from aws_icon import AWSIcon
+from ui_panel import UIPanel
+
+
+@pytest.fixture
+def panel():
+    return UIPanel(600, 0, 250, 650)
+
+
+@pytest.fixture
+def calls(panel, monkeypatch):
+    """統計・選択中のアイコン情報を描き直した回数を数える"""
+    counts = {"counts": 0, "selected": 0}
+    draw_counts, draw_selected = panel._draw_counts, panel._draw_selected
+
+    def count_counts():
+        counts["counts"] += 1
+        return draw_counts()
+
+    def count_selected(y_offset):
+        counts["selected"] += 1
+        draw_selected(y_offset)
+
+    monkeypatch.setattr(panel, "_draw_counts", count_counts)
+    monkeypatch.setattr(panel, "_draw_selected", count_selected)
+    return counts
+
+
+def make_icon(service_type):
+    return AWSIcon(service_type, (100, 100), velocity=[0, 0])
+
+
+def panel_pixels(panel):
+    surface = pygame.Surface((850, 650))
+    panel.draw(surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+class TestIncrementalPanel:
+    def test_unchanged_panel_is_not_redrawn(self, panel, calls):
+        icons = [make_icon("EC2"), make_icon("S3")]
+        panel.update(icons, icons[0])
+        panel_pixels(panel)
+
+        panel.update(icons, icons[0])
+        panel_pixels(panel)
+
+        assert calls == {"counts": 1, "selected": 1}
+
+    def test_selection_change_redraws_only_selected_section(self, panel, calls):
+        icons = [make_icon("EC2"), make_icon("S3")]
+        panel.update(icons, None)
+        panel_pixels(panel)
+
+        panel.update(icons, icons[1])
+        panel_pixels(panel)
+
+        assert calls == {"counts": 1, "selected": 2}
+
+    def test_health_change_redraws_selected_section(self, panel, calls):
+        icon = make_icon("EC2")
+        panel.update([icon], icon)
+        panel_pixels(panel)
+
+        icon.health = 42
+        panel_pixels(panel)
+
+        assert calls["selected"] == 2
+
+    def test_incremental_result_matches_fresh_panel(self, panel):
+        icons = [make_icon("EC2"), make_icon("Lambda"), make_icon("VPC")]
+        panel.update(icons, icons[1])
+        panel_pixels(panel)
+
+        panel.update(icons[:2], None)
+        fresh = UIPanel(600, 0, 250, 650)
+        fresh.update(icons[:2], None)
+
+        assert panel_pixels(panel) == panel_pixels(fresh)
+
+    def test_speed_change_redraws_only_speed_section(self, panel, calls):
+        icons = [make_icon("EC2")]
+        panel.update(icons, icons[0])
+        panel.set_speed(1, 1.0)
+        before = panel_pixels(panel)
+
+        panel.set_speed(4, 3.9)
+        after = panel_pixels(panel)
+
+        assert calls == {"counts": 1, "selected": 1}
+        assert after != before
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """フォント・描画済み文字列・折り返し結果を使い回すテキスト描画のキャッシュ
+
+    - font(name, size): (name, size)ごとにフォントを1回だけ作る
+    - render(text, font, color): 描画済みのSurfaceをLRUで保持する（上限RENDER_CACHE_SIZE件）
+    - wrap_words / wrap_chars: (text, font, max_width)ごとに折り返し結果を覚えておく
+    同じ文字列を毎フレーム描画しても、2回目以降はフォントの生成も文字幅の計測も行わない。
+    render()が返すSurfaceは同じ文字列の描画で共有されるため、内容を書き換えないこと
+    （set_alpha()のように描画のたびに設定し直すものはそのつど設定する）。
+    """
+
+    RENDER_CACHE_SIZE = 512
+    WRAP_CACHE_SIZE = 256
+
+    def __init__(self, render_cache_size=RENDER_CACHE_SIZE, wrap_cache_size=WRAP_CACHE_SIZE):
+        self.render_cache_size = render_cache_size
+        self.wrap_cache_size = wrap_cache_size
+        self.fonts = {}              # {(name, size): Font}
+        self.surfaces = OrderedDict()  # {(text, font, color, antialias): Surface}（古い順）
+        self.layouts = OrderedDict()   # {(mode, text, font, max_width): [行, ...]}（古い順）
+        # キャッシュに無く新たに作った回数（定常状態のフレームでは増えない）
+        self.misses = {"fonts": 0, "renders": 0, "wraps": 0}
+
+    def font(self, name, size):
+        """フォントを取得する（pygame.font.SysFontと同じ引数）"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+            self.misses["fonts"] += 1
+        return font
+
+    def render(self, text, font, color, antialias=True):
+        """文字列を描画したSurfaceを返す（font.render()の結果を使い回す）"""
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, antialias, color)
+        self.misses["renders"] += 1
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.render_cache_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def wrap_words(self, text, font, max_width):
+        """テキストをmax_width以内に収まるよう単語単位で折り返して行のリストを返す"""
+        return self._layout("words", text, font, max_width, self._wrap_words)
+
+    def wrap_chars(self, text, font, max_width):
+        """ARNのようにスペースが無い文字列をmax_width以内に文字単位で折り返す"""
+        return self._layout("chars", text, font, max_width, self._wrap_chars)
+
+    def clear(self):
+        """キャッシュをすべて破棄する"""
+        self.fonts.clear()
+        self.surfaces.clear()
+        self.layouts.clear()
+
+    def _layout(self, mode, text, font, max_width, wrap):
+        """折り返し結果をキャッシュから返す（無ければwrapで計算して覚える）"""
+        key = (mode, text, font, max_width)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key)
+            return lines
+        lines = wrap(text, font, max_width)
+        self.misses["wraps"] += 1
+        self.layouts[key] = lines
+        if len(self.layouts) > self.wrap_cache_size:
+            self.layouts.popitem(last=False)
+        return lines
+
+    @staticmethod
+    def _wrap_words(text, font, max_width):
+        words = text.split(" ")
+        lines = []
+        current = ""
+        for word in words:
+            candidate = word if not current else f"{current} {word}"
+            if font.size(candidate)[0] <= max_width:
+                current = candidate
+            else:
+                if current:
+                    lines.append(current)
+                # 単語単体がmax_widthを超える場合もそのまま1行として扱う
+                current = word
+        if current:
+            lines.append(current)
+        return lines or [""]
+
+    @staticmethod
+    def _wrap_chars(text, font, max_width):
+        # 1行に収まる最長の先頭部分を二分探索で求める（1文字ずつ計測するより計測回数が少ない）
+        lines = []
+        start = 0
+        while start < len(text):
+            low, high = start + 1, len(text)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if font.size(text[start:middle])[0] <= max_width:
+                    low = middle
+                else:
+                    high = middle - 1
+            # 1文字でも収まらない場合はその1文字を1行とする
+            lines.append(text[start:low])
+            start = low
+        return lines or [""]
+
+
+# プロセス全体で共有するキャッシュ
+text_cache = TextCache()
@@ -3,42 +3,63 @@
 
 import pygame
 from constants import UI_BACKGROUND_COLOR, UI_TEXT_COLOR, UI_BORDER_COLOR
+from text_cache import text_cache
+
+# 未描画を表す値（state_keyの値がNoneの場合と区別する）
+_STALE = object()
 
 class UIPanel:
     """ゲームのUIパネルを管理するクラス"""
+
+    COUNTS_TOP = 80  # アイコン統計の1行目の位置（パネル上端から）
+    SPEED_AREA_WIDTH = 110  # タイトル行の右端に速さを表示する領域の幅
+    # 操作説明（静的なレイヤーに1回だけ描く）
+    CONTROLS = [
+        "Left Click (empty): Place icon",
+        "Left Click (on icon): Select icon",
+        "Left Click+Drag: Move icon",
+        "Space: Place random icon",
+        "+/-: Simulation speed (0: x1)",
+        "F3: Profiler overlay",
+        "ESC: Exit"
+    ]
     
     def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
-        self.font = pygame.font.SysFont(None, 24)
-        self.small_font = pygame.font.SysFont(None, 18)
+        self.font = text_cache.font(None, 24)
+        self.small_font = text_cache.font(None, 18)
         
         # 選択中のアイコン
         self.selected_icon = None
         
         # アイコン数のカウント
         self.icon_counts = {}
+
+        # シミュレーションの速さ（指定した倍率（Noneは最速）と実際の倍率）
+        self.requested_speed = 1
+        self.achieved_speed = 0.0
+
+        # パネル画像（静的なレイヤーの上に統計と選択中のアイコン情報を描いたもの）
+        # 統計・選択中のアイコン情報は、表示内容（state_key）が変わったときだけ描き直す
+        self._static_layer = None
+        self._surface = None
+        self._counts_key = _STALE
+        self._selected_key = _STALE
+        self._speed_key = _STALE
+        self._selected_top = self.COUNTS_TOP
     
     def _wrap_text(self, text, font, max_width):
-        """テキストをmax_width以内に折り返す。ARNのようにスペースが無い文字列は文字単位で分割する"""
-        lines = []
-        current = ""
-        for ch in text:
-            candidate = current + ch
-            if font.size(candidate)[0] <= max_width:
-                current = candidate
-            else:
-                if current:
-                    lines.append(current)
-                current = ch
-        if current:
-            lines.append(current)
-        return lines or [""]
+        """テキストをmax_width以内に折り返す。ARNのようにスペースが無い文字列は文字単位で分割する（結果はキャッシュされる）"""
+        return text_cache.wrap_chars(text, font, max_width)
 
     def update(self, all_icons, selected_icon):
         """UIパネルの状態を更新"""
         self.selected_icon = selected_icon
         
-        # アイコン数のカウントを更新
+        # アイコン数のカウントを更新（IconRegistryならバケットの大きさをそのまま使う）
+        if hasattr(all_icons, "type_counts"):
+            self.icon_counts = all_icons.type_counts()
+            return
         self.icon_counts = {}
         for icon in all_icons:
             if icon.service_type in self.icon_counts:
@@ -46,82 +67,155 @@ class UIPanel:
             else:
                 self.icon_counts[icon.service_type] = 1
     
+    def set_speed(self, requested, achieved):
+        """表示するシミュレーションの速さを設定（描画フレームごとに呼ぶ）"""
+        self.requested_speed = requested
+        self.achieved_speed = achieved
+
+    def state_key(self):
+        """パネルの表示内容を決める値のタプル（変わっていなければ描き直す必要がない）"""
+        selected = None
+        icon = self.selected_icon
+        if icon:
+            selected = (
+                icon, int(icon.health), icon.max_health, getattr(icon, 'arn', None),
+                getattr(icon, 'retiring', False),
+                icon.state_label(), icon.state_border_color(),
+                tuple(icon.dependencies), icon.dependency_satisfied,
+            )
+        # 実際の速さは小数第1位まで（細かな揺れのたびに描き直さない）
+        speed = (self.requested_speed, round(self.achieved_speed, 1))
+        return (tuple(self.icon_counts.items()), selected, speed)
+
     def draw(self, surface):
-        """UIパネルを描画"""
-        # 背景
-        pygame.draw.rect(surface, UI_BACKGROUND_COLOR, self.rect)
-        
+        """UIパネルを描画（作っておいたパネル画像を1回blitするだけ）"""
+        self._refresh()
+        surface.blit(self._surface, self.rect)
+
+    def _refresh(self):
+        """表示内容が変わった部分だけパネル画像を描き直す"""
+        counts_key, selected_key, speed_key = self.state_key()
+        if self._surface is None:
+            self._static_layer = self._render_static_layer()
+            self._surface = self._static_layer.copy()
+        elif (counts_key == self._counts_key and selected_key == self._selected_key
+              and speed_key == self._speed_key):
+            return
+
+        if speed_key != self._speed_key:
+            self._speed_key = speed_key
+            self._draw_speed()
+        if counts_key != self._counts_key:
+            # 統計の行数が変わると選択中のアイコン情報の位置もずれるため、両方描き直す
+            self._counts_key = counts_key
+            self._selected_top = self._draw_counts()
+            self._selected_key = _STALE
+        if selected_key != self._selected_key:
+            self._selected_key = selected_key
+            self._draw_selected(self._selected_top)
+
+    def _render_static_layer(self):
+        """変化しない部分（背景・タイトル・区切り線・見出し・操作説明）を描いたパネル画像を作る"""
+        layer = pygame.Surface(self.rect.size)
+        layer.fill(UI_BACKGROUND_COLOR)
+
         # タイトル
-        title_text = self.font.render("AWS Icon Life", True, UI_TEXT_COLOR)
-        surface.blit(title_text, (self.rect.x + 10, self.rect.y + 10))
+        title_text = text_cache.render("AWS Icon Life", self.font, UI_TEXT_COLOR)
+        layer.blit(title_text, (10, 10))
         
         # 区切り線
-        pygame.draw.line(
-            surface,
-            UI_BORDER_COLOR,
-            (self.rect.x, self.rect.y + 40),
-            (self.rect.right, self.rect.y + 40),
-            2
-        )
+        pygame.draw.line(layer, UI_BORDER_COLOR, (0, 40), (self.rect.width, 40), 2)
         
         # アイコン統計
-        stats_title = self.font.render("Icon Statistics", True, UI_TEXT_COLOR)
-        surface.blit(stats_title, (self.rect.x + 10, self.rect.y + 50))
+        stats_title = text_cache.render("Icon Statistics", self.font, UI_TEXT_COLOR)
+        layer.blit(stats_title, (10, 50))
+
+        # 操作説明
+        y_offset = self.rect.height - 180  # 操作説明の行数に合わせて上に移動
+        help_title = text_cache.render("Controls", self.font, UI_TEXT_COLOR)
+        layer.blit(help_title, (10, y_offset))
         
-        y_offset = 80
+        y_offset += 30
+        for control in self.CONTROLS:
+            control_text = text_cache.render(control, self.small_font, UI_TEXT_COLOR)
+            layer.blit(control_text, (20, y_offset))
+            y_offset += 20
+        return layer
+
+    def _restore(self, top, bottom):
+        """パネル画像のtop〜bottomの範囲を静的なレイヤーの内容に戻す"""
+        area = pygame.Rect(0, top, self.rect.width, bottom - top)
+        self._surface.blit(self._static_layer, area, area)
+
+    def _draw_speed(self):
+        """タイトル行の右端に、指定した速さと実際の速さを描き直す（例: "x4 (3.9x)"）"""
+        surface = self._surface
+        area = pygame.Rect(self.rect.width - self.SPEED_AREA_WIDTH, 0, self.SPEED_AREA_WIDTH, 38)
+        surface.blit(self._static_layer, area, area)
+        requested = "max" if self.requested_speed is None else f"x{self.requested_speed}"
+        text = text_cache.render(f"{requested} ({self.achieved_speed:.1f}x)",
+                                 self.small_font, UI_TEXT_COLOR)
+        surface.blit(text, text.get_rect(right=self.rect.width - 10, centery=20))
+
+    def _draw_counts(self):
+        """アイコン数の統計を描き直し、選択中のアイコン情報の開始位置を返す"""
+        surface = self._surface
+        self._restore(self.COUNTS_TOP, self.rect.height)
+        y_offset = self.COUNTS_TOP
         for icon_type, count in self.icon_counts.items():
-            text = self.small_font.render(f"{icon_type}: {count}", True, UI_TEXT_COLOR)
-            surface.blit(text, (self.rect.x + 20, self.rect.y + y_offset))
+            text = text_cache.render(f"{icon_type}: {count}", self.small_font, UI_TEXT_COLOR)
+            surface.blit(text, (20, y_offset))
             y_offset += 25
-        
+        return y_offset
+
+    def _draw_selected(self, y_offset):
+        """選択中のアイコン情報（区切り線から下）を描き直す"""
+        surface = self._surface
+        # 操作説明は静的なレイヤーに含まれるので、ここから下をまとめて戻す
+        self._restore(y_offset, self.rect.height)
+
         # 区切り線
-        pygame.draw.line(
-            surface,
-            UI_BORDER_COLOR,
-            (self.rect.x, self.rect.y + y_offset),
-            (self.rect.right, self.rect.y + y_offset),
-            2
-        )
+        pygame.draw.line(surface, UI_BORDER_COLOR, (0, y_offset), (self.rect.width, y_offset), 2)
         
         # 選択中のアイコン情報
         y_offset += 10
-        info_title = self.font.render("Selected Icon", True, UI_TEXT_COLOR)
-        surface.blit(info_title, (self.rect.x + 10, self.rect.y + y_offset))
+        info_title = text_cache.render("Selected Icon", self.font, UI_TEXT_COLOR)
+        surface.blit(info_title, (10, y_offset))
         
         y_offset += 30
         if self.selected_icon:
             # アイコンタイプ
-            type_text = self.small_font.render(f"Type: {self.selected_icon.service_type}", True, UI_TEXT_COLOR)
-            surface.blit(type_text, (self.rect.x + 20, self.rect.y + y_offset))
+            type_text = text_cache.render(f"Type: {self.selected_icon.service_type}", self.small_font, UI_TEXT_COLOR)
+            surface.blit(type_text, (20, y_offset))
             y_offset += 25
             
             # 体力
-            health_text = self.small_font.render(
+            health_text = text_cache.render(
                 f"Health: {int(self.selected_icon.health)}/{self.selected_icon.max_health}",
-                True, UI_TEXT_COLOR
+                self.small_font, UI_TEXT_COLOR
             )
-            surface.blit(health_text, (self.rect.x + 20, self.rect.y + y_offset))
+            surface.blit(health_text, (20, y_offset))
             y_offset += 25
 
             # ARN（生成時に採番。長いのでパネル幅に合わせて折り返す）
             arn = getattr(self.selected_icon, 'arn', None)
             if arn:
-                arn_label = self.small_font.render("ARN:", True, UI_TEXT_COLOR)
-                surface.blit(arn_label, (self.rect.x + 20, self.rect.y + y_offset))
+                arn_label = text_cache.render("ARN:", self.small_font, UI_TEXT_COLOR)
+                surface.blit(arn_label, (20, y_offset))
                 y_offset += 20
                 max_width = self.rect.width - 30  # 左右の余白
                 for line in self._wrap_text(arn, self.small_font, max_width):
-                    line_surface = self.small_font.render(line, True, UI_TEXT_COLOR)
-                    surface.blit(line_surface, (self.rect.x + 25, self.rect.y + y_offset))
+                    line_surface = text_cache.render(line, self.small_font, UI_TEXT_COLOR)
+                    surface.blit(line_surface, (25, y_offset))
                     y_offset += 18
                 y_offset += 7
 
             # リタイア（retirement）予定のEC2はその旨を最優先で表示
             if getattr(self.selected_icon, 'retiring', False):
-                retire_text = self.small_font.render(
-                    "Status: Scheduled for retirement", True, (255, 0, 0)
+                retire_text = text_cache.render(
+                    "Status: Scheduled for retirement", self.small_font, (255, 0, 0)
                 )
-                surface.blit(retire_text, (self.rect.x + 20, self.rect.y + y_offset))
+                surface.blit(retire_text, (20, y_offset))
                 y_offset += 25
             else:
                 # 現在の状態を、色枠と同じ色で表示（バースト/接続/スケールアウト等）
@@ -129,46 +223,27 @@ class UIPanel:
                 label = get_label() if get_label else None
                 if label:
                     color = self.selected_icon.state_border_color() or UI_TEXT_COLOR
-                    state_text = self.small_font.render(f"State: {label}", True, color)
-                    surface.blit(state_text, (self.rect.x + 20, self.rect.y + y_offset))
+                    state_text = text_cache.render(f"State: {label}", self.small_font, color)
+                    surface.blit(state_text, (20, y_offset))
                     y_offset += 25
 
             # 依存関係
             if self.selected_icon.dependencies:
-                deps_text = self.small_font.render(
+                deps_text = text_cache.render(
                     f"Depends on: {', '.join(self.selected_icon.dependencies)}",
-                    True, UI_TEXT_COLOR
+                    self.small_font, UI_TEXT_COLOR
                 )
-                surface.blit(deps_text, (self.rect.x + 20, self.rect.y + y_offset))
+                surface.blit(deps_text, (20, y_offset))
                 y_offset += 25
                 
-                status_text = self.small_font.render(
+                status_text = text_cache.render(
                     f"Status: {'Satisfied' if self.selected_icon.dependency_satisfied else 'Not Satisfied'}",
-                    True, (0, 255, 0) if self.selected_icon.dependency_satisfied else (255, 0, 0)
+                    self.small_font, (0, 255, 0) if self.selected_icon.dependency_satisfied else (255, 0, 0)
                 )
-                surface.blit(status_text, (self.rect.x + 20, self.rect.y + y_offset))
+                surface.blit(status_text, (20, y_offset))
             else:
-                deps_text = self.small_font.render("Depends on: None", True, UI_TEXT_COLOR)
-                surface.blit(deps_text, (self.rect.x + 20, self.rect.y + y_offset))
+                deps_text = text_cache.render("Depends on: None", self.small_font, UI_TEXT_COLOR)
+                surface.blit(deps_text, (20, y_offset))
         else:
-            no_selection = self.small_font.render("No icon selected", True, UI_TEXT_COLOR)
-            surface.blit(no_selection, (self.rect.x + 20, self.rect.y + y_offset))
-        
-        # 操作説明
-        y_offset = self.rect.height - 140  # 120から140に変更して上に移動
-        help_title = self.font.render("Controls", True, UI_TEXT_COLOR)
-        surface.blit(help_title, (self.rect.x + 10, self.rect.y + y_offset))
-        
-        y_offset += 30
-        controls = [
-            "Left Click (empty): Place icon",
-            "Left Click (on icon): Select icon",
-            "Left Click+Drag: Move icon",
-            "Space: Place random icon",
-            "ESC: Exit"
-        ]
-        
-        for control in controls:
-            control_text = self.small_font.render(control, True, UI_TEXT_COLOR)
-            surface.blit(control_text, (self.rect.x + 20, self.rect.y + y_offset))
-            y_offset += 20
+            no_selection = text_cache.render("No icon selected", self.small_font, UI_TEXT_COLOR)
+            surface.blit(no_selection, (20, y_offset))